@@ -0,0 +1,384 @@
+"""
+Benchmark suite for the storage, scoring and API hot paths.
+
+Every benchmark runs at several data sizes. Each one is timed over a number
+of rounds after a warm-up run. The report can be written as JSON and
+compared with an earlier report to spot regressions between releases.
+
+Usage:
+    python -m benchmarks.hot_paths
+    python -m benchmarks.hot_paths --sizes 100 1000 --rounds 10 --json report.json
+    python -m benchmarks.hot_paths --filter api --compare baseline.json
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from src.database import QuizDatabase
+from src.durable_database import DurableQuizDatabase
+from src.question import Question
+from src.quiz import Quiz
+from src.timer_wheel import TimerWheel
+
+SEED = 1234  # Fixed so every run builds the same data
+DEFAULT_SIZES = [100, 1000, 10000]
+DEFAULT_ROUNDS = 5
+REQUESTS_PER_ROUND = 50  # HTTP requests timed per round by the API benchmarks
+QUESTIONS_PER_STORED_QUIZ = 20
+
+
+class Operation(NamedTuple):
+    """A prepared benchmark: the callable to time and how many items it handles"""
+
+    run: Callable[[], Any]
+    items: int
+
+
+def make_questions(count: int) -> List[Question]:
+    """Build distinct questions spread over a few categories and difficulties"""
+    difficulties = ["easy", "medium", "hard"]
+    return [
+        Question(
+            f"Question {i}?",
+            [f"Option {i}-{choice}" for choice in range(4)],
+            f"Option {i}-{i % 4}",
+            difficulty=difficulties[i % 3],
+            category=f"Category {i % 10}",
+        )
+        for i in range(count)
+    ]
+
+
+def make_quiz(question_count: int, title: str = "Benchmark Quiz") -> Quiz:
+    """Build a quiz with the given number of questions"""
+    quiz = Quiz(title=title, time_limit_seconds=600)
+    quiz.add_questions(make_questions(question_count))
+    return quiz
+
+
+def make_database(quiz_count: int) -> QuizDatabase:
+    """Build an in-memory store holding quiz_count quizzes"""
+    db = QuizDatabase()
+    questions = make_questions(QUESTIONS_PER_STORED_QUIZ)
+    quizzes = []
+    for i in range(quiz_count):
+        quiz = Quiz(title=f"Quiz {i}")
+        quiz.add_questions(questions)
+        quizzes.append(quiz)
+    db.add_quizzes(quizzes)
+    return db
+
+
+# Benchmarks: each takes a data size and returns the Operation to time
+
+
+def bench_add_question(size: int) -> Operation:
+    """Add size questions to an empty quiz, one at a time"""
+    questions = make_questions(size)
+
+    def run() -> None:
+        quiz = Quiz(title="Benchmark Quiz")
+        for question in questions:
+            quiz.add_question(question)
+
+    return Operation(run, size)
+
+
+def bench_get_quiz(size: int) -> Operation:
+    """Read quizzes by ID from a store holding size quizzes"""
+    db = make_database(size)
+    rng = random.Random(SEED)
+    quiz_ids = [quiz.id for quiz in db.list_quizzes()]
+    lookups = [rng.choice(quiz_ids) for _ in range(1000)]
+
+    def run() -> None:
+        for quiz_id in lookups:
+            db.get_quiz(quiz_id)
+
+    return Operation(run, len(lookups))
+
+
+def bench_list_quizzes(size: int) -> Operation:
+    """List every quiz in a store holding size quizzes"""
+    db = make_database(size)
+    return Operation(db.list_quizzes, size)
+
+
+def bench_list_quiz_summaries(size: int) -> Operation:
+    """Page through the summaries of a store holding size quizzes"""
+    db = make_database(size)
+
+    def run() -> None:
+        cursor = None
+        while True:
+            _, cursor = db.list_quiz_summaries(limit=100, cursor=cursor)
+            if cursor is None:
+                break
+
+    return Operation(run, size)
+
+
+def bench_durable_reopen(size: int) -> Operation:
+    """Reopen a durable store of size quizzes from its snapshot and list the first page"""
+    directory = tempfile.TemporaryDirectory()
+    db = DurableQuizDatabase(directory.name, fsync=False)
+    questions = make_questions(size * QUESTIONS_PER_STORED_QUIZ)
+    quizzes = []
+    for i in range(size):
+        quiz = Quiz(title=f"Quiz {i}")
+        start, stop = i * QUESTIONS_PER_STORED_QUIZ, (i + 1) * QUESTIONS_PER_STORED_QUIZ
+        quiz.add_questions(questions[start:stop])
+        quizzes.append(quiz)
+    db.add_quizzes(quizzes)
+    db.checkpoint()
+    db.close()
+
+    def run() -> None:
+        reopened = DurableQuizDatabase(directory.name, fsync=False)
+        reopened.list_quiz_summaries(limit=20)
+        reopened.close()
+        assert directory  # Keeps the directory alive as long as the benchmark
+
+    return Operation(run, size)
+
+
+def bench_expire_attempts(size: int) -> Operation:
+    """Track size attempt deadlines over ten minutes and expire them with one sweep per second"""
+    rng = random.Random(SEED)
+    deadlines = [rng.uniform(0, 600) for _ in range(size)]
+
+    def run() -> None:
+        wheel = TimerWheel(now=0)
+        for key, deadline in enumerate(deadlines):
+            wheel.schedule(key, deadline)
+        expired = 0
+        for now in range(601):
+            expired += len(wheel.advance(now))
+        assert expired == size
+
+    return Operation(run, size)
+
+
+def bench_submit_answer(size: int) -> Operation:
+    """Answer every question of a quiz with size questions"""
+    quiz = make_quiz(size)
+    rng = random.Random(SEED)
+    answers = [rng.choice(question.options) for question in quiz.questions]
+
+    def run() -> None:
+        session = quiz.snapshot(include_answers=False)
+        for index, answer in enumerate(answers):
+            session.submit_answer(index, answer)
+
+    return Operation(run, size)
+
+
+def bench_results(size: int) -> Operation:
+    """Compute the result and score breakdown of a fully answered quiz"""
+    quiz = make_quiz(size)
+    rng = random.Random(SEED)
+    for index, question in enumerate(quiz.questions):
+        quiz.submit_answer(index, rng.choice(question.options))
+
+    def run() -> None:
+        quiz.get_result()
+        quiz.get_incorrect_answers()
+        quiz.get_score_breakdown()
+
+    return Operation(run, 1)
+
+
+def api_client() -> Any:
+    """Return a TestClient for the API, with an empty store"""
+    from fastapi.testclient import TestClient
+    from src.api import app, db, quiz_response_cache
+
+    db.clear()
+    quiz_response_cache.clear()
+    return TestClient(app)
+
+
+def create_api_quiz(client: Any, size: int) -> str:
+    """Create a quiz with size questions through the API and return its ID"""
+    questions = [
+        {
+            "text": question.text,
+            "options": list(question.options),
+            "correct_answer": question.correct_answer,
+            "difficulty": question.difficulty,
+            "category": question.category,
+        }
+        for question in make_questions(size)
+    ]
+    response = client.post("/quizzes", json={"title": "Benchmark Quiz", "questions": questions})
+    return response.json()["quiz_id"]
+
+
+def random_submissions(size: int) -> List[Dict[str, Any]]:
+    """Build the answer payloads posted by the API benchmarks"""
+    rng = random.Random(SEED)
+    return [
+        {"question_index": index, "answer": f"Option {index}-{rng.randrange(4)}"}
+        for index in (rng.randrange(size) for _ in range(REQUESTS_PER_ROUND))
+    ]
+
+
+def bench_api_submit_answer(size: int) -> Operation:
+    """POST answers to a stored quiz with size questions"""
+    client = api_client()
+    url = f"/quizzes/{create_api_quiz(client, size)}/answers"
+    submissions = random_submissions(size)
+
+    def run() -> None:
+        for submission in submissions:
+            client.post(url, json=submission)
+
+    return Operation(run, len(submissions))
+
+
+def bench_api_submit_attempt_answer(size: int) -> Operation:
+    """POST answers to an attempt at a quiz with size questions"""
+    client = api_client()
+    quiz_id = create_api_quiz(client, size)
+    attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+    url = f"/attempts/{attempt_id}/answers"
+    submissions = random_submissions(size)
+
+    def run() -> None:
+        for submission in submissions:
+            client.post(url, json=submission)
+
+    return Operation(run, len(submissions))
+
+
+def bench_api_results(size: int) -> Operation:
+    """GET the results of a quiz with size questions"""
+    client = api_client()
+    quiz_id = create_api_quiz(client, size)
+    client.post(f"/quizzes/{quiz_id}/answers:batch", json={"answers": random_submissions(size)})
+    url = f"/quizzes/{quiz_id}/results"
+
+    def run() -> None:
+        for _ in range(REQUESTS_PER_ROUND):
+            client.get(url)
+
+    return Operation(run, REQUESTS_PER_ROUND)
+
+
+BENCHMARKS: Dict[str, Callable[[int], Operation]] = {
+    "quiz.add_question": bench_add_question,
+    "quiz.submit_answer": bench_submit_answer,
+    "quiz.results": bench_results,
+    "database.get_quiz": bench_get_quiz,
+    "database.list_quizzes": bench_list_quizzes,
+    "database.list_quiz_summaries": bench_list_quiz_summaries,
+    "durable.reopen": bench_durable_reopen,
+    "attempts.expire": bench_expire_attempts,
+    "api.submit_answer": bench_api_submit_answer,
+    "api.submit_attempt_answer": bench_api_submit_attempt_answer,
+    "api.results": bench_api_results,
+}
+
+
+def time_operation(operation: Operation, rounds: int) -> Dict[str, float]:
+    """Time an operation over several rounds, after one untimed warm-up run"""
+    operation.run()
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        operation.run()
+        timings.append(time.perf_counter() - start)
+    median = statistics.median(timings)
+    return {
+        "min_s": min(timings),
+        "median_s": median,
+        "mean_s": statistics.mean(timings),
+        "per_item_us": median / operation.items * 1e6,
+    }
+
+
+def git_revision() -> Optional[str]:
+    """Return the current git commit, if the suite runs from a checkout"""
+    try:
+        output = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return output.stdout.strip()
+
+
+def run_suite(sizes: List[int], rounds: int, name_filter: str = "") -> Dict[str, Any]:
+    """Run every benchmark whose name contains name_filter at every size"""
+    results = []
+    for name, benchmark in BENCHMARKS.items():
+        if name_filter not in name:
+            continue
+        for size in sizes:
+            operation = benchmark(size)
+            timing = time_operation(operation, rounds)
+            results.append(
+                {"name": name, "size": size, "items": operation.items, "rounds": rounds, **timing}
+            )
+            print(
+                f"{name:<30} size={size:<7} median={timing['median_s'] * 1000:10.3f} ms"
+                f"  per item={timing['per_item_us']:10.2f} us",
+                file=sys.stderr,
+            )
+    return {
+        "metadata": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "revision": git_revision(),
+            "seed": SEED,
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any]) -> None:
+    """Print how each median changed relative to a baseline report"""
+    previous = {(r["name"], r["size"]): r["median_s"] for r in baseline["results"]}
+    print(f"{'benchmark':<30} {'size':>7} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for result in report["results"]:
+        before = previous.get((result["name"], result["size"]))
+        if before is None:
+            continue
+        change = (result["median_s"] - before) / before * 100
+        print(
+            f"{result['name']:<30} {result['size']:>7} {before * 1000:>12.3f}"
+            f" {result['median_s'] * 1000:>12.3f} {change:>+7.1f}%"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the storage, scoring and API paths")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="Data sizes to run"
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=DEFAULT_ROUNDS, help="Timed rounds per benchmark"
+    )
+    parser.add_argument("--filter", default="", help="Only run benchmarks containing this text")
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON to PATH")
+    parser.add_argument("--compare", metavar="PATH", help="Compare with an earlier JSON report")
+    args = parser.parse_args()
+
+    report = run_suite(args.sizes, args.rounds, args.filter)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as baseline_file:
+            compare(report, json.load(baseline_file))
+
+
+if __name__ == "__main__":
+    main()
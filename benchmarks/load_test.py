@@ -0,0 +1,320 @@
+"""
+Load test: concurrent simulated students against the Quiz API.
+
+Each simulated student repeatedly takes the same quiz the way a client
+would: fetch the quiz, start an attempt, submit every answer, then fetch
+the results. The harness reports throughput and latency percentiles per
+endpoint. Raise --concurrency until p99 latency degrades to find how many
+quiz-takers one server handles.
+
+By default a server is started with run_api.py on a free local port and
+stopped afterwards; pass --url to test a server that is already running.
+
+Usage:
+    python -m benchmarks.load_test --concurrency 50 --duration 30
+    python -m benchmarks.load_test --storage sqlite --workers 4 --questions 50
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --json load.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+import httpx
+
+SEED = 1234
+SERVER_START_TIMEOUT = 30.0  # Seconds to wait for a started server to answer /health
+PERCENTILES = (50, 90, 95, 99)
+
+
+class LatencyRecorder:
+    """Collects request latencies and errors per endpoint"""
+
+    def __init__(self) -> None:
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(
+        self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> Optional[httpx.Response]:
+        """
+        Send a request and record its latency under the endpoint name.
+
+        Returns:
+            The response, or None if the request failed or returned an error status
+        """
+        start = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.errors[endpoint] += 1
+            return None
+        self.latencies[endpoint].append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            self.errors[endpoint] += 1
+            return None
+        return response
+
+    def report(self, elapsed: float) -> Dict[str, Dict[str, float]]:
+        """Summarize throughput and latency percentiles (in milliseconds) per endpoint"""
+        summary = {}
+        for endpoint in sorted(set(self.latencies) | set(self.errors)):
+            latencies = sorted(self.latencies[endpoint])
+            entry = {
+                "requests": len(latencies),
+                "errors": self.errors[endpoint],
+                "throughput_rps": len(latencies) / elapsed,
+            }
+            for percentile in PERCENTILES:
+                entry[f"p{percentile}_ms"] = percentile_of(latencies, percentile) * 1000
+            entry["max_ms"] = (latencies[-1] if latencies else 0.0) * 1000
+            summary[endpoint] = entry
+        return summary
+
+
+def percentile_of(sorted_values: List[float], percentile: float) -> float:
+    """Return the nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * percentile // 100))  # Ceiling division
+    return sorted_values[int(rank) - 1]
+
+
+def make_quiz_payload(question_count: int) -> Dict[str, Any]:
+    """Build the quiz every simulated student takes"""
+    return {
+        "title": "Load Test Quiz",
+        "time_limit_seconds": 3600,
+        "questions": [
+            {
+                "text": f"Question {i}?",
+                "options": [f"Option {i}-{choice}" for choice in range(4)],
+                "correct_answer": f"Option {i}-{i % 4}",
+                "difficulty": ("easy", "medium", "hard")[i % 3],
+                "category": f"Category {i % 5}",
+            }
+            for i in range(question_count)
+        ],
+    }
+
+
+async def student(
+    client: httpx.AsyncClient,
+    recorder: LatencyRecorder,
+    quiz_id: str,
+    question_count: int,
+    deadline: float,
+    think_time: float,
+    rng: random.Random,
+) -> int:
+    """Take the quiz repeatedly until the deadline and return the sessions completed"""
+    sessions = 0
+    while time.perf_counter() < deadline:
+        await recorder.request(client, "GET /quizzes/{id}", "GET", f"/quizzes/{quiz_id}")
+        started = await recorder.request(
+            client, "POST /quizzes/{id}/attempts", "POST", f"/quizzes/{quiz_id}/attempts"
+        )
+        if started is None:
+            continue
+        attempt_id = started.json()["attempt_id"]
+        for index in range(question_count):
+            if think_time:
+                await asyncio.sleep(rng.uniform(0, 2 * think_time))
+            await recorder.request(
+                client,
+                "POST /attempts/{id}/answers",
+                "POST",
+                f"/attempts/{attempt_id}/answers",
+                json={"question_index": index, "answer": f"Option {index}-{rng.randrange(4)}"},
+            )
+        await recorder.request(
+            client, "GET /attempts/{id}/results", "GET", f"/attempts/{attempt_id}/results"
+        )
+        sessions += 1
+    return sessions
+
+
+async def run_load(
+    url: str, concurrency: int, duration: float, question_count: int, think_time: float
+) -> Dict[str, Any]:
+    """Run the simulated students against a server and return the report"""
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=60.0) as client:
+        created = await client.post("/quizzes", json=make_quiz_payload(question_count))
+        created.raise_for_status()
+        quiz_id = created.json()["quiz_id"]
+
+        recorder = LatencyRecorder()
+        start = time.perf_counter()
+        deadline = start + duration
+        sessions = await asyncio.gather(
+            *(
+                student(
+                    client,
+                    recorder,
+                    quiz_id,
+                    question_count,
+                    deadline,
+                    think_time,
+                    random.Random(SEED + number),
+                )
+                for number in range(concurrency)
+            )
+        )
+        elapsed = time.perf_counter() - start
+        await client.delete(f"/quizzes/{quiz_id}")
+
+    endpoints = recorder.report(elapsed)
+    return {
+        "settings": {
+            "url": url,
+            "concurrency": concurrency,
+            "duration_s": duration,
+            "questions": question_count,
+            "think_time_s": think_time,
+        },
+        "elapsed_s": elapsed,
+        "sessions": sum(sessions),
+        "sessions_per_s": sum(sessions) / elapsed,
+        "throughput_rps": sum(entry["requests"] for entry in endpoints.values()) / elapsed,
+        "endpoints": endpoints,
+    }
+
+
+def free_port() -> int:
+    """Return a local TCP port that is currently unused"""
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+@contextmanager
+def local_server(storage: str, workers: int) -> Iterator[str]:
+    """Start the API with run_api.py on a free port, yield its URL, then stop it"""
+    port = free_port()
+    url = f"http://127.0.0.1:{port}"
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as data_dir:
+        command = [
+            sys.executable,
+            os.path.join(root, "run_api.py"),
+            "--port",
+            str(port),
+            "--storage",
+            storage,
+            "--db-path",
+            os.path.join(data_dir, "load_test.db" if storage == "sqlite" else "load_test.wal"),
+            "--workers",
+            str(workers),
+        ]
+        server = subprocess.Popen(
+            command, cwd=root, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+        )
+        try:
+            wait_until_healthy(url, server)
+            yield url
+        finally:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+                server.wait()
+
+
+def wait_until_healthy(url: str, server: subprocess.Popen) -> None:
+    """
+    Poll /health until the started server answers.
+
+    Raises:
+        RuntimeError: If the server exits or does not answer in time
+    """
+    deadline = time.monotonic() + SERVER_START_TIMEOUT
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError("API server exited before it started serving")
+        try:
+            if httpx.get(f"{url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError(f"API server did not answer within {SERVER_START_TIMEOUT:.0f}s")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the report as a table"""
+    print(
+        f"{report['sessions']} sessions in {report['elapsed_s']:.1f}s "
+        f"({report['sessions_per_s']:.1f} sessions/s, {report['throughput_rps']:.1f} req/s) "
+        f"with {report['settings']['concurrency']} students"
+    )
+    header = f"{'endpoint':<30} {'requests':>9} {'errors':>7} {'req/s':>9}"
+    header += "".join(f" {f'p{p} ms':>9}" for p in PERCENTILES) + f" {'max ms':>9}"
+    print(header)
+    for endpoint, entry in report["endpoints"].items():
+        row = f"{endpoint:<30} {entry['requests']:>9} {entry['errors']:>7}"
+        row += f" {entry['throughput_rps']:>9.1f}"
+        row += "".join(f" {entry[f'p{p}_ms']:>9.2f}" for p in PERCENTILES)
+        print(row + f" {entry['max_ms']:>9.2f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the Quiz API with simulated students")
+    parser.add_argument("--url", help="Test a running server instead of starting one")
+    parser.add_argument(
+        "--concurrency", type=int, default=20, help="Simultaneous students (default: 20)"
+    )
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds to run (default: 10)")
+    parser.add_argument(
+        "--questions", type=int, default=20, help="Questions in the quiz (default: 20)"
+    )
+    parser.add_argument(
+        "--think-time",
+        type=float,
+        default=0.0,
+        help="Mean seconds a student waits before each answer (default: 0)",
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["memory", "durable", "sqlite"],
+        default="memory",
+        help="Storage backend of the started server (default: memory)",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=1, help="Worker processes of the started server"
+    )
+    parser.add_argument("--json", metavar="PATH", help="Write the report as JSON to PATH")
+    args = parser.parse_args()
+
+    if args.concurrency < 1 or args.questions < 1:
+        parser.error("--concurrency and --questions must be at least 1")
+
+    def load(url: str) -> Dict[str, Any]:
+        return asyncio.run(
+            run_load(url, args.concurrency, args.duration, args.questions, args.think_time)
+        )
+
+    if args.url:
+        report = load(args.url)
+    else:
+        with local_server(args.storage, args.workers) as url:
+            report = load(url)
+
+    print_report(report)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Memory benchmark: bytes per question before and after the compact representation.
+
+Builds the same question bank with a dict-backed class laid out like the
+original Question (list options, no interning) and with the current slotted
+Question, and measures the memory each one allocates with tracemalloc.
+
+Usage:
+    python -m benchmarks.memory
+    python -m benchmarks.memory --questions 200000 --json
+"""
+
+import argparse
+import json
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+from src.question import Question
+from src.quiz import Quiz
+
+
+class DictBackedQuestion:
+    """The original Question layout: a per-instance __dict__ and list options"""
+
+    def __init__(
+        self,
+        text: str,
+        options: List[str],
+        correct_answer: str,
+        difficulty: str = "medium",
+        category: Optional[str] = None,
+    ) -> None:
+        self.text = text
+        self.options = options
+        self.correct_answer = correct_answer
+        self.difficulty = difficulty
+        self.category = category
+
+
+def question_fields(index: int) -> Dict[str, Any]:
+    """Build fresh field values, as if decoded from a request or database row"""
+    options = [f"Option {index}-{choice}" for choice in range(4)]
+    return {
+        "text": f"Question number {index}?",
+        "options": options,
+        "correct_answer": options[index % 4],
+        # Built at runtime, so equal values are separate objects unless interned
+        "difficulty": "".join(["me", "dium"]),
+        "category": f"Category {index % 20}",
+    }
+
+
+def measure(build: Callable[[], Any]) -> int:
+    """Return the bytes still allocated by the object that build() returns"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return after - before
+
+
+def run(question_count: int) -> Dict[str, Any]:
+    """Measure bytes per question for each representation"""
+    fields = [question_fields(i) for i in range(question_count)]
+
+    def build_dict_backed() -> List[DictBackedQuestion]:
+        return [DictBackedQuestion(**{**f, "options": list(f["options"])}) for f in fields]
+
+    def build_slotted() -> List[Question]:
+        return [Question(**{**f, "options": list(f["options"])}) for f in fields]
+
+    def build_quiz() -> Quiz:
+        quiz = Quiz(title="Memory benchmark")
+        quiz.add_questions(Question(**{**f, "options": list(f["options"])}) for f in fields)
+        return quiz
+
+    before = measure(build_dict_backed) / question_count
+    after = measure(build_slotted) / question_count
+    in_quiz = measure(build_quiz) / question_count
+    return {
+        "questions": question_count,
+        "bytes_per_question_before": round(before, 1),
+        "bytes_per_question_after": round(after, 1),
+        "bytes_per_question_in_quiz": round(in_quiz, 1),
+        "saving_percent": round((before - after) / before * 100, 1),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Measure memory used per question")
+    parser.add_argument(
+        "--questions", type=int, default=100_000, help="Questions to build (default: 100000)"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    report = run(args.questions)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"Questions:                     {report['questions']}")
+    print(f"Bytes/question (dict-backed):  {report['bytes_per_question_before']}")
+    print(f"Bytes/question (slotted):      {report['bytes_per_question_after']}")
+    print(f"Bytes/question (inside Quiz):  {report['bytes_per_question_in_quiz']}")
+    print(f"Saving:                        {report['saving_percent']}%")
+
+
+if __name__ == "__main__":
+    main()
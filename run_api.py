@@ -6,8 +6,18 @@ Usage:
     
 Or with custom settings:
     python run_api.py --host 0.0.0.0 --port 8080
+
+Or with durable SQLite storage:
+    python run_api.py --storage sqlite --db-path quizzes.db
+
+Or with in-memory storage made durable by a write-ahead log:
+    python run_api.py --storage durable --db-path quizzes.wal
+
+Or with several worker processes sharing one SQLite database:
+    python run_api.py --storage sqlite --workers 4
 """
 
+import os
 import uvicorn
 import argparse
 
@@ -31,8 +41,40 @@ def main():
         action="store_true",
         help="Enable auto-reload on code changes"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes (default: 1, requires --storage sqlite if > 1)"
+    )
+    parser.add_argument(
+        "--storage",
+        choices=["memory", "durable", "sqlite"],
+        default="memory",
+        help="Storage backend (default: memory)"
+    )
+    parser.add_argument(
+        "--db-path",
+        type=str,
+        default=None,
+        help="SQLite database file (default: quizzes.db), or log directory "
+        "for --storage durable (default: quizzes.wal)"
+    )
     
     args = parser.parse_args()
+
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.workers > 1 and args.storage in ("memory", "durable"):
+        # Each worker would get its own private in-memory database
+        parser.error("--workers > 1 requires --storage sqlite")
+    if args.workers > 1 and args.reload:
+        parser.error("--reload cannot be combined with --workers > 1")
+
+    # The app reads its storage settings from the environment when imported
+    os.environ["QUIZ_STORAGE"] = args.storage
+    if args.db_path:
+        os.environ["QUIZ_DB_PATH"] = args.db_path
     
     print("=" * 60)
     print("🚀 Starting Quiz API Server")
@@ -40,6 +82,8 @@ def main():
     print(f"📍 Server: http://{args.host}:{args.port}")
     print(f"📚 API Docs: http://{args.host}:{args.port}/docs")
     print(f"📖 ReDoc: http://{args.host}:{args.port}/redoc")
+    print(f"💾 Storage: {args.storage}")
+    print(f"⚙️  Workers: {args.workers}")
     print("=" * 60)
     print("\n💡 Press CTRL+C to stop the server\n")
     
@@ -47,7 +91,8 @@ def main():
         "src.api:app",
         host=args.host,
         port=args.port,
-        reload=args.reload
+        reload=args.reload,
+        workers=args.workers
     )
 
 
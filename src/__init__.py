@@ -1,7 +1,30 @@
 from .question import Question
 from .quiz import Quiz
 from .result import QuizResult
+from .attempt import QuizAttempt
+from .storage import (
+    AttemptClosedError,
+    QuizStorage,
+    QuizSummary,
+    VersionConflictError,
+    create_database,
+)
 from .database import QuizDatabase
+from .durable_database import DurableQuizDatabase
+from .sqlite_database import SQLiteQuizDatabase
 
 # Define what gets imported with "from quiz import *"
-__all__ = ["Question", "Quiz", "QuizResult", "QuizDatabase"]
+__all__ = [
+    "Question",
+    "Quiz",
+    "QuizResult",
+    "QuizAttempt",
+    "QuizStorage",
+    "QuizSummary",
+    "VersionConflictError",
+    "AttemptClosedError",
+    "QuizDatabase",
+    "DurableQuizDatabase",
+    "SQLiteQuizDatabase",
+    "create_database",
+]
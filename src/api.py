@@ -3,24 +3,125 @@ REST API for Quiz Application using FastAPI.
 
 This module provides HTTP endpoints for CRUD operations on quizzes.
 Run with: uvicorn src.api:app --reload
+
+The storage backend is chosen with the QUIZ_STORAGE environment variable
+("memory", "durable" or "sqlite"); QUIZ_DB_PATH sets the SQLite database file
+or the durable backend's log directory.
+Set QUIZ_METRICS=1 to record Prometheus-style metrics, served at /metrics,
+and QUIZ_PROFILING=1 or QUIZ_PROFILE_TOKEN to profile slow requests (see
+src/profiling.py); kept profiles are listed at /profiles.
+
+Handlers reach the backend through ``store`` (see src/async_storage.py):
+blocking storage operations and the encoding of large quizzes run in worker
+threads, so a slow request does not hold up the event loop.
 """
 
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any, Union
+import asyncio
+import json
+import logging
+import os
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ConfigDict, ValidationError, model_validator
+from typing import AsyncIterator, Iterator, List, Optional, Dict, Any, Tuple, Union
+from src.async_storage import AsyncQuizStorage
+from src.attempt import QuizAttempt
+from src.metrics import REGISTRY, MetricsMiddleware
+from src.profiling import Profiler, ProfilingMiddleware
 from src.quiz import Quiz
 from src.question import Question
-from src.database import QuizDatabase
+from src.result import QuizResult
+from src.response_cache import ResponseCache
+from src.storage import AttemptClosedError, QuizStorage, VersionConflictError, create_database
+
+logger = logging.getLogger(__name__)
+
+# How often attempts whose time limit has run out are closed, in seconds
+ATTEMPT_SWEEP_SECONDS = 1.0
+
+
+async def close_expired_attempts_periodically() -> None:
+    """Close expired attempts in bulk, once per ATTEMPT_SWEEP_SECONDS, until cancelled"""
+    while True:
+        await asyncio.sleep(ATTEMPT_SWEEP_SECONDS)
+        try:
+            await store.close_expired_attempts()
+        except Exception:  # A failed sweep must not stop the later ones
+            logger.exception("Closing expired attempts failed")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run the expired-attempt sweep for as long as the app is serving"""
+    sweeper = asyncio.create_task(close_expired_attempts_periodically())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+
 
 # Initialize FastAPI app and database
 app = FastAPI(
     title="Quiz API",
     description="REST API for managing quizzes with CRUD operations",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Singleton database instance
-db: QuizDatabase = QuizDatabase()
+db: QuizStorage = create_database(
+    os.environ.get("QUIZ_STORAGE", "memory"), os.environ.get("QUIZ_DB_PATH")
+)
+
+# Async access to the database for the handlers
+store = AsyncQuizStorage(db)
+
+# Encoded GET /quizzes/{quiz_id} bodies, keyed by quiz ID and version
+quiz_response_cache = ResponseCache(
+    max_entries=int(os.environ.get("QUIZ_RESPONSE_CACHE_SIZE", "1024"))
+)
+
+# Request and storage metrics; while disabled, each request costs one flag check
+REGISTRY.enabled = os.environ.get("QUIZ_METRICS") == "1"
+app.add_middleware(MetricsMiddleware)
+
+# Opt-in cProfile capture of slow requests; inactive unless configured
+profiler = Profiler.from_env()
+app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+# Number of quizzes stored per storage write by POST /quizzes:bulk
+BULK_BATCH_SIZE = 500
+
+# Longest line POST /quizzes:bulk accepts, in bytes; it is buffered whole
+MAX_NDJSON_LINE_BYTES = 16 * 1024 * 1024
+
+# How often a read-modify-write of a quiz is retried after a version conflict
+MAX_UPDATE_RETRIES = 5
+
+# Quizzes with at least this many questions are encoded in a worker thread
+OFFLOAD_QUESTION_COUNT = 200
+
+
+# Gauges computed when /metrics is scraped
+STORE_GAUGES = {
+    "quizzes": ("quiz_store_quizzes", "Quizzes in the store"),
+    "questions": ("quiz_store_questions", "Questions in stored quizzes"),
+    "bank_questions": ("quiz_store_bank_questions", "Unique questions in the question bank"),
+    "attempts": ("quiz_store_attempts", "Attempts in the store"),
+    "bytes": ("quiz_store_bytes", "Approximate size of the store in bytes"),
+}
+
+
+def store_gauges() -> Iterator[Tuple[str, str, float]]:
+    """Report store object counts and size, and response cache occupancy"""
+    for key, value in db.get_stats().items():
+        name, help_text = STORE_GAUGES[key]
+        yield name, help_text, value
+    yield "quiz_response_cache_entries", "Cached quiz response bodies", len(quiz_response_cache)
+
+
+REGISTRY.add_collector(store_gauges)
 
 
 # Pydantic models for request/response validation
@@ -44,10 +145,26 @@ class QuestionModel(BaseModel):
     )
 
 
+class QuestionRefModel(BaseModel):
+    question_id: str = Field(..., min_length=1, description="Content ID of a bank question")
+
+    model_config = ConfigDict(
+        json_schema_extra={"example": {"question_id": "5f2b8c0e9a7d4e13b6c1f0a2d3e4b5c6"}}
+    )
+
+
+class QuestionBankModel(BaseModel):
+    questions: List[QuestionModel] = Field(
+        ..., min_length=1, description="Questions to add to the question bank"
+    )
+
+
 class QuizCreateModel(BaseModel):
     title: str = Field(..., min_length=1, description="Quiz title")
     time_limit_seconds: Optional[int] = Field(None, description="Time limit in seconds")
-    questions: List[QuestionModel] = Field(default=[], description="List of questions")
+    questions: List[Union[QuestionModel, QuestionRefModel]] = Field(
+        default=[], description="Inline questions or references to bank questions"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -73,6 +190,7 @@ class QuizResponseModel(BaseModel):
     title: str
     time_limit_seconds: Optional[int]
     question_count: int
+    version: int
 
     model_config = ConfigDict(
         json_schema_extra={
@@ -81,6 +199,7 @@ class QuizResponseModel(BaseModel):
                 "title": "Python Basics Quiz",
                 "time_limit_seconds": 600,
                 "question_count": 5,
+                "version": 1,
             }
         }
     )
@@ -88,12 +207,83 @@ class QuizResponseModel(BaseModel):
 
 class AnswerSubmissionModel(BaseModel):
     question_index: int = Field(..., ge=0, description="Question index (0-based)")
-    answer: str = Field(..., description="Submitted answer")
+    answer: Optional[str] = Field(None, description="Submitted answer text")
+    answer_index: Optional[int] = Field(
+        None, ge=0, description="Index of the chosen option (0-based), instead of answer"
+    )
 
     model_config = ConfigDict(
         json_schema_extra={"example": {"question_index": 0, "answer": "Collection"}}
     )
 
+    @model_validator(mode="after")
+    def check_one_answer(self) -> "AnswerSubmissionModel":
+        """Require exactly one of answer and answer_index"""
+        if (self.answer is None) == (self.answer_index is None):
+            raise ValueError("Provide exactly one of answer and answer_index")
+        return self
+
+    def value(self) -> Union[str, int]:
+        """The submitted answer text, or the option index in index mode"""
+        return self.answer if self.answer_index is None else self.answer_index
+
+    def is_correct(self, question: Question) -> bool:
+        """Check this submission against a question"""
+        if self.answer_index is None:
+            return question.check_answer(self.answer)
+        return question.check_answer_index(self.answer_index)
+
+
+class AnswerBatchModel(BaseModel):
+    answers: List[AnswerSubmissionModel] = Field(
+        ..., min_length=1, description="Answers to submit, applied in order"
+    )
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "answers": [
+                    {"question_index": 0, "answer": "Collection"},
+                    {"question_index": 1, "answer": "Immutable"},
+                ]
+            }
+        }
+    )
+
+
+class AttemptResponseModel(BaseModel):
+    attempt_id: str
+    quiz_id: str
+    start_time: float
+    question_count: int
+    expires_at: Optional[float] = None
+    shuffled: bool = False
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "attempt_id": "0f8e4c1a-7b2d-4e59-9c3a-5d6f7e8a9b0c",
+                "quiz_id": "123e4567-e89b-12d3-a456-426614174000",
+                "start_time": 1700000000.0,
+                "question_count": 5,
+                "expires_at": 1700000600.0,
+                "shuffled": False,
+            }
+        }
+    )
+
+
+# Helper function to convert Question to dict
+def question_to_dict(question: Question) -> Dict[str, Any]:
+    """Convert Question object to dictionary for JSON response"""
+    return {
+        "text": question.text,
+        "options": question.options,
+        "correct_answer": question.correct_answer,
+        "difficulty": question.difficulty,
+        "category": question.category,
+    }
+
 
 # Helper function to convert Quiz to dict
 def quiz_to_dict(quiz: Quiz, quiz_id: Optional[str] = None) -> Dict[str, Any]:
@@ -103,19 +293,238 @@ def quiz_to_dict(quiz: Quiz, quiz_id: Optional[str] = None) -> Dict[str, Any]:
         "title": quiz.title,
         "time_limit_seconds": quiz.time_limit_seconds,
         "question_count": len(quiz.questions),
-        "questions": [
-            {
-                "text": q.text,
-                "options": q.options,
-                "correct_answer": q.correct_answer,
-                "difficulty": q.difficulty,
-                "category": q.category,
-            }
-            for q in quiz.questions
+        "version": quiz.version,
+        "questions": [question_to_dict(q) for q in quiz.questions],
+    }
+
+
+# Helper function to encode a quiz as a GET /quizzes/{quiz_id} body
+def encode_quiz(quiz: Quiz, quiz_id: str) -> bytes:
+    """Encode a quiz as a JSON response body"""
+    return json.dumps(quiz_to_dict(quiz, quiz_id)).encode("utf-8")
+
+
+# Helper function to convert a validated question model to Question
+def model_to_question(q_data: QuestionModel) -> Question:
+    """Build a Question object from request data"""
+    return Question(
+        text=q_data.text,
+        options=q_data.options,
+        correct_answer=q_data.correct_answer,
+        difficulty=q_data.difficulty,
+        category=q_data.category,
+    )
+
+
+# Helper function to convert a validated request model to Quiz
+async def model_to_quiz(quiz_data: QuizCreateModel) -> Quiz:
+    """
+    Build a Quiz object and its questions from request data.
+
+    Referenced questions are fetched from the question bank in one call.
+
+    Raises:
+        KeyError: If a referenced question is not in the bank
+    """
+    references = [q.question_id for q in quiz_data.questions if isinstance(q, QuestionRefModel)]
+    banked = iter(await store.get_bank_questions(references) if references else ())
+    quiz = Quiz(title=quiz_data.title, time_limit_seconds=quiz_data.time_limit_seconds)
+    quiz.add_questions(
+        next(banked) if isinstance(q_data, QuestionRefModel) else model_to_question(q_data)
+        for q_data in quiz_data.questions
+    )
+    return quiz
+
+
+class LineTooLongError(ValueError):
+    """Raised when an NDJSON line is longer than MAX_NDJSON_LINE_BYTES"""
+
+    def __init__(self, line_number: int) -> None:
+        super().__init__(f"Line {line_number} is longer than {MAX_NDJSON_LINE_BYTES} bytes")
+        self.line_number = line_number
+
+
+# Helper function to split a streamed request body into NDJSON lines
+async def iter_ndjson_lines(request: Request) -> AsyncIterator[Tuple[int, bytes]]:
+    """
+    Yield (line number, line) for each non-blank line of the body as it arrives.
+
+    Each chunk is searched once, and the pieces of a line spanning chunks are
+    joined when it ends.
+
+    Raises:
+        LineTooLongError: If a line is longer than MAX_NDJSON_LINE_BYTES
+    """
+    parts: List[bytes] = []  # Pieces of the current line from earlier chunks
+    pending = 0  # Their total length
+    line_number = 0
+    async for chunk in request.stream():
+        start = 0
+        end = chunk.find(b"\n")
+        while end != -1:
+            line_number += 1
+            if pending + end - start > MAX_NDJSON_LINE_BYTES:
+                raise LineTooLongError(line_number)
+            line = b"".join(parts + [chunk[start:end]]) if parts else chunk[start:end]
+            parts, pending = [], 0
+            if line.strip():
+                yield line_number, line
+            start = end + 1
+            end = chunk.find(b"\n", start)
+        if start < len(chunk):
+            pending += len(chunk) - start
+            if pending > MAX_NDJSON_LINE_BYTES:
+                raise LineTooLongError(line_number + 1)
+            parts.append(chunk[start:])
+    line = b"".join(parts)
+    if line.strip():
+        yield line_number + 1, line
+
+
+# Helper function to read a version from an If-Match header
+def parse_version(etag: str) -> int:
+    """Parse a quiz version from an entity tag such as "3" or W/"3" """
+    try:
+        return int(etag.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid If-Match header")
+
+
+# Helper function to compare an If-None-Match header with an ETag
+def etag_matches(header: str, etag: str) -> bool:
+    """Check whether an If-None-Match header (possibly a list or "*") matches an ETag"""
+    candidates = [candidate.strip().removeprefix("W/") for candidate in header.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+# Helper function to record answers on a quiz that was read for an update
+def record_quiz_answers(quiz: Quiz, submissions: List[AnswerSubmissionModel]) -> None:
+    """Record answers on a quiz, checking every question index before recording any"""
+    if max(submission.question_index for submission in submissions) >= len(quiz.questions):
+        raise HTTPException(status_code=400, detail="Invalid question index")
+
+    try:
+        for submission in submissions:
+            if submission.answer_index is None:
+                quiz.submit_answer(submission.question_index, submission.answer)
+            else:
+                quiz.submit_answer_index(submission.question_index, submission.answer_index)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid option index")
+
+
+# Helper function to record answers on a quiz with a conditional update
+async def apply_quiz_answers(quiz_id: str, submissions: List[AnswerSubmissionModel]) -> Quiz:
+    """
+    Record answers on a stored quiz and return the updated quiz.
+
+    Every index is checked before anything is recorded. The quiz is written
+    back once, conditional on the version that was read, and the whole
+    read-modify-write is retried if another request updated the quiz first.
+    """
+    for _ in range(MAX_UPDATE_RETRIES):
+        quiz = await store.get_quiz(quiz_id)
+
+        if quiz is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+
+        record_quiz_answers(quiz, submissions)
+
+        # Update quiz in database, unless it changed since it was read
+        try:
+            updated = await store.update_quiz(quiz_id, quiz, expected_version=quiz.version)
+        except VersionConflictError:
+            continue
+        if not updated:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        quiz_response_cache.invalidate(quiz_id)
+        return quiz
+
+    raise HTTPException(status_code=409, detail="Quiz was modified by another request")
+
+
+# Helper function to pair submitted answers with their correctness
+def answer_results(
+    submissions: List[AnswerSubmissionModel], correctness: List[bool]
+) -> List[Dict[str, Any]]:
+    """Describe each submitted answer and whether it was correct"""
+    return [
+        {
+            "question_index": submission.question_index,
+            "submitted_answer": submission.answer,
+            "answer_index": submission.answer_index,
+            "is_correct": is_correct,
+        }
+        for submission, is_correct in zip(submissions, correctness)
+    ]
+
+
+# Helper function to convert QuizResult to dict
+def result_to_dict(result: QuizResult, incorrect: List[int]) -> Dict[str, Any]:
+    """Convert QuizResult and incorrect answer indices to dictionary for JSON response"""
+    return {
+        "score": result.score,
+        "total": result.total,
+        "percentage": result.percentage,
+        "is_perfect": result.is_perfect(),
+        "is_passing": result.is_passing(),
+        "summary": result.get_summary(),
+        "incorrect_question_indices": incorrect,
+    }
+
+
+# Helper function to list the incorrect answers of an attempt in its presented order
+def attempt_incorrect_answers(attempt: QuizAttempt) -> List[int]:
+    """Return the positions, as presented by the attempt, of incorrectly answered questions"""
+    incorrect = attempt.get_incorrect_answers()
+    order = attempt.order
+    return incorrect if order is None else order.question_positions(incorrect)
+
+
+# Helper function to convert a score breakdown to dict
+def breakdown_to_dict(breakdown: Dict[str, Dict[Any, Dict[str, float]]]) -> Dict[str, Any]:
+    """Convert a score breakdown to lists of entries (categories may be null)"""
+    return {
+        "categories": [
+            {"category": category, **score} for category, score in breakdown["categories"].items()
+        ],
+        "difficulties": [
+            {"difficulty": difficulty, **score}
+            for difficulty, score in breakdown["difficulties"].items()
         ],
     }
 
 
+# ============================================================================
+# QUESTION BANK ENDPOINTS
+# ============================================================================
+
+
+@app.post("/questions", status_code=201)
+async def add_bank_questions(bank_data: QuestionBankModel) -> Dict[str, Any]:
+    """
+    CREATE - Add questions to the shared question bank.
+
+    Returns the content ID of each question, in order. Adding a question
+    that is already in the bank returns its existing ID. Quizzes can then
+    reference the questions with {"question_id": ...} instead of inlining them.
+    """
+    question_ids = await store.add_bank_questions(
+        [model_to_question(q) for q in bank_data.questions]
+    )
+    return {"question_ids": question_ids}
+
+
+@app.get("/questions/{question_id}")
+async def get_bank_question(question_id: str) -> Dict[str, Any]:
+    """READ - Get a question from the question bank by content ID"""
+    try:
+        (question,) = await store.get_bank_questions([question_id])
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Question not found")
+    return {"question_id": question_id, **question_to_dict(question)}
+
+
 # ============================================================================
 # CRUD ENDPOINTS
 # ============================================================================
@@ -128,108 +537,197 @@ async def create_quiz(quiz_data: QuizCreateModel) -> QuizResponseModel:
 
     Returns the created quiz with its generated ID.
     """
-    # Create Quiz object
-    quiz = Quiz(title=quiz_data.title, time_limit_seconds=quiz_data.time_limit_seconds)
-
-    # Add questions
-    for q_data in quiz_data.questions:
-        question = Question(
-            text=q_data.text,
-            options=q_data.options,
-            correct_answer=q_data.correct_answer,
-            difficulty=q_data.difficulty,
-            category=q_data.category,
-        )
-        quiz.add_question(question)
+    # Create Quiz object with its questions
+    try:
+        quiz = await model_to_quiz(quiz_data)
+    except KeyError as error:
+        raise HTTPException(status_code=400, detail=f"Unknown question ID: {error.args[0]}")
 
     # Store in database
-    quiz_id = db.add_quiz(quiz)
+    quiz_id = await store.add_quiz(quiz)
 
     return QuizResponseModel(
         quiz_id=quiz_id,
         title=quiz.title,
         time_limit_seconds=quiz.time_limit_seconds,
         question_count=len(quiz.questions),
+        version=1,
     )
 
 
 @app.get("/quizzes/{quiz_id}")
-async def get_quiz(quiz_id: str) -> Dict[str, Any]:
+async def get_quiz(
+    quiz_id: str,
+    if_none_match: Optional[str] = Header(None, description="ETag of a cached copy"),
+) -> Response:
     """
     READ - Retrieve a specific quiz by ID.
 
-    Returns the complete quiz with all questions.
+    Returns the complete quiz with all questions. The encoded body is cached
+    per quiz version and sent with an ETag; a matching If-None-Match header
+    gets 304 Not Modified without a body.
     """
-    quiz = db.get_quiz(quiz_id)
+    version = await store.get_quiz_version(quiz_id)
 
-    if quiz is None:
+    if version is None:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    return quiz_to_dict(quiz, quiz_id)
+    etag = f'"{version}"'
+    if if_none_match is not None and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+
+    body = quiz_response_cache.get(quiz_id, version)
+    if body is None:
+        quiz = await store.get_quiz(quiz_id)
+        if quiz is None:
+            raise HTTPException(status_code=404, detail="Quiz not found")
+        if len(quiz.questions) >= OFFLOAD_QUESTION_COUNT:
+            body = await store.run(encode_quiz, quiz, quiz_id)
+        else:
+            body = encode_quiz(quiz, quiz_id)
+        quiz_response_cache.put(quiz_id, quiz.version, body)
+        etag = f'"{quiz.version}"'
+
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+@app.post("/quizzes:bulk", status_code=201)
+async def bulk_import_quizzes(request: Request) -> Dict[str, Any]:
+    """
+    CREATE - Import many quizzes from newline-delimited JSON (NDJSON).
+
+    Each line of the body is one quiz in the same format as POST /quizzes.
+    The body is read as a stream and quizzes are stored in batches, so memory
+    use stays bounded. If a line is invalid, every quiz before it is stored
+    and a 422 reports the line number and the number of quizzes created; a
+    line longer than MAX_NDJSON_LINE_BYTES gets a 413 the same way.
+    """
+    quiz_ids: List[str] = []
+    batch: List[Quiz] = []
+
+    try:
+        async for line_number, line in iter_ndjson_lines(request):
+            try:
+                quiz_data = QuizCreateModel.model_validate_json(line)
+            except ValidationError as error:
+                quiz_ids.extend(await store.add_quizzes(batch))
+                raise HTTPException(
+                    status_code=422,
+                    detail={
+                        "message": f"Invalid quiz on line {line_number}",
+                        "line": line_number,
+                        "created": len(quiz_ids),
+                        "errors": error.errors(include_url=False, include_context=False),
+                    },
+                )
+            try:
+                batch.append(await model_to_quiz(quiz_data))
+            except KeyError as error:
+                quiz_ids.extend(await store.add_quizzes(batch))
+                raise HTTPException(
+                    status_code=422,
+                    detail={
+                        "message": f"Unknown question ID on line {line_number}: {error.args[0]}",
+                        "line": line_number,
+                        "created": len(quiz_ids),
+                    },
+                )
+            if len(batch) >= BULK_BATCH_SIZE:
+                quiz_ids.extend(await store.add_quizzes(batch))
+                batch = []
+    except LineTooLongError as error:
+        quiz_ids.extend(await store.add_quizzes(batch))
+        raise HTTPException(
+            status_code=413,
+            detail={"message": str(error), "line": error.line_number, "created": len(quiz_ids)},
+        )
+
+    quiz_ids.extend(await store.add_quizzes(batch))
+    return {"created": len(quiz_ids), "quiz_ids": quiz_ids}
+
+
+@app.get("/quizzes:export")
+async def export_quizzes() -> StreamingResponse:
+    """
+    READ - Export every quiz as newline-delimited JSON (NDJSON).
+
+    Each line has the same format as GET /quizzes/{quiz_id} and can be fed
+    back to POST /quizzes:bulk. Quizzes are streamed a page at a time.
+    """
+
+    # A plain iterator, which Starlette runs in a worker thread
+    def generate() -> Iterator[bytes]:
+        for quiz in db.iter_quizzes():
+            yield encode_quiz(quiz, quiz.id) + b"\n"
+
+    return StreamingResponse(generate(), media_type="application/x-ndjson")
 
 
 @app.get("/quizzes")
-async def list_quizzes() -> Dict[str, Any]:
+async def list_quizzes(
+    limit: int = Query(100, ge=1, le=1000, description="Maximum quizzes per page"),
+    cursor: Optional[str] = Query(None, description="Cursor returned with the previous page"),
+) -> Dict[str, Any]:
     """
-    READ - List all quizzes in the database.
+    READ - List quizzes in the database, one page at a time.
 
-    Returns a list of all quizzes with their IDs and basic information.
+    Returns the IDs and basic information of up to `limit` quizzes, plus a
+    `next_cursor` to pass back for the following page (null on the last page).
     """
-    quizzes = db.list_quizzes()
+    try:
+        summaries, next_cursor = await store.list_quiz_summaries(limit=limit, cursor=cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
 
-    # Note: We can't get the quiz_id from Quiz object, so we return without IDs
-    # In a real app, you'd store the ID in the Quiz object or maintain a reverse mapping
     return {
-        "total": len(quizzes),
-        "quizzes": [
-            {
-                "quiz_id": q.id,
-                "title": q.title,
-                "time_limit_seconds": q.time_limit_seconds,
-                "question_count": len(q.questions),
-            }
-            for q in quizzes
-        ],
+        "total": await store.count(),
+        "quizzes": [summary._asdict() for summary in summaries],
+        "next_cursor": next_cursor,
     }
 
 
 @app.put("/quizzes/{quiz_id}")
-async def update_quiz(quiz_id: str, quiz_data: QuizCreateModel) -> Dict[str, Any]:
+async def update_quiz(
+    quiz_id: str,
+    quiz_data: QuizCreateModel,
+    if_match: Optional[str] = Header(None, description="Quiz version the update is based on"),
+) -> Dict[str, Any]:
     """
     UPDATE - Modify an existing quiz.
 
-    Replaces the quiz with the provided data.
+    Replaces the quiz with the provided data. If an If-Match header carries a
+    version and the quiz has been changed since, returns 409 Conflict.
     """
     # Check if quiz exists
-    existing_quiz = db.get_quiz(quiz_id)
+    existing_quiz = await store.get_quiz(quiz_id)
     if existing_quiz is None:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    # Create updated Quiz object
-    updated_quiz = Quiz(title=quiz_data.title, time_limit_seconds=quiz_data.time_limit_seconds)
-
-    # Add questions
-    for q_data in quiz_data.questions:
-        question = Question(
-            text=q_data.text,
-            options=q_data.options,
-            correct_answer=q_data.correct_answer,
-            difficulty=q_data.difficulty,
-            category=q_data.category,
-        )
-        updated_quiz.add_question(question)
+    expected_version = existing_quiz.version if if_match is None else parse_version(if_match)
+
+    # Create updated Quiz object with its questions
+    try:
+        updated_quiz = await model_to_quiz(quiz_data)
+    except KeyError as error:
+        raise HTTPException(status_code=400, detail=f"Unknown question ID: {error.args[0]}")
 
     # Update in database
-    success = db.update_quiz(quiz_id, updated_quiz)
+    try:
+        success = await store.update_quiz(quiz_id, updated_quiz, expected_version=expected_version)
+    except VersionConflictError:
+        raise HTTPException(status_code=409, detail="Quiz was modified by another request")
 
     if not success:
-        raise HTTPException(status_code=500, detail="Failed to update quiz")  # pragma: no cover
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    quiz_response_cache.invalidate(quiz_id)
 
     return {
         "message": "Quiz updated successfully",
         "quiz_id": quiz_id,
         "title": updated_quiz.title,
         "question_count": len(updated_quiz.questions),
+        "version": expected_version + 1,
     }
 
 
@@ -240,11 +738,13 @@ async def delete_quiz(quiz_id: str) -> Dict[str, Any]:
 
     Returns success message if deleted.
     """
-    success = db.delete_quiz(quiz_id)
+    success = await store.delete_quiz(quiz_id)
 
     if not success:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
+    quiz_response_cache.invalidate(quiz_id)
+
     return {"message": "Quiz deleted successfully", "quiz_id": quiz_id}
 
 
@@ -258,34 +758,46 @@ async def submit_answer(quiz_id: str, submission: AnswerSubmissionModel) -> Dict
     """
     Submit an answer to a quiz question.
 
-    Updates the quiz with the submitted answer.
+    Updates the quiz with the submitted answer. The update is conditional on
+    the version that was read, and is retried if another request got there first.
     """
-    quiz = db.get_quiz(quiz_id)
-
-    if quiz is None:
-        raise HTTPException(status_code=404, detail="Quiz not found")
-
-    if submission.question_index >= len(quiz.questions):
-        raise HTTPException(status_code=400, detail="Invalid question index")
-
-    # Submit answer
-    quiz.submit_answer(submission.question_index, submission.answer)
-
-    # Update quiz in database
-    db.update_quiz(quiz_id, quiz)
+    quiz = await apply_quiz_answers(quiz_id, [submission])
 
     # Check if answer is correct
-    question = quiz.questions[submission.question_index]
-    is_correct = question.check_answer(submission.answer)
+    is_correct = submission.is_correct(quiz.questions[submission.question_index])
 
     return {
         "message": "Answer submitted",
         "question_index": submission.question_index,
         "submitted_answer": submission.answer,
+        "answer_index": submission.answer_index,
         "is_correct": is_correct,
     }
 
 
+@app.post("/quizzes/{quiz_id}/answers:batch")
+async def submit_answers(quiz_id: str, batch: AnswerBatchModel) -> Dict[str, Any]:
+    """
+    Submit several answers to a quiz in one request.
+
+    All question indices are checked before anything is recorded, and the
+    answers are stored with a single quiz update. Returns the correctness of
+    each answer and the updated result.
+    """
+    quiz = await apply_quiz_answers(quiz_id, batch.answers)
+    correctness = [
+        submission.is_correct(quiz.questions[submission.question_index])
+        for submission in batch.answers
+    ]
+
+    return {
+        "message": "Answers submitted",
+        "quiz_id": quiz_id,
+        "answers": answer_results(batch.answers, correctness),
+        **result_to_dict(quiz.get_result(), quiz.get_incorrect_answers()),
+    }
+
+
 @app.get("/quizzes/{quiz_id}/results")
 async def get_quiz_results(quiz_id: str) -> Dict[str, Any]:
     """
@@ -293,24 +805,215 @@ async def get_quiz_results(quiz_id: str) -> Dict[str, Any]:
 
     Returns score, percentage, and detailed feedback.
     """
-    quiz = db.get_quiz(quiz_id)
+    quiz = await store.get_quiz(quiz_id)
 
     if quiz is None:
         raise HTTPException(status_code=404, detail="Quiz not found")
 
-    result = quiz.get_result()
-    incorrect = quiz.get_incorrect_answers()
-
     return {
         "quiz_id": quiz_id,
         "title": quiz.title,
-        "score": result.score,
-        "total": result.total,
-        "percentage": result.percentage,
-        "is_perfect": result.is_perfect(),
-        "is_passing": result.is_passing(),
-        "summary": result.get_summary(),
-        "incorrect_question_indices": incorrect,
+        **result_to_dict(quiz.get_result(), quiz.get_incorrect_answers()),
+    }
+
+
+@app.get("/quizzes/{quiz_id}/results/breakdown")
+async def get_quiz_results_breakdown(quiz_id: str) -> Dict[str, Any]:
+    """
+    Get the score of a quiz for every category and difficulty level.
+
+    All groups are scored in a single pass over the submitted answers.
+    """
+    quiz = await store.get_quiz(quiz_id)
+
+    if quiz is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    return {"quiz_id": quiz_id, **breakdown_to_dict(quiz.get_score_breakdown())}
+
+
+# ============================================================================
+# ATTEMPT ENDPOINTS
+# ============================================================================
+
+
+@app.post("/quizzes/{quiz_id}/attempts", response_model=AttemptResponseModel, status_code=201)
+async def start_attempt(
+    quiz_id: str,
+    shuffle: bool = Query(False, description="Present questions and options in a random order"),
+) -> AttemptResponseModel:
+    """
+    Start a new attempt at a quiz.
+
+    Each attempt keeps its own answers, so many people can take the same quiz at once.
+    If the quiz has a time limit, `expires_at` is when the attempt stops accepting answers.
+    A shuffled attempt serves its questions and options in its own order from
+    GET /attempts/{attempt_id}/questions, and question and option indices
+    submitted to it refer to that order.
+    """
+    attempt_id = await store.start_attempt(quiz_id, shuffle)
+    attempt = await store.get_attempt(attempt_id) if attempt_id is not None else None
+
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Quiz not found")
+
+    return AttemptResponseModel(
+        attempt_id=attempt.id,
+        quiz_id=quiz_id,
+        start_time=attempt.start_time,
+        question_count=len(attempt.quiz.questions),
+        expires_at=attempt.expires_at,
+        shuffled=attempt.seed is not None,
+    )
+
+
+@app.get("/attempts/{attempt_id}/questions")
+async def get_attempt_questions(
+    attempt_id: str,
+    offset: int = Query(0, ge=0, description="Position of the first question to return"),
+    limit: int = Query(100, ge=1, le=1000, description="Maximum questions to return"),
+) -> Dict[str, Any]:
+    """
+    READ - Get the questions of an attempt, in the order the attempt presents them.
+
+    Correct answers are left out. For a shuffled attempt, only the requested
+    questions are looked up and their options reordered; the quiz itself is
+    never copied or reordered.
+    """
+    attempt = await store.get_attempt(attempt_id)
+
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+
+    questions = attempt.quiz.questions
+    order = attempt.order
+    served = []
+    for position in range(offset, min(offset + limit, len(questions))):
+        index = position if order is None else order.question_index(position)
+        question = questions[index]
+        options = question.options
+        if order is not None:
+            options = [options[i] for i in order.options(index, len(options))]
+        served.append(
+            {
+                "question_index": position,
+                "text": question.text,
+                "options": options,
+                "difficulty": question.difficulty,
+                "category": question.category,
+            }
+        )
+
+    return {
+        "attempt_id": attempt_id,
+        "quiz_id": attempt.quiz_id,
+        "question_count": len(questions),
+        "questions": served,
+    }
+
+
+@app.post("/attempts/{attempt_id}/answers")
+async def submit_attempt_answer(
+    attempt_id: str, submission: AnswerSubmissionModel
+) -> Dict[str, Any]:
+    """
+    Submit an answer to a question within an attempt.
+
+    Only the attempt is updated; the quiz definition is never copied.
+    Returns 409 Conflict once the attempt's time limit has run out.
+    """
+    try:
+        is_correct = await store.submit_attempt_answer(
+            attempt_id, submission.question_index, submission.value()
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    except IndexError:
+        raise HTTPException(status_code=400, detail="Invalid question index")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid option index")
+    except AttemptClosedError:
+        raise HTTPException(status_code=409, detail="Attempt time limit has run out")
+
+    return {
+        "message": "Answer submitted",
+        "attempt_id": attempt_id,
+        "question_index": submission.question_index,
+        "submitted_answer": submission.answer,
+        "answer_index": submission.answer_index,
+        "is_correct": is_correct,
+    }
+
+
+@app.post("/attempts/{attempt_id}/answers:batch")
+async def submit_attempt_answers(attempt_id: str, batch: AnswerBatchModel) -> Dict[str, Any]:
+    """
+    Submit several answers within an attempt in one request.
+
+    All question indices are checked before anything is recorded, and the
+    answers are stored in a single write. Returns the correctness of each
+    answer and the updated result, or 409 Conflict once the time limit has run out.
+    """
+    try:
+        correctness = await store.submit_attempt_answers(
+            attempt_id, [(s.question_index, s.value()) for s in batch.answers]
+        )
+    except KeyError:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+    except IndexError:
+        raise HTTPException(status_code=400, detail="Invalid question index")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid option index")
+    except AttemptClosedError:
+        raise HTTPException(status_code=409, detail="Attempt time limit has run out")
+
+    attempt = await store.get_attempt(attempt_id)
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")  # pragma: no cover
+
+    return {
+        "message": "Answers submitted",
+        "attempt_id": attempt_id,
+        "answers": answer_results(batch.answers, correctness),
+        **result_to_dict(attempt.get_result(), attempt_incorrect_answers(attempt)),
+    }
+
+
+@app.get("/attempts/{attempt_id}/results")
+async def get_attempt_results(attempt_id: str) -> Dict[str, Any]:
+    """
+    Get the results of an attempt.
+
+    Returns score, percentage, and detailed feedback.
+    """
+    attempt = await store.get_attempt(attempt_id)
+
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+
+    return {
+        "attempt_id": attempt_id,
+        "quiz_id": attempt.quiz_id,
+        "title": attempt.quiz.title,
+        "closed": attempt.closed or attempt.is_expired(),
+        **result_to_dict(attempt.get_result(), attempt_incorrect_answers(attempt)),
+    }
+
+
+@app.get("/attempts/{attempt_id}/results/breakdown")
+async def get_attempt_results_breakdown(attempt_id: str) -> Dict[str, Any]:
+    """
+    Get the score of an attempt for every category and difficulty level.
+    """
+    attempt = await store.get_attempt(attempt_id)
+
+    if attempt is None:
+        raise HTTPException(status_code=404, detail="Attempt not found")
+
+    return {
+        "attempt_id": attempt_id,
+        "quiz_id": attempt.quiz_id,
+        **breakdown_to_dict(attempt.get_score_breakdown()),
     }
 
 
@@ -321,8 +1024,9 @@ async def clear_database() -> Dict[str, Any]:
 
     WARNING: This will delete ALL quizzes!
     """
-    db.clear()
-    return {"message": "All quizzes deleted", "remaining_quizzes": len(db)}
+    await store.clear()
+    quiz_response_cache.clear()
+    return {"message": "All quizzes deleted", "remaining_quizzes": await store.count()}
 
 
 # ============================================================================
@@ -336,7 +1040,7 @@ async def root() -> Dict[str, Any]:
     return {
         "message": "Quiz API is running",
         "version": "1.0.0",
-        "total_quizzes": len(db),
+        "total_quizzes": await store.count(),
         "documentation": "/docs",
     }
 
@@ -344,4 +1048,35 @@ async def root() -> Dict[str, Any]:
 @app.get("/health")
 async def health_check() -> Dict[str, Union[str, int]]:
     """Health check endpoint"""
-    return {"status": "healthy", "database_size": len(db)}
+    return {"status": "healthy", "database_size": await store.count()}
+
+
+@app.get("/metrics")
+async def get_metrics() -> Response:
+    """
+    Prometheus scrape endpoint.
+
+    Returns 404 unless metrics are enabled with QUIZ_METRICS=1.
+    """
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    # Rendering runs the store gauges, which may scan the whole store
+    body = await store.run(REGISTRY.render)
+    return Response(content=body, media_type="text/plain; version=0.0.4")
+
+
+@app.get("/profiles")
+async def list_profiles(
+    x_profile_token: Optional[str] = Header(None, alias="X-Profile-Token")
+) -> Dict[str, Any]:
+    """
+    List the most recent profiles of slow or explicitly profiled requests.
+
+    Returns 404 unless profiling is configured. When a profile token is set,
+    the same token must be sent in the X-Profile-Token header.
+    """
+    if not profiler.active:
+        raise HTTPException(status_code=404, detail="Profiling is disabled")
+    if profiler.token is not None and not profiler.is_authorized(x_profile_token):
+        raise HTTPException(status_code=403, detail="Invalid profile token")
+    return {"profiles": [report._asdict() for report in profiler.reports()]}
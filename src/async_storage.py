@@ -0,0 +1,173 @@
+"""
+Async access to a storage backend for code running on an event loop.
+
+Every ``QuizStorage`` backend is synchronous. ``AsyncQuizStorage`` wraps one
+and exposes the same operations as coroutines: calls the backend reports as
+cheap through ``runs_inline`` run directly on the event loop, because a thread
+hop would cost more than the call, and every other call runs in a
+worker thread, so disk I/O, fsyncs and work proportional to the size of the
+store or of a quiz never stall other requests.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, TypeVar, Union
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.quiz import Quiz
+from src.storage import QuizStorage, QuizSummary
+
+T = TypeVar("T")
+
+
+class AsyncQuizStorage:
+    """
+    Coroutine interface to a synchronous QuizStorage backend.
+
+    Return values and exceptions are exactly those of the wrapped backend.
+    Offloaded calls run in ``executor`` (default: the event loop's default
+    executor) with a copy of the caller's context variables.
+    """
+
+    def __init__(self, storage: QuizStorage, executor: Optional[Executor] = None) -> None:
+        """
+        Wrap a storage backend.
+
+        Args:
+            storage: The backend to call
+            executor: Executor for blocking operations (None for the loop's default)
+        """
+        self.storage = storage
+        self.executor = executor
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """Run a blocking function in a worker thread and return its result"""
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        return await loop.run_in_executor(
+            self.executor, functools.partial(context.run, func, *args)
+        )
+
+    async def _call(self, operation: str, *args: Any) -> Any:
+        """Call a storage operation inline or in a worker thread, as the backend prefers"""
+        method = getattr(self.storage, operation)
+        if self.storage.runs_inline(operation, *args):
+            return method(*args)
+        return await self.run(method, *args)
+
+    async def add_quiz(self, quiz: Quiz) -> str:
+        """Create - Store a new quiz and return its generated ID"""
+        return await self._call("add_quiz", quiz)
+
+    async def add_quizzes(self, quizzes: Iterable[Quiz]) -> List[str]:
+        """Create - Store several new quizzes and return their generated IDs, in order"""
+        return await self._call("add_quizzes", quizzes)
+
+    async def get_quiz(self, quiz_id: str) -> Optional[Quiz]:
+        """Read - Return the quiz with the given ID, or None if not found"""
+        return await self._call("get_quiz", quiz_id)
+
+    async def get_quiz_version(self, quiz_id: str) -> Optional[int]:
+        """Read - Return the version of a stored quiz, or None if not found"""
+        return await self._call("get_quiz_version", quiz_id)
+
+    async def update_quiz(
+        self, quiz_id: str, quiz: Quiz, expected_version: Optional[int] = None
+    ) -> bool:
+        """
+        Update - Replace a stored quiz, returning False if it does not exist.
+
+        Raises:
+            VersionConflictError: If expected_version is given and does not match
+        """
+        return await self._call("update_quiz", quiz_id, quiz, expected_version)
+
+    async def delete_quiz(self, quiz_id: str) -> bool:
+        """Delete - Delete a quiz and its attempts, returning False if it does not exist"""
+        return await self._call("delete_quiz", quiz_id)
+
+    async def list_quizzes(self) -> List[Quiz]:
+        """Read - Return all stored quizzes"""
+        return await self._call("list_quizzes")
+
+    async def list_quiz_summaries(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Tuple[List[QuizSummary], Optional[str]]:
+        """
+        Read - Return one page of quiz summaries and the cursor for the next page.
+
+        Raises:
+            ValueError: If the cursor is not valid
+        """
+        return await self._call("list_quiz_summaries", limit, cursor)
+
+    async def start_attempt(self, quiz_id: str, shuffle: bool = False) -> Optional[str]:
+        """Create - Start an attempt at a quiz and return its ID, or None if quiz not found"""
+        return await self._call("start_attempt", quiz_id, shuffle)
+
+    async def get_attempt(self, attempt_id: str) -> Optional[QuizAttempt]:
+        """Read - Return the attempt with the given ID, or None if not found"""
+        return await self._call("get_attempt", attempt_id)
+
+    async def submit_attempt_answer(
+        self, attempt_id: str, question_index: int, answer: Union[str, int]
+    ) -> bool:
+        """
+        Update - Record an answer on an attempt and return whether it is correct.
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If the question index is out of range
+            ValueError: If an option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+        return await self._call("submit_attempt_answer", attempt_id, question_index, answer)
+
+    async def submit_attempt_answers(
+        self, attempt_id: str, answers: Sequence[Tuple[int, Union[str, int]]]
+    ) -> List[bool]:
+        """
+        Update - Record several answers on an attempt in one write.
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If any question index is out of range
+            ValueError: If any option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+        return await self._call("submit_attempt_answers", attempt_id, answers)
+
+    async def close_expired_attempts(self) -> int:
+        """Update - Close every attempt whose time limit has run out, returning how many"""
+        return await self._call("close_expired_attempts")
+
+    async def add_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """Create - Store questions in the question bank and return their content IDs"""
+        return await self._call("add_bank_questions", questions)
+
+    async def get_bank_questions(self, question_ids: Sequence[str]) -> List[Question]:
+        """
+        Read - Return questions from the question bank by content ID, in order.
+
+        Raises:
+            KeyError: If any ID is not in the bank
+        """
+        return await self._call("get_bank_questions", question_ids)
+
+    async def get_stats(self) -> Dict[str, int]:
+        """Read - Return object counts and the approximate size of the store"""
+        return await self._call("get_stats")
+
+    async def clear(self) -> None:
+        """Delete - Remove all quizzes, attempts and bank questions"""
+        await self._call("clear")
+
+    async def count(self) -> int:
+        """Read - Return the number of stored quizzes"""
+        return await self._call("__len__")
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"AsyncQuizStorage(storage={self.storage!r})"
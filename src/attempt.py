@@ -0,0 +1,192 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+from src.quiz import Quiz
+from src.result import QuizResult
+from src.shuffle import AttemptOrder
+import time
+
+
+class QuizAttempt:
+    """
+    Represents one person's attempt at a quiz.
+
+    Each attempt keeps its own answers and start time, separate from the quiz
+    definition, so any number of attempts can run against the same quiz. The
+    questions are shared with the quiz snapshot the attempt was started from,
+    so starting an attempt or submitting an answer never copies the quiz.
+
+    If the quiz has a time limit, the attempt has a deadline on the monotonic
+    clock, so changes to the system clock cannot lengthen or shorten it.
+    Storage backends stop accepting answers once the deadline has passed and
+    ``close`` the attempt, fixing its result.
+
+    A shuffled attempt presents questions and options in its own order,
+    derived from ``seed`` (see src/shuffle.py), so it stores one integer
+    rather than a reordered copy of the quiz. Answers are recorded against
+    the quiz's own indices.
+    """
+
+    __slots__ = ("id", "quiz_id", "_session", "deadline", "_result", "seed")
+
+    def __init__(
+        self,
+        quiz: Quiz,
+        attempt_id: Optional[str] = None,
+        start_time: Optional[float] = None,
+        seed: Optional[int] = None,
+    ) -> None:
+        self.id = attempt_id
+        self.seed = seed  # Presentation order, if the attempt is shuffled
+        self.quiz_id = quiz.id
+        self._session = quiz.snapshot(include_answers=False)
+        self._session.start_time = time.time() if start_time is None else start_time
+        self.deadline: Optional[float] = None  # time.monotonic() reading, if the quiz is timed
+        if quiz.time_limit_seconds is not None:
+            # Time already used by an attempt started earlier (e.g. before a restart)
+            elapsed = time.time() - self._session.start_time
+            self.deadline = time.monotonic() + quiz.time_limit_seconds - elapsed
+        self._result: Optional[QuizResult] = None
+
+    @property
+    def quiz(self) -> Quiz:
+        """The quiz definition this attempt is answering"""
+        return self._session
+
+    @property
+    def start_time(self) -> Optional[float]:
+        """Time at which the attempt was started"""
+        return self._session.start_time
+
+    @property
+    def expires_at(self) -> Optional[float]:
+        """Wall-clock time at which the attempt's time limit runs out, if it has one"""
+        limit = self._session.time_limit_seconds
+        if limit is None or self._session.start_time is None:
+            return None
+        return self._session.start_time + limit
+
+    @property
+    def order(self) -> Optional[AttemptOrder]:
+        """Presentation order of a shuffled attempt, or None if it is not shuffled"""
+        if self.seed is None:
+            return None
+        return AttemptOrder(self.seed, len(self._session.questions))
+
+    def unshuffle_answer(
+        self, position: int, answer: Union[str, int]
+    ) -> Tuple[int, Union[str, int]]:
+        """
+        Map a question position and answer in the presented order to the quiz's indices.
+
+        Text answers are returned unchanged, and so are option positions that
+        are out of range, for submit_answer to reject.
+
+        Raises:
+            IndexError: If the question position is out of range
+        """
+        order = self.order
+        if order is None:
+            return position, answer
+        if not 0 <= position < len(self._session.questions):
+            raise IndexError("Invalid question index")
+        index = order.question_index(position)
+        option_count = len(self._session.questions[index].options)
+        if isinstance(answer, int) and 0 <= answer < option_count:
+            answer = order.options(index, option_count)[answer]
+        return index, answer
+
+    @property
+    def closed(self) -> bool:
+        """Whether the attempt has been closed and its result fixed"""
+        return self._result is not None
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        """
+        Check whether the attempt's deadline has passed.
+
+        Args:
+            now: A time.monotonic() reading (default: now)
+        """
+        if self.deadline is None:
+            return False
+        return (time.monotonic() if now is None else now) >= self.deadline
+
+    def close(self) -> QuizResult:
+        """Close the attempt, fixing its result; closing again returns the same result"""
+        if self._result is None:
+            self._result = self._session.get_result()
+        return self._result
+
+    @property
+    def answers(self) -> Mapping[int, str]:
+        """Read-only view of submitted answers keyed by question index"""
+        return self._session.answers
+
+    def submit_answer(self, question_index: int, answer: Union[str, int]) -> bool:
+        """
+        Submit an answer for a specific question.
+
+        Args:
+            question_index: Index of the answered question
+            answer: The answer text, or an int giving the index of one of the options
+
+        Returns:
+            bool: True if the answer is correct
+
+        Raises:
+            IndexError: If the question index is out of range
+            ValueError: If an option index does not refer to an option
+        """
+        if not 0 <= question_index < len(self._session.questions):
+            raise IndexError("Invalid question index")
+        question = self._session.get_question(question_index)
+        if isinstance(answer, int):
+            self._session.submit_answer_index(question_index, answer)
+            return question.check_answer_index(answer)
+        self._session.submit_answer(question_index, answer)
+        return question.check_answer(answer)
+
+    def submit_answers(self, answers: Sequence[Tuple[int, Union[str, int]]]) -> List[bool]:
+        """
+        Submit several answers at once, after checking every question and option index.
+
+        Either all answers are recorded or, if any index is invalid, none are.
+
+        Returns:
+            List[bool]: Whether each answer is correct, in order
+        """
+        questions = self._session.questions
+        if any(not 0 <= index < len(questions) for index, _ in answers):
+            raise IndexError("Invalid question index")
+        for index, answer in answers:
+            if isinstance(answer, int) and not 0 <= answer < len(questions[index].options):
+                raise ValueError("Invalid option index")
+        return [self.submit_answer(index, answer) for index, answer in answers]
+
+    def get_result(self) -> QuizResult:
+        """Calculate and return the result of this attempt (the fixed result once closed)"""
+        if self._result is not None:
+            return self._result
+        return self._session.get_result()
+
+    def get_incorrect_answers(self) -> List[int]:
+        """Get a list of indices for incorrectly answered questions"""
+        return self._session.get_incorrect_answers()
+
+    def get_score_breakdown(self) -> Dict[str, Dict[Any, Dict[str, float]]]:
+        """Get the score for every category and difficulty level of this attempt"""
+        return self._session.get_score_breakdown()
+
+    def snapshot(self) -> "QuizAttempt":
+        """Return a copy of the attempt that shares storage until either side changes"""
+        attempt_copy = QuizAttempt.__new__(QuizAttempt)
+        attempt_copy.id = self.id
+        attempt_copy.quiz_id = self.quiz_id
+        attempt_copy._session = self._session.snapshot()
+        attempt_copy.deadline = self.deadline
+        attempt_copy._result = self._result
+        attempt_copy.seed = self.seed
+        return attempt_copy
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"QuizAttempt(id='{self.id}', quiz_id='{self.quiz_id}', answers={len(self.answers)})"
@@ -0,0 +1,173 @@
+"""
+Columnar quiz representation and vectorized batch scoring.
+
+Requires NumPy, which is an optional dependency (``pip install quiz-app[analytics]``).
+The module is not imported by the ``src`` package, so the core package keeps
+working without it.
+"""
+
+from typing import Dict, Iterable, List, Mapping, NamedTuple, Optional, Tuple
+import numpy as np
+from src.quiz import Quiz
+from src.result import QuizResult
+
+UNANSWERED = -1  # Answer code for a question the attempt did not answer
+UNKNOWN_ANSWER = -2  # Answer code for an answer that matches no option
+
+
+class BatchScores(NamedTuple):
+    """Scores for a batch of attempts; row i of every array belongs to attempt i"""
+
+    scores: np.ndarray  # (attempts,) correct answers per attempt
+    totals: int  # Questions in the quiz
+    percentages: np.ndarray  # (attempts,) percentage per attempt
+    passing: np.ndarray  # (attempts,) bool, percentage >= threshold
+    categories: Tuple[Optional[str], ...]  # Column labels of category_scores
+    category_scores: np.ndarray  # (attempts, categories) correct answers per category
+    category_totals: np.ndarray  # (categories,) questions per category
+    difficulties: Tuple[str, ...]  # Column labels of difficulty_scores
+    difficulty_scores: np.ndarray  # (attempts, difficulties) correct answers per difficulty
+    difficulty_totals: np.ndarray  # (difficulties,) questions per difficulty
+
+    def to_results(self) -> List[QuizResult]:
+        """Return a QuizResult per attempt"""
+        return [QuizResult(int(score), self.totals) for score in self.scores]
+
+
+class ColumnarQuiz:
+    """
+    A quiz stored as arrays, for scoring many attempts at once.
+
+    Each question's options are numbered, and answers are encoded as option
+    codes, so scoring a batch is a single comparison against the array of
+    correct codes instead of a check_answer call per answer.
+    """
+
+    __slots__ = (
+        "quiz_id",
+        "_answer_codes",
+        "correct_codes",
+        "categories",
+        "category_codes",
+        "difficulties",
+        "difficulty_codes",
+    )
+
+    def __init__(self, quiz: Quiz) -> None:
+        self.quiz_id = quiz.id
+        self._answer_codes: List[Dict[str, int]] = []  # Per question: answer text -> code
+        correct_codes = []
+        category_positions: Dict[Optional[str], int] = {}
+        difficulty_positions: Dict[str, int] = {}
+        category_codes = []
+        difficulty_codes = []
+
+        for question in quiz.questions:
+            codes = {option: code for code, option in enumerate(question.options)}
+            # A correct answer that is not one of the options still needs a code
+            codes.setdefault(question.correct_answer, len(codes))
+            self._answer_codes.append(codes)
+            correct_codes.append(codes[question.correct_answer])
+            category_codes.append(
+                category_positions.setdefault(question.category, len(category_positions))
+            )
+            difficulty_codes.append(
+                difficulty_positions.setdefault(question.difficulty, len(difficulty_positions))
+            )
+
+        self.correct_codes = np.array(correct_codes, dtype=np.int32)
+        self.categories: Tuple[Optional[str], ...] = tuple(category_positions)
+        self.category_codes = np.array(category_codes, dtype=np.intp)
+        self.difficulties: Tuple[str, ...] = tuple(difficulty_positions)
+        self.difficulty_codes = np.array(difficulty_codes, dtype=np.intp)
+
+    def __len__(self) -> int:
+        """Number of questions"""
+        return len(self.correct_codes)
+
+    def encode_answers(self, attempts: Iterable[Mapping[int, str]]) -> np.ndarray:
+        """
+        Encode attempts' answers into an (attempts, questions) matrix of answer codes.
+
+        Args:
+            attempts: Submitted answers for each attempt, keyed by question index,
+                such as QuizAttempt.answers or Quiz.answers
+
+        Returns:
+            An int32 matrix; unanswered questions are UNANSWERED and answers
+            that match no option are UNKNOWN_ANSWER. Answers to indices beyond
+            the last question are ignored, as they never score.
+        """
+        attempts = list(attempts)
+        question_count = len(self._answer_codes)
+        matrix = np.full((len(attempts), question_count), UNANSWERED, dtype=np.int32)
+        for row, answers in enumerate(attempts):
+            for index, answer in answers.items():
+                if 0 <= index < question_count:
+                    matrix[row, index] = self._answer_codes[index].get(answer, UNKNOWN_ANSWER)
+        return matrix
+
+    def score(self, answer_matrix: np.ndarray, threshold: float = 60) -> BatchScores:
+        """
+        Score every attempt in an encoded answer matrix in one call.
+
+        Percentages and pass/fail follow the same rules as QuizResult.
+
+        Args:
+            answer_matrix: An (attempts, questions) matrix from encode_answers
+            threshold: Passing percentage, as in QuizResult.is_passing
+
+        Returns:
+            BatchScores with totals and per-category/difficulty breakdowns
+
+        Raises:
+            ValueError: If the matrix does not have one column per question
+        """
+        answer_matrix = np.asarray(answer_matrix)
+        if answer_matrix.ndim != 2 or answer_matrix.shape[1] != len(self):
+            raise ValueError(
+                f"Expected an answer matrix with {len(self)} columns, "
+                f"got shape {answer_matrix.shape}"
+            )
+
+        correct = (answer_matrix == self.correct_codes).astype(np.int32)
+        scores = correct.sum(axis=1)
+        total = len(self)
+        if total > 0:
+            percentages = scores / total * 100
+        else:
+            percentages = np.zeros(len(scores), dtype=np.float64)
+
+        category_scores, category_totals = self._group_scores(
+            correct, self.category_codes, len(self.categories)
+        )
+        difficulty_scores, difficulty_totals = self._group_scores(
+            correct, self.difficulty_codes, len(self.difficulties)
+        )
+        return BatchScores(
+            scores=scores,
+            totals=total,
+            percentages=percentages,
+            passing=percentages >= threshold,
+            categories=self.categories,
+            category_scores=category_scores,
+            category_totals=category_totals,
+            difficulties=self.difficulties,
+            difficulty_scores=difficulty_scores,
+            difficulty_totals=difficulty_totals,
+        )
+
+    def score_attempts(
+        self, attempts: Iterable[Mapping[int, str]], threshold: float = 60
+    ) -> BatchScores:
+        """Encode and score attempts' answers; see encode_answers and score"""
+        return self.score(self.encode_answers(attempts), threshold)
+
+    @staticmethod
+    def _group_scores(
+        correct: np.ndarray, codes: np.ndarray, group_count: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Sum the correct-answer matrix over the questions in each group"""
+        membership = np.zeros((len(codes), group_count), dtype=np.int32)
+        membership[np.arange(len(codes)), codes] = 1
+        return correct @ membership, membership.sum(axis=0)
@@ -1,21 +1,77 @@
+import sys
+import threading
 import uuid
-from typing import List, Dict, Optional
-from copy import deepcopy
+from bisect import bisect_left
+from itertools import count
+from typing import Any, Iterable, List, Dict, Optional, Sequence, Set, Tuple, Union
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.question_bank import QuestionBank
 from src.quiz import Quiz
+from src.shuffle import new_seed
+from src.metrics import timed
+from src.timer_wheel import TimerWheel
+from src.storage import AttemptClosedError, QuizStorage, QuizSummary, VersionConflictError
 
+# Number of locks shared out between quizzes and attempts by hashing their IDs
+LOCK_STRIPES = 64
 
-class QuizDatabase:
+
+class QuizDatabase(QuizStorage):
     """
     In-memory database for storing and managing quizzes.
 
     Provides CRUD operations (Create, Read, Update, Delete) for Quiz objects.
     Data is stored in memory and will be lost when the application terminates.
+
+    Quizzes are kept as copy-on-write snapshots (see ``Quiz.snapshot``), so
+    reads and writes are O(1) while callers still cannot modify stored data.
+    Attempts are stored separately from the quizzes they answer, so submitting
+    an answer only touches the attempt. Stored quizzes share one Question
+    object per unique question through a QuestionBank, so memory grows with
+    unique content rather than with the number of quizzes; a question leaves
+    the bank once no stored quiz uses it, unless it was added to the bank
+    directly.
+
+    The database is thread-safe. Writes to a quiz or attempt take one of a
+    fixed set of striped locks chosen by its ID, so unrelated writes do not
+    wait for each other. Reads of quizzes, listings and bank lookups never
+    lock; get_attempt takes the attempt's striped lock, so it copies answers
+    that no submission is halfway through. Updates can be made conditional
+    on the quiz version to detect lost updates.
+
+    Deadlines of timed attempts are kept in a timer wheel, so any number of
+    running attempts costs no threads or tasks; close_expired_attempts
+    closes every expired attempt in one pass.
     """
 
+    # O(1) or bounded by one quiz or page, and taking no lock: adding quizzes hashes
+    # every question, and updates hold a striped lock while interning them
+    inline_operations = frozenset(
+        {
+            "get_quiz",
+            "get_quiz_version",
+            "list_quiz_summaries",
+            "get_bank_questions",
+            "__len__",
+        }
+    )
+
     def __init__(self) -> None:
         """Initialize an empty in-memory database"""
         self._storage: Dict[str, Quiz] = {}
+        # Insertion order for paging: (sequence, quiz_id), including deleted quizzes
+        self._order: List[Tuple[int, str]] = []
+        self._sequences: Dict[str, int] = {}
+        self._sequence_counter = count()
+        self._attempts: Dict[str, QuizAttempt] = {}
+        self._attempts_by_quiz: Dict[str, Set[str]] = {}
+        self._bank = QuestionBank()
+        self._locks = [threading.Lock() for _ in range(LOCK_STRIPES)]
+        self._deadlines = TimerWheel()  # Attempt ID -> deadline, for timed attempts
+        self._index_lock = threading.Lock()  # Guards the paging order, attempt sets and deadlines
 
+    @timed("add_quiz")
     def add_quiz(self, quiz: Quiz) -> str:
         """
         Create - Add a new quiz to the database.
@@ -27,12 +83,10 @@ class QuizDatabase:
             str: Unique ID assigned to the quiz
         """
         quiz_id = str(uuid.uuid4())
-        # Store a deep copy and set the ID
-        quiz_copy = deepcopy(quiz)
-        quiz_copy.id = quiz_id
-        self._storage[quiz_id] = quiz_copy
+        self._insert_quizzes([self._freeze(quiz, quiz_id, version=1)])
         return quiz_id
 
+    @timed("get_quiz")
     def get_quiz(self, quiz_id: str) -> Optional[Quiz]:
         """
         Read - Retrieve a quiz from the database by ID.
@@ -43,30 +97,70 @@ class QuizDatabase:
         Returns:
             Quiz object if found, None otherwise
         """
-        if quiz_id not in self._storage:
+        stored = self._storage.get(quiz_id)
+        if stored is None:
             return None
-        # Return a deep copy to prevent external modifications
-        return deepcopy(self._storage[quiz_id])
+        # Return a snapshot to prevent external modifications
+        return stored.snapshot()
+
+    @timed("add_quizzes")
+    def add_quizzes(self, quizzes: Iterable[Quiz]) -> List[str]:
+        """
+        Create - Add several new quizzes, taking the index lock once.
 
-    def update_quiz(self, quiz_id: str, quiz: Quiz) -> bool:
+        Args:
+            quizzes: The Quiz objects to store
+
+        Returns:
+            List[str]: Unique IDs assigned to the quizzes, in order
+        """
+        stored = [self._freeze(quiz, str(uuid.uuid4()), version=1) for quiz in quizzes]
+        self._insert_quizzes(stored)
+        return [str(quiz.id) for quiz in stored]
+
+    @timed("get_quiz_version")
+    def get_quiz_version(self, quiz_id: str) -> Optional[int]:
+        """
+        Read the version of a quiz without copying it.
+
+        Args:
+            quiz_id: The unique identifier of the quiz
+
+        Returns:
+            int: The stored version, or None if quiz not found
+        """
+        stored = self._storage.get(quiz_id)
+        return None if stored is None else stored.version
+
+    @timed("update_quiz")
+    def update_quiz(self, quiz_id: str, quiz: Quiz, expected_version: Optional[int] = None) -> bool:
         """
         Update - Modify an existing quiz in the database.
 
         Args:
             quiz_id: The unique identifier of the quiz to update
             quiz: The updated Quiz object
+            expected_version: If given, only update if the stored quiz is at this version
 
         Returns:
             bool: True if update successful, False if quiz not found
+
+        Raises:
+            VersionConflictError: If the stored quiz is not at expected_version
         """
-        if quiz_id not in self._storage:
-            return False
-        # Store a deep copy and ensure ID is preserved
-        quiz_copy = deepcopy(quiz)
-        quiz_copy.id = quiz_id
-        self._storage[quiz_id] = quiz_copy
+        with self._lock_for(quiz_id):
+            current = self._storage.get(quiz_id)
+            if current is None:
+                return False
+            if expected_version is not None and current.version != expected_version:
+                raise VersionConflictError(quiz_id, expected_version, current.version)
+            stored = self._freeze(quiz, quiz_id, version=current.version + 1, previous=current)
+            self._storage[quiz_id] = stored
+            self._journal("update", quiz_id, stored, current)
+            self._release_replaced(stored, current)
         return True
 
+    @timed("delete_quiz")
     def delete_quiz(self, quiz_id: str) -> bool:
         """
         Delete - Remove a quiz from the database.
@@ -77,11 +171,20 @@ class QuizDatabase:
         Returns:
             bool: True if deletion successful, False if quiz not found
         """
-        if quiz_id not in self._storage:
-            return False
-        del self._storage[quiz_id]
+        with self._lock_for(quiz_id), self._index_lock:
+            stored = self._storage.pop(quiz_id, None)
+            if stored is None:
+                return False
+            self._journal("delete", quiz_id)
+            self._bank.release(stored.questions)
+            del self._sequences[quiz_id]
+            self._compact_order()
+            for attempt_id in self._attempts_by_quiz.pop(quiz_id, ()):
+                del self._attempts[attempt_id]
+                self._deadlines.cancel(attempt_id)
         return True
 
+    @timed("list_quizzes")
     def list_quizzes(self) -> List[Quiz]:
         """
         List all quizzes in the database.
@@ -89,12 +192,309 @@ class QuizDatabase:
         Returns:
             List of all Quiz objects
         """
-        # Return deep copies to prevent external modifications
-        return [deepcopy(quiz) for quiz in self._storage.values()]
+        # Return snapshots to prevent external modifications
+        return [quiz.snapshot() for quiz in self._storage.values()]
+
+    @timed("list_quiz_summaries")
+    def list_quiz_summaries(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Tuple[List[QuizSummary], Optional[str]]:
+        """
+        List one page of quiz summaries without copying any quiz.
+
+        Args:
+            limit: Maximum number of summaries to return (None for all)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            The page of summaries, and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is not valid
+        """
+        order = self._order  # Compaction replaces the list, so page over one version
+        start = 0 if cursor is None else bisect_left(order, (int(cursor) + 1, ""))
+        summaries: List[QuizSummary] = []
+        last_sequence = 0
+        for position in range(start, len(order)):
+            sequence, quiz_id = order[position]
+            summary = self._summary(quiz_id)
+            if summary is None:
+                continue
+            if limit is not None and len(summaries) == limit:
+                # From the order itself: the last quiz may have been deleted meanwhile
+                return summaries, str(last_sequence)
+            summaries.append(summary)
+            last_sequence = sequence
+        return summaries, None
+
+    def _summary(self, quiz_id: str) -> Optional[QuizSummary]:
+        """Return the summary of a stored quiz, or None if it has been deleted"""
+        quiz = self._storage.get(quiz_id)
+        if quiz is None:
+            return None
+        return QuizSummary(quiz_id, quiz.title, quiz.time_limit_seconds, len(quiz.questions))
+
+    @timed("start_attempt")
+    def start_attempt(self, quiz_id: str, shuffle: bool = False) -> Optional[str]:
+        """
+        Start a new attempt at a quiz.
+
+        Args:
+            quiz_id: The unique identifier of the quiz to attempt
+            shuffle: Whether the attempt presents questions and options in its own order
+
+        Returns:
+            str: Unique ID assigned to the attempt, or None if quiz not found
+        """
+        attempt_id = str(uuid.uuid4())
+        seed = new_seed() if shuffle else None
+        with self._lock_for(quiz_id):
+            stored = self._storage.get(quiz_id)
+            if stored is None:
+                return None
+            self._insert_attempt(quiz_id, QuizAttempt(stored, attempt_id, seed=seed))
+        return attempt_id
+
+    @timed("get_attempt")
+    def get_attempt(self, attempt_id: str) -> Optional[QuizAttempt]:
+        """
+        Retrieve an attempt by ID.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+
+        Returns:
+            QuizAttempt object if found, None otherwise
+        """
+        attempt = self._attempts.get(attempt_id)
+        if attempt is None:
+            return None
+        # Return a snapshot to prevent external modifications
+        with self._lock_for(attempt_id):
+            return attempt.snapshot()
+
+    @timed("submit_attempt_answer")
+    def submit_attempt_answer(
+        self, attempt_id: str, question_index: int, answer: Union[str, int]
+    ) -> bool:
+        """
+        Record an answer on a stored attempt without copying the attempt or its quiz.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+            question_index: Index of the answered question
+            answer: The submitted answer text, or an option index
+
+        Returns:
+            bool: True if the answer is correct
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If the question index is out of range
+            ValueError: If an option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+        attempt = self._attempts[attempt_id]
+        with self._lock_for(attempt_id):
+            self._check_open(attempt_id, attempt)
+            question_index, answer = attempt.unshuffle_answer(question_index, answer)
+            is_correct = attempt.submit_answer(question_index, answer)
+            self._journal("answers", attempt_id, attempt, (question_index,))
+        return is_correct
+
+    @timed("submit_attempt_answers")
+    def submit_attempt_answers(
+        self, attempt_id: str, answers: Sequence[Tuple[int, Union[str, int]]]
+    ) -> List[bool]:
+        """
+        Record several answers on a stored attempt while holding its lock once.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+            answers: (question index, answer) pairs, applied in order
+
+        Returns:
+            List[bool]: Whether each answer is correct, in order
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If any question index is out of range (nothing is recorded)
+            ValueError: If any option index is invalid (nothing is recorded)
+            AttemptClosedError: If the attempt's time limit has run out (nothing is recorded)
+        """
+        attempt = self._attempts[attempt_id]
+        with self._lock_for(attempt_id):
+            self._check_open(attempt_id, attempt)
+            answers = [attempt.unshuffle_answer(index, answer) for index, answer in answers]
+            results = attempt.submit_answers(answers)
+            self._journal("answers", attempt_id, attempt, [index for index, _ in answers])
+        return results
+
+    @staticmethod
+    def _check_open(attempt_id: str, attempt: QuizAttempt) -> None:
+        """Close an attempt whose deadline has passed, and reject answers to a closed one"""
+        if not attempt.closed and attempt.is_expired():
+            attempt.close()
+        if attempt.closed:
+            raise AttemptClosedError(attempt_id)
+
+    @timed("close_expired_attempts")
+    def close_expired_attempts(self) -> int:
+        """
+        Close every attempt whose deadline has passed, fixing its result.
+
+        Expired attempts are taken from the timer wheel in one step, so the
+        cost depends on the number of attempts expiring, not on the number
+        running. Call it periodically (the API does) to finalize results.
+
+        Returns:
+            int: The number of attempts closed
+        """
+        with self._index_lock:
+            expired = self._deadlines.advance()
+        closed = 0
+        for attempt_id in expired:
+            attempt = self._attempts.get(attempt_id)
+            if attempt is None:
+                continue  # Deleted meanwhile
+            with self._lock_for(attempt_id):
+                if not attempt.closed:
+                    attempt.close()
+                    closed += 1
+        return closed
+
+    def _insert_quizzes(self, stored: List[Quiz]) -> None:
+        """Make frozen quizzes visible, appending them to the paging order"""
+        with self._index_lock:
+            self._journal("add", stored)
+            for quiz in stored:
+                self._storage[str(quiz.id)] = quiz
+                self._append_to_order(str(quiz.id))
+
+    def _append_to_order(self, quiz_id: str) -> None:
+        """Give a new quiz the next sequence number in the paging order"""
+        sequence = next(self._sequence_counter)
+        self._sequences[quiz_id] = sequence
+        self._order.append((sequence, quiz_id))
+
+    def _insert_attempt(self, quiz_id: str, attempt: QuizAttempt) -> None:
+        """Make a new attempt at a stored quiz visible"""
+        with self._index_lock:
+            self._journal("attempt", attempt)
+            self._attempts[str(attempt.id)] = attempt
+            self._attempts_by_quiz.setdefault(quiz_id, set()).add(str(attempt.id))
+            if attempt.deadline is not None:
+                self._deadlines.schedule(str(attempt.id), attempt.deadline)
+
+    def _journal(self, operation: str, *args: Any) -> None:
+        """
+        Record a mutation, while holding the locks that order it against others.
+
+        The in-memory database keeps no journal; DurableQuizDatabase appends
+        the mutation to its write-ahead log here.
+        """
+
+    def _compact_order(self) -> None:
+        """Drop deleted quizzes from the paging order once they make up half of it"""
+        if len(self._order) > 2 * len(self._storage) + 16:
+            self._order = [entry for entry in self._order if entry[1] in self._storage]
+
+    def _lock_for(self, key: str) -> threading.Lock:
+        """Return the striped lock guarding a quiz or attempt ID"""
+        return self._locks[hash(key) % LOCK_STRIPES]
+
+    def _freeze(
+        self, quiz: Quiz, quiz_id: str, version: int, previous: Optional[Quiz] = None
+    ) -> Quiz:
+        """
+        Create the stored snapshot of a quiz under the given ID and version.
+
+        Its questions are swapped for the bank's shared instances, taking a
+        reference to each, unless they are still the questions of the
+        previous stored version.
+        """
+        stored = quiz.snapshot()
+        stored.id = quiz_id
+        stored.version = version
+        if previous is None or stored.questions is not previous.questions:
+            stored.share_questions(self._bank.intern)
+        return stored
+
+    def _release_replaced(self, stored: Quiz, previous: Quiz) -> None:
+        """Release the bank references of the previous version's questions if it had its own"""
+        if stored.questions is not previous.questions:
+            self._bank.release(previous.questions)
+
+    def add_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """
+        Store questions in the question bank, where they stay until it is cleared.
+
+        Args:
+            questions: The questions to store
+
+        Returns:
+            List[str]: Content IDs of the questions, in order
+        """
+        questions = list(questions)
+        with self._index_lock:
+            question_ids = self._bank.add_many(questions)
+            self._journal("bank", questions)
+        return question_ids
+
+    def get_bank_questions(self, question_ids: Sequence[str]) -> List[Question]:
+        """
+        Read questions from the question bank; the shared instances are returned.
+
+        Args:
+            question_ids: Content IDs of the questions
+
+        Returns:
+            List[Question]: The questions, in order
+
+        Raises:
+            KeyError: If any ID is not in the bank
+        """
+        return self._bank.get_many(question_ids)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return object counts and the approximate size of the database in bytes.
+
+        Walks every stored quiz and attempt, counting storage shared between
+        snapshots once, so it is meant for occasional calls such as metrics
+        scrapes rather than hot paths.
+        """
+        return self._stats(list(self._storage.values()), list(self._attempts.values()))
+
+    def _stats(self, quizzes: List[Quiz], attempts: List[QuizAttempt]) -> Dict[str, int]:
+        """Return get_stats() for the given stored quizzes and attempts"""
+        seen: Set[int] = set()
+        size = _estimate_size(quizzes, seen) + _estimate_size(attempts, seen)
+        return {
+            "quizzes": len(quizzes),
+            "questions": sum(len(quiz.questions) for quiz in quizzes),
+            "bank_questions": len(self._bank),
+            "attempts": len(attempts),
+            "bytes": size,
+        }
 
     def clear(self) -> None:
-        """Remove all quizzes from the database"""
+        """Remove all quizzes, attempts and bank questions from the database"""
+        with self._index_lock:
+            self._journal("clear")
+            self._reset()
+
+    def _reset(self) -> None:
+        """Drop every quiz, attempt and bank question; the caller holds the index lock"""
         self._storage.clear()
+        # New containers, since readers such as list_quiz_summaries hold on to the old ones
+        self._order = []
+        self._sequences = {}
+        self._attempts.clear()
+        self._attempts_by_quiz = {}
+        self._deadlines.clear()
+        self._bank.clear()
 
     def __len__(self) -> int:
         """Return the number of quizzes in the database"""
@@ -103,3 +503,19 @@ class QuizDatabase:
     def __repr__(self) -> str:
         """String representation for debugging"""
         return f"QuizDatabase(quizzes={len(self._storage)})"
+
+
+def _estimate_size(obj: Any, seen: Set[int]) -> int:
+    """Return the size of an object and everything it references that is not in seen"""
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(_estimate_size(k, seen) + _estimate_size(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        size += sum(_estimate_size(item, seen) for item in obj)
+    else:
+        for name in getattr(type(obj), "__slots__", ()):
+            size += _estimate_size(getattr(obj, name, None), seen)
+    return size
@@ -0,0 +1,577 @@
+import os
+import re
+import threading
+from contextlib import ExitStack, contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from src.attempt import QuizAttempt
+from src.database import QuizDatabase
+from src.question import Question
+from src.quiz import Quiz
+from src.snapshot import AttemptHeader, DeferredDict, QuizHeader, Snapshot, decode_question
+from src.snapshot import encode_question, encode_quiz, write_snapshot
+from src.storage import QuizSummary
+from src.wal import LogReader, WriteAheadLog, sync_directory
+
+SNAPSHOT_FILE = "snapshot.qlog"
+SEGMENT_NAME = "wal-{:08d}.qlog"
+SEGMENT_PATTERN = re.compile(r"wal-(\d{8})\.qlog$")
+
+
+class DurableQuizDatabase(QuizDatabase):
+    """
+    In-memory database made crash-safe by a write-ahead log.
+
+    Reads are served from memory exactly as by QuizDatabase. Every mutation
+    is appended to a log in ``directory`` and made durable before the call
+    returns; concurrent writers share fsyncs (group commit). Once
+    ``snapshot_every`` records have been logged, the whole store is written to
+    a snapshot in the background and the log it covers is deleted. Opening the
+    directory again maps the snapshot, replays the log written after it, and
+    is ready to serve: quizzes, attempts and questions in the snapshot are
+    listed from its index and decoded on first read (see src/snapshot.py).
+
+    Only one process may use a directory at a time.
+    """
+
+    # Mutations wait for an fsync, so only lock-free reads stay on the event loop,
+    # and reads of quizzes only once they are decoded (see runs_inline)
+    inline_operations = frozenset(
+        {"get_quiz", "get_quiz_version", "list_quiz_summaries", "__len__"}
+    )
+
+    def __init__(self, directory: str, fsync: bool = True, snapshot_every: int = 10000) -> None:
+        """
+        Open a durable database, recovering any data already in the directory.
+
+        Args:
+            directory: Directory holding the snapshot and log files (created if missing)
+            fsync: If False, skip fsync; writes then survive a process crash only
+            snapshot_every: Number of logged mutations after which a snapshot is taken
+
+        Raises:
+            ValueError: If a file in the directory is corrupt
+        """
+        super().__init__()
+        self._storage = DeferredDict(self._load_quiz)
+        self._attempts = DeferredDict(self._load_attempt)
+        self._snapshot: Optional[Snapshot] = None  # Mapped snapshot still holding undecoded data
+        self._snapshot_questions: List[Optional[Question]] = []  # Decoded, by question number
+        # Content ID -> question number, built from the snapshot on first use
+        self._snapshot_question_ids: Optional[Dict[str, int]] = None
+        # Content ID -> IDs of the snapshot's quizzes using it, built on first use
+        self._snapshot_referrers: Optional[Dict[str, List[str]]] = None
+        # Guards decoding snapshot questions against the snapshot being dropped
+        self._snapshot_lock = threading.RLock()
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        # Approximate: incremented under different locks, only used to trigger snapshots
+        self._since_snapshot = 0
+        self._checkpoint_lock = threading.Lock()
+        self._checkpoint_thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._log: Optional[WriteAheadLog] = None  # Nothing is journaled while recovering
+        os.makedirs(directory, exist_ok=True)
+        self._segment = self._recover()
+        self._log = WriteAheadLog(self._segment_path(self._segment), fsync=fsync)
+
+    def runs_inline(self, operation: str, *args: Any) -> bool:
+        """Run reads inline unless they would decode a quiz held by the snapshot"""
+        if operation in ("get_quiz", "get_quiz_version"):
+            return self._storage.deferred_token(args[0]) is None
+        return super().runs_inline(operation, *args)
+
+    # Mutations: the base class journals them, then they wait for the log
+
+    def add_quiz(self, quiz: Quiz) -> str:
+        """Create - Add a new quiz and wait until it is durable"""
+        quiz_id = super().add_quiz(quiz)
+        self._sync()
+        return quiz_id
+
+    def add_quizzes(self, quizzes: Iterable[Quiz]) -> List[str]:
+        """Create - Add several new quizzes and wait until they are durable"""
+        quiz_ids = super().add_quizzes(quizzes)
+        self._sync()
+        return quiz_ids
+
+    def update_quiz(self, quiz_id: str, quiz: Quiz, expected_version: Optional[int] = None) -> bool:
+        """Update - Modify an existing quiz and wait until the change is durable"""
+        updated = super().update_quiz(quiz_id, quiz, expected_version)
+        self._sync()
+        return updated
+
+    def delete_quiz(self, quiz_id: str) -> bool:
+        """Delete - Remove a quiz and wait until the deletion is durable"""
+        deleted = super().delete_quiz(quiz_id)
+        self._sync()
+        return deleted
+
+    def start_attempt(self, quiz_id: str, shuffle: bool = False) -> Optional[str]:
+        """Start a new attempt at a quiz and wait until it is durable"""
+        attempt_id = super().start_attempt(quiz_id, shuffle)
+        self._sync()
+        return attempt_id
+
+    def submit_attempt_answer(
+        self, attempt_id: str, question_index: int, answer: Union[str, int]
+    ) -> bool:
+        """Record an answer on an attempt and wait until it is durable"""
+        is_correct = super().submit_attempt_answer(attempt_id, question_index, answer)
+        self._sync()
+        return is_correct
+
+    def submit_attempt_answers(
+        self, attempt_id: str, answers: Sequence[Tuple[int, Union[str, int]]]
+    ) -> List[bool]:
+        """Record several answers on an attempt and wait until they are durable"""
+        results = super().submit_attempt_answers(attempt_id, answers)
+        self._sync()
+        return results
+
+    def add_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """Store questions in the question bank and wait until they are durable"""
+        question_ids = super().add_bank_questions(questions)
+        self._sync()
+        return question_ids
+
+    def clear(self) -> None:
+        """Remove all quizzes, attempts and bank questions, durably"""
+        with self._checkpoint_lock:  # A checkpoint must not decode the dropped snapshot
+            super().clear()
+        self._sync()
+
+    def _reset(self) -> None:
+        """Drop everything, including the mapped snapshot and what it still holds"""
+        super()._reset()  # Also drops the deferred quizzes and attempts
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+            self._snapshot_questions = []
+            self._snapshot_question_ids = {}
+            self._snapshot_referrers = {}
+
+    # Reads that would otherwise decode data still held by the snapshot
+
+    def get_bank_questions(self, question_ids: Sequence[str]) -> List[Question]:
+        """
+        Read questions from the question bank, decoding any still held by the snapshot.
+
+        A question only a quiz uses is in the bank while that quiz is, so if
+        the quiz is still held by the snapshot it is decoded, which interns
+        its questions.
+        """
+        if self._snapshot is not None:
+            with self._snapshot_lock:
+                quiz_ids = [
+                    self._deferred_referrer(question_id)
+                    for question_id in question_ids
+                    if question_id not in self._bank
+                ]
+            for quiz_id in quiz_ids:
+                if quiz_id is not None:
+                    self._storage.get(quiz_id)  # Outside the snapshot lock: decoding takes it
+            with self._snapshot_lock:
+                self._load_bank_questions(question_ids)
+        return super().get_bank_questions(question_ids)
+
+    def _load_bank_questions(self, question_ids: Iterable[str]) -> None:
+        """Add questions the snapshot holds for the bank to it (holding the snapshot lock)"""
+        snapshot_numbers = self._snapshot_numbers()
+        for question_id in question_ids:
+            number = snapshot_numbers.get(question_id)
+            if number is not None and question_id not in self._bank:
+                self._bank.add(self._snapshot_question(number), question_id)
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return object counts and the approximate size of the database in bytes.
+
+        Data still held by the snapshot is counted from its index without
+        being decoded, and "bytes" covers only decoded objects. Bank
+        questions are those get_bank_questions would resolve.
+        """
+        stats = self._stats(self._storage.loaded_values(), self._attempts.loaded_values())
+        deferred = self._storage.deferred_tokens()
+        stats["quizzes"] += len(deferred)
+        stats["questions"] += sum(header.question_count for header in deferred)
+        stats["attempts"] += len(self._attempts.deferred_tokens())
+        with self._snapshot_lock:
+            snapshot_ids = set(self._snapshot_numbers())
+            snapshot_ids.update(
+                question_id
+                for question_id in self._snapshot_quiz_referrers()
+                if self._deferred_referrer(question_id) is not None
+            )
+        stats["bank_questions"] += sum(
+            1 for question_id in snapshot_ids if question_id not in self._bank
+        )
+        return stats
+
+    def _summary(self, quiz_id: str) -> Optional[QuizSummary]:
+        """Return the summary of a stored quiz, from the snapshot index if it is not decoded"""
+        header = self._storage.deferred_token(quiz_id)
+        if header is not None:
+            return QuizSummary(
+                quiz_id, header.title, header.time_limit_seconds, header.question_count
+            )
+        return super()._summary(quiz_id)
+
+    def _journal(self, operation: str, *args: Any) -> None:
+        """Append a mutation to the write-ahead log"""
+        if self._log is None:
+            return
+        if operation == "add":
+            (stored,) = args
+            record: List[Any] = [
+                "add",
+                [
+                    [quiz.id, encode_quiz(quiz, [encode_question(q) for q in quiz.questions])]
+                    for quiz in stored
+                ],
+            ]
+        elif operation == "update":
+            quiz_id, stored, previous = args
+            unchanged = stored.questions is previous.questions
+            questions = None if unchanged else [encode_question(q) for q in stored.questions]
+            record = ["update", quiz_id, encode_quiz(stored, questions)]
+        elif operation == "attempt":
+            (attempt,) = args
+            record = ["attempt", attempt.id, attempt.quiz_id, attempt.start_time, attempt.seed]
+        elif operation == "answers":
+            attempt_id, attempt, indices = args
+            record = ["answers", attempt_id, [[index, attempt.answers[index]] for index in indices]]
+        elif operation == "bank":
+            (questions,) = args
+            record = ["bank", [encode_question(question) for question in questions]]
+        else:  # "delete" and "clear"
+            record = [operation, *args]
+        self._log.append(record)
+        self._since_snapshot += 1
+
+    def _sync(self) -> None:
+        """Wait for the log, then start a background snapshot if one is due"""
+        assert self._log is not None
+        self._log.sync()
+        if self._since_snapshot < self.snapshot_every or self._checkpoint_lock.locked():
+            return
+        thread = threading.Thread(target=self._checkpoint_if_due, daemon=True)
+        self._checkpoint_thread = thread
+        thread.start()
+
+    # Snapshots
+
+    def checkpoint(self) -> None:
+        """
+        Write a snapshot of the whole database and delete the log it covers.
+
+        Writers are paused only while the state is captured, which copies
+        references rather than data; the snapshot is written afterwards.
+        """
+        with self._checkpoint_lock:
+            self._write_checkpoint()
+
+    def _checkpoint_if_due(self) -> None:
+        """Take a snapshot unless another thread is taking one or has just taken one"""
+        if not self._checkpoint_lock.acquire(blocking=False):
+            return
+        try:
+            if not self._closed and self._since_snapshot >= self.snapshot_every:
+                self._write_checkpoint()
+        finally:
+            self._checkpoint_lock.release()
+
+    def _write_checkpoint(self) -> None:
+        """Capture the state, switch to a new log segment and write the snapshot"""
+        assert self._log is not None
+        # Decode everything the current snapshot still holds, without pausing writers
+        self._storage.load_all()
+        self._attempts.load_all()
+        with self._snapshot_lock:
+            self._load_bank_questions(self._snapshot_numbers())
+        with self._all_locks():
+            quizzes = [
+                self._storage[quiz_id] for _, quiz_id in self._order if quiz_id in self._storage
+            ]
+            attempts = [attempt.snapshot() for attempt in self._attempts.values()]
+            unique: Dict[Question, None] = dict.fromkeys(self._bank)
+            pinned = {
+                question
+                for question in unique
+                if self._bank.is_pinned(self._bank.content_id(question))
+            }
+            self._segment += 1
+            self._log.rotate(self._segment_path(self._segment))
+            self._since_snapshot = 0
+        for quiz in quizzes + [attempt.quiz for attempt in attempts]:
+            unique.update(dict.fromkeys(quiz.questions))
+        questions = list(unique)
+        question_ids = [self._bank.content_id(question) for question in questions]
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        write_snapshot(
+            snapshot_path,
+            self._segment,
+            questions,
+            question_ids,
+            quizzes,
+            attempts,
+            pinned=[number for number, question in enumerate(questions) if question in pinned],
+        )
+        for number in self._segments():
+            if number < self._segment:
+                os.remove(self._segment_path(number))
+        sync_directory(self.directory)
+        with self._snapshot_lock:
+            if self._snapshot is not None:
+                self._snapshot.close()  # Everything it held was decoded above
+                self._snapshot = None
+                self._snapshot_questions = []  # Its live questions are all decoded now
+                self._snapshot_question_ids = {}
+                self._snapshot_referrers = {}
+
+    @contextmanager
+    def _all_locks(self) -> Iterator[None]:
+        """Hold every striped lock and then the index lock, pausing all writers"""
+        with ExitStack() as stack:
+            for lock in self._locks:
+                stack.enter_context(lock)
+            stack.enter_context(self._index_lock)
+            yield
+
+    # Recovery
+
+    def _recover(self) -> int:
+        """
+        Load the snapshot and replay the log segments written after it.
+
+        Returns:
+            int: Number of the new segment to log to
+        """
+        first = 0
+        snapshot_path = os.path.join(self.directory, SNAPSHOT_FILE)
+        if os.path.exists(snapshot_path):
+            first = self._load_snapshot(snapshot_path)
+        segments = self._segments()
+        for number in segments:
+            path = self._segment_path(number)
+            if number < first:
+                os.remove(path)  # Already covered by the snapshot
+                continue
+            reader = LogReader(path)
+            for record in reader:
+                self._replay(record)
+            if reader.torn:
+                if number != segments[-1]:
+                    raise ValueError(f"Corrupt write-ahead log segment: {path}")
+                with open(path, "r+b") as segment:
+                    segment.truncate(reader.valid_bytes)  # Drop the record torn by a crash
+        return max([first - 1] + segments) + 1
+
+    def _load_snapshot(self, path: str) -> int:
+        """
+        Map a snapshot file and register its contents without decoding them.
+
+        Returns:
+            int: The first log segment not covered by the snapshot
+        """
+        snapshot = Snapshot(path)
+        self._snapshot = snapshot
+        self._snapshot_questions = [None] * snapshot.question_count
+        self._snapshot_question_ids = None
+        self._snapshot_referrers = None
+        for quiz_header in snapshot.quizzes:
+            self._storage.defer(quiz_header.quiz_id, quiz_header)
+            self._append_to_order(quiz_header.quiz_id)
+        for attempt_header in snapshot.attempts:
+            self._attempts.defer(attempt_header.attempt_id, attempt_header)
+            attempt_ids = self._attempts_by_quiz.setdefault(attempt_header.quiz_id, set())
+            attempt_ids.add(attempt_header.attempt_id)
+        return snapshot.next_segment
+
+    def _load_quiz(self, quiz_id: str, header: QuizHeader) -> Quiz:
+        """Decode a quiz held by the snapshot, on its first read"""
+        assert self._snapshot is not None
+        _, _, encoded = self._snapshot.record(header.offset)
+        return self._decode_quiz(quiz_id, encoded, map(self._snapshot_question, encoded[4]))
+
+    def _load_attempt(self, attempt_id: str, header: AttemptHeader) -> QuizAttempt:
+        """Decode an attempt held by the snapshot, on its first read"""
+        assert self._snapshot is not None
+        _, _, quiz_id, encoded, seed = self._snapshot.record(header.offset)
+        # The attempt records its answers itself, so the session is built without them.
+        # It is not frozen: it shares decoded questions without taking bank references.
+        title, time_limit_seconds, start_time, version = encoded[:4]
+        session = Quiz(title=title, time_limit_seconds=time_limit_seconds, quiz_id=quiz_id)
+        session.add_questions(map(self._snapshot_question, encoded[4]))
+        session.version = version
+        attempt = QuizAttempt(session, attempt_id, start_time=start_time, seed=seed)
+        for index, answer in encoded[5]:
+            attempt.submit_answer(index, answer)
+        return attempt
+
+    def _snapshot_numbers(self) -> Dict[str, int]:
+        """Map the content IDs of questions the snapshot holds for the bank to their numbers"""
+        numbers = self._snapshot_question_ids
+        if numbers is None:
+            numbers = {}
+            if self._snapshot is not None:
+                ids = self._snapshot.question_ids
+                numbers = {ids[number]: number for number in self._snapshot.pinned_questions}
+            self._snapshot_question_ids = numbers
+        return numbers
+
+    def _snapshot_quiz_referrers(self) -> Dict[str, List[str]]:
+        """
+        Map the content IDs of questions used by quizzes the snapshot still holds to them.
+
+        Reads the quizzes' records but not their questions; the caller holds
+        the snapshot lock. Quizzes decoded since are not removed (see _deferred_referrer).
+        """
+        referrers = self._snapshot_referrers
+        if referrers is None:
+            referrers = {}
+            if self._snapshot is not None:
+                ids = self._snapshot.question_ids
+                for header in self._storage.deferred_tokens():
+                    _, _, encoded = self._snapshot.record(header.offset)
+                    for number in encoded[4]:
+                        referrers.setdefault(ids[number], []).append(header.quiz_id)
+            self._snapshot_referrers = referrers
+        return referrers
+
+    def _deferred_referrer(self, question_id: str) -> Optional[str]:
+        """Return a quiz still held by the snapshot that uses a question, or None"""
+        for quiz_id in self._snapshot_quiz_referrers().get(question_id, ()):
+            if self._storage.deferred_token(quiz_id) is not None:
+                return quiz_id
+        return None
+
+    def _snapshot_question(self, number: int) -> Question:
+        """
+        Return a question held by the snapshot, decoding it the first time.
+
+        Quizzes and attempts decoded from the snapshot share the instance;
+        freezing a quiz puts it in the bank.
+        """
+        question = self._snapshot_questions[number]
+        if question is None:
+            with self._snapshot_lock:
+                question = self._snapshot_questions[number]
+                if question is None:
+                    snapshot = self._snapshot
+                    assert snapshot is not None
+                    question = snapshot.question(number)
+                    self._snapshot_questions[number] = question
+        return question
+
+    def _replay(self, record: List[Any]) -> None:
+        """Apply one log record to the in-memory state"""
+        handler = self._replay_handlers.get(record[0])
+        if handler is not None:
+            handler(self, record)
+
+    def _replay_add(self, record: List[Any]) -> None:
+        """Replay ["add", [[quiz_id, encoded quiz], ...]]"""
+        self._insert_quizzes(
+            [
+                self._decode_quiz(quiz_id, encoded, map(decode_question, encoded[4]))
+                for quiz_id, encoded in record[1]
+            ]
+        )
+
+    def _replay_update(self, record: List[Any]) -> None:
+        """Replay ["update", quiz_id, encoded quiz], whose questions are None if unchanged"""
+        _, quiz_id, encoded = record
+        previous = self._storage.get(quiz_id)
+        if previous is not None:
+            questions = None if encoded[4] is None else map(decode_question, encoded[4])
+            stored = self._decode_quiz(quiz_id, encoded, questions, previous)
+            self._storage[quiz_id] = stored
+            self._release_replaced(stored, previous)
+
+    def _replay_delete(self, record: List[Any]) -> None:
+        """Replay ["delete", quiz_id]"""
+        super().delete_quiz(record[1])
+
+    def _replay_attempt(self, record: List[Any]) -> None:
+        """Replay ["attempt", attempt_id, quiz_id, start_time, seed]"""
+        _, attempt_id, quiz_id, start_time, seed = record
+        stored = self._storage.get(quiz_id)
+        if stored is not None:
+            attempt = QuizAttempt(stored, attempt_id, start_time=start_time, seed=seed)
+            self._insert_attempt(quiz_id, attempt)
+
+    def _replay_answers(self, record: List[Any]) -> None:
+        """Replay ["answers", attempt_id, [[question_index, answer], ...]]"""
+        attempt = self._attempts.get(record[1])
+        if attempt is not None:
+            for index, answer in record[2]:
+                attempt.submit_answer(index, answer)
+
+    def _replay_bank(self, record: List[Any]) -> None:
+        """Replay ["bank", [encoded question, ...]]"""
+        self._bank.add_many(map(decode_question, record[1]))
+
+    def _replay_clear(self, record: List[Any]) -> None:
+        """Replay ["clear"]"""
+        super().clear()
+
+    # Log record operation -> method applying it
+    _replay_handlers: Dict[str, Callable[["DurableQuizDatabase", List[Any]], None]] = {
+        "add": _replay_add,
+        "update": _replay_update,
+        "delete": _replay_delete,
+        "attempt": _replay_attempt,
+        "answers": _replay_answers,
+        "bank": _replay_bank,
+        "clear": _replay_clear,
+    }
+
+    def _decode_quiz(
+        self,
+        quiz_id: str,
+        encoded: Sequence[Any],
+        questions: Optional[Iterable[Question]],
+        previous: Optional[Quiz] = None,
+    ) -> Quiz:
+        """Build the stored quiz for an encoded quiz, reusing previous's questions if None"""
+        title, time_limit_seconds, start_time, version, _, answers = encoded
+        if questions is None:
+            assert previous is not None
+            quiz = previous.snapshot(include_answers=False)
+            quiz.title = title
+            quiz.time_limit_seconds = time_limit_seconds
+        else:
+            quiz = Quiz(title=title, time_limit_seconds=time_limit_seconds)
+            quiz.add_questions(questions)
+        for index, answer in answers:
+            quiz.submit_answer(index, answer)
+        quiz.start_time = start_time
+        return self._freeze(quiz, quiz_id, version, previous)
+
+    # Files
+
+    def _segment_path(self, number: int) -> str:
+        """Return the path of a log segment"""
+        return os.path.join(self.directory, SEGMENT_NAME.format(number))
+
+    def _segments(self) -> List[int]:
+        """Return the numbers of the log segments in the directory, in order"""
+        matches = (SEGMENT_PATTERN.match(name) for name in os.listdir(self.directory))
+        return sorted(int(match.group(1)) for match in matches if match)
+
+    def close(self) -> None:
+        """Wait for a background snapshot, make every logged mutation durable and close the log"""
+        if self._checkpoint_thread is not None:
+            self._checkpoint_thread.join()
+        with self._checkpoint_lock:
+            if self._log is not None and not self._closed:
+                self._log.close()
+            if self._snapshot is not None:
+                self._snapshot.close()
+                self._snapshot = None
+            self._closed = True
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"DurableQuizDatabase(directory='{self.directory}', quizzes={len(self._storage)})"
@@ -0,0 +1,223 @@
+"""
+Prometheus-style metrics for the quiz service.
+
+Metrics are recorded in a process-wide ``REGISTRY`` and rendered in the
+Prometheus text exposition format. Recording is off until
+``REGISTRY.enabled`` is set (the API does this when QUIZ_METRICS=1), and
+while it is off every instrumentation point returns after a single flag check.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple, TypeVar
+
+# Upper bounds, in seconds, of the latency histogram buckets
+DEFAULT_BUCKETS = (0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+Labels = Tuple[str, ...]
+Collector = Callable[[], Iterable[Tuple[str, str, float]]]
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+
+def _format_labels(names: Labels, values: Labels) -> str:
+    """Render label pairs as {name="value",...}, escaping the values"""
+    if not names:
+        return ""
+    pairs = []
+    for name, value in zip(names, values):
+        escaped = value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        pairs.append(f'{name}="{escaped}"')
+    return "{" + ",".join(pairs) + "}"
+
+
+class Counter:
+    """A labelled counter"""
+
+    def __init__(self, name: str, help_text: str, label_names: Labels) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: Labels, amount: float = 1) -> None:
+        """Add amount to the counter for these label values"""
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Labels) -> float:
+        """Return the current count for these label values"""
+        return self._values.get(labels, 0)
+
+    def render(self) -> List[str]:
+        """Render the counter in the text exposition format"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for labels, value in values:
+            lines.append(f"{self.name}{_format_labels(self.label_names, labels)} {value:g}")
+        return lines
+
+
+class Histogram:
+    """A labelled histogram with fixed bucket bounds"""
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Labels,
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        # Label values -> [per-bucket counts (last is +Inf), sum, count]
+        self._series: Dict[Labels, List[Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: Labels, value: float) -> None:
+        """Record one observation for these label values"""
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][bucket] += 1
+            series[1] += value
+            series[2] += 1
+
+    def count(self, labels: Labels) -> int:
+        """Return the number of observations for these label values"""
+        series = self._series.get(labels)
+        return 0 if series is None else series[2]
+
+    def render(self) -> List[str]:
+        """Render the histogram with cumulative buckets in the text exposition format"""
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series_list = sorted(
+                (labels, list(s[0]), s[1], s[2]) for labels, s in self._series.items()
+            )
+        bucket_names = self.label_names + ("le",)
+        bounds = [f"{bound:g}" for bound in self.buckets] + ["+Inf"]
+        for labels, bucket_counts, total, count in series_list:
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, bucket_counts):
+                cumulative += bucket_count
+                label_text = _format_labels(bucket_names, labels + (bound,))
+                lines.append(f"{self.name}_bucket{label_text} {cumulative}")
+            label_text = _format_labels(self.label_names, labels)
+            lines.append(f"{self.name}_sum{label_text} {total:g}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds every metric of the process and renders them for scraping.
+
+    Collectors are called at scrape time for values that are cheaper to
+    compute on demand than to keep up to date, such as store sizes.
+    """
+
+    def __init__(self, enabled: bool = False) -> None:
+        self.enabled = enabled
+        self._metrics: List[Any] = []
+        self._collectors: List[Collector] = []
+
+    def counter(self, name: str, help_text: str, label_names: Labels = ()) -> Counter:
+        """Create and register a counter"""
+        counter = Counter(name, help_text, label_names)
+        self._metrics.append(counter)
+        return counter
+
+    def histogram(self, name: str, help_text: str, label_names: Labels = ()) -> Histogram:
+        """Create and register a histogram"""
+        histogram = Histogram(name, help_text, label_names)
+        self._metrics.append(histogram)
+        return histogram
+
+    def add_collector(self, collector: Collector) -> None:
+        """Register a callable returning (name, help, value) gauges at scrape time"""
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, help_text, value in collector():
+                lines.extend([f"# HELP {name} {help_text}", f"# TYPE {name} gauge"])
+                lines.append(f"{name} {value:g}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "quiz_http_requests_total", "HTTP requests handled", ("method", "route", "status")
+)
+HTTP_SECONDS = REGISTRY.histogram(
+    "quiz_http_request_duration_seconds", "HTTP request latency", ("method", "route")
+)
+STORAGE_SECONDS = REGISTRY.histogram(
+    "quiz_storage_operation_seconds", "Storage backend operation latency", ("backend", "operation")
+)
+
+
+def timed(operation: str) -> Callable[[Method], Method]:
+    """Decorate a storage method to record its latency under the given operation name"""
+
+    def decorate(method: Method) -> Method:
+        @functools.wraps(method)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+            if not REGISTRY.enabled:
+                return method(self, *args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                labels = (type(self).__name__, operation)
+                STORAGE_SECONDS.observe(labels, time.perf_counter() - start)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording the count and latency of HTTP requests per route.
+
+    Requests are labelled with the route template (e.g. ``/quizzes/{quiz_id}``)
+    rather than the raw path, so the number of series stays bounded.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]]) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http" or not REGISTRY.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        status = 500  # Reported if the app raises before starting a response
+        start = time.perf_counter()
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            HTTP_SECONDS.observe((scope["method"], route), time.perf_counter() - start)
+            HTTP_REQUESTS.inc((scope["method"], route, str(status)))
@@ -0,0 +1,217 @@
+"""
+Opt-in profiling of slow API requests.
+
+When enabled, requests are run under cProfile. A request slower than the
+threshold keeps its profile: the top functions by cumulative time are kept
+in memory for ``GET /profiles``, and the full profile is written to a
+``.prof`` file for ``python -m pstats`` or snakeviz.
+
+Profiling is configured from the environment (see ``Profiler.from_env``):
+
+- QUIZ_PROFILING=1 profiles every request and keeps the slow ones
+- QUIZ_PROFILE_TOKEN=<secret> profiles any single request sent with the
+  header ``X-Profile-Token: <secret>`` and always keeps its profile
+- QUIZ_PROFILE_THRESHOLD_MS, QUIZ_PROFILE_DIR and QUIZ_PROFILE_TOP tune the
+  threshold, dump directory and number of functions kept
+"""
+
+import cProfile
+import hmac
+import os
+import pstats
+import threading
+import time
+import uuid
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, NamedTuple, Optional
+from starlette.concurrency import run_in_threadpool
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+
+
+class ProfileReport(NamedTuple):
+    """A kept profile of one request"""
+
+    profile_id: str
+    method: str
+    route: str
+    path: str
+    elapsed_ms: float
+    dump_path: Optional[str]  # None if the .prof file could not be written
+    top_functions: List[Dict[str, Any]]  # Hottest functions by cumulative time
+
+
+class Profiler:
+    """
+    Profiling settings and the most recent kept profiles.
+
+    Only one request is profiled at a time, because cProfile hooks the whole
+    thread; requests arriving meanwhile run unprofiled. Code of overlapping
+    requests that runs on the event loop while the profiled one awaits can
+    still appear in its profile. Work the request hands to worker threads
+    (see src/async_storage.py) is not profiled; it shows up as time awaited.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = False,
+        threshold_ms: float = 100.0,
+        token: Optional[str] = None,
+        output_dir: str = "profiles",
+        top_n: int = 20,
+        max_reports: int = 50,
+    ) -> None:
+        self.enabled = enabled
+        self.threshold_ms = threshold_ms
+        self.token = token
+        self.output_dir = output_dir
+        self.top_n = top_n
+        self._reports: Deque[ProfileReport] = deque(maxlen=max_reports)
+        self._busy = threading.Lock()  # Held while a request is being profiled
+
+    @classmethod
+    def from_env(cls) -> "Profiler":
+        """Create a profiler configured by the QUIZ_PROFILE* environment variables"""
+        return cls(
+            enabled=os.environ.get("QUIZ_PROFILING") == "1",
+            threshold_ms=float(os.environ.get("QUIZ_PROFILE_THRESHOLD_MS", "100")),
+            token=os.environ.get("QUIZ_PROFILE_TOKEN") or None,
+            output_dir=os.environ.get("QUIZ_PROFILE_DIR", "profiles"),
+            top_n=int(os.environ.get("QUIZ_PROFILE_TOP", "20")),
+        )
+
+    @property
+    def active(self) -> bool:
+        """Whether any request can be profiled"""
+        return self.enabled or self.token is not None
+
+    def is_authorized(self, token: Optional[str]) -> bool:
+        """Check a profile token against the configured one, in constant time"""
+        if self.token is None or token is None:
+            return False
+        return hmac.compare_digest(token.encode("utf-8"), self.token.encode("utf-8"))
+
+    def reports(self) -> List[ProfileReport]:
+        """Return the kept profiles, most recent first"""
+        return list(reversed(self._reports))
+
+    def clear(self) -> None:
+        """Forget the kept profiles (dump files are left in place)"""
+        self._reports.clear()
+
+    def acquire(self) -> bool:
+        """Claim the profiler for one request; False if another request holds it"""
+        return self._busy.acquire(blocking=False)
+
+    def release(self) -> None:
+        """Release the profiler claimed with acquire()"""
+        self._busy.release()
+
+    def record(
+        self,
+        profile: cProfile.Profile,
+        profile_id: str,
+        method: str,
+        route: str,
+        path: str,
+        elapsed_ms: float,
+    ) -> ProfileReport:
+        """
+        Keep a request's profile: summarize it and write it to the output directory.
+
+        This blocks on pstats and file I/O; the middleware runs it in a worker thread.
+        """
+        report = ProfileReport(
+            profile_id=profile_id,
+            method=method,
+            route=route,
+            path=path,
+            elapsed_ms=elapsed_ms,
+            dump_path=self._dump(profile, profile_id),
+            top_functions=self._top_functions(profile),
+        )
+        self._reports.append(report)
+        return report
+
+    def _dump(self, profile: cProfile.Profile, profile_id: str) -> Optional[str]:
+        """Write the profile to <output_dir>/<timestamp>-<id>.prof and return the path"""
+        path = os.path.join(self.output_dir, f"{time.strftime('%Y%m%d-%H%M%S')}-{profile_id}.prof")
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            profile.dump_stats(path)
+        except OSError:
+            return None
+        return path
+
+    def _top_functions(self, profile: cProfile.Profile) -> List[Dict[str, Any]]:
+        """Return the top_n functions by cumulative time"""
+        stats = pstats.Stats(profile).stats  # type: ignore[attr-defined]
+        hottest = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)
+        return [
+            {
+                "function": f"{os.path.basename(filename)}:{line}({name})",
+                "calls": calls,
+                "total_s": total,
+                "cumulative_s": cumulative,
+            }
+            for (filename, line, name), (_, calls, total, cumulative, _) in hottest[: self.top_n]
+        ]
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware that profiles requests as configured on a Profiler.
+
+    Responses to requests profiled through the token header carry an
+    ``X-Profile-Id`` header naming the kept report.
+    """
+
+    def __init__(self, app: Callable[..., Awaitable[None]], profiler: Profiler) -> None:
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        profiler = self.profiler
+        if scope["type"] != "http" or not profiler.active:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        token = headers.get(PROFILE_TOKEN_HEADER)
+        forced = token is not None and profiler.is_authorized(token.decode("latin-1"))
+        if not (forced or profiler.enabled) or not profiler.acquire():
+            await self.app(scope, receive, send)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        profile = cProfile.Profile()
+
+        async def send_with_profile_id(message: Dict[str, Any]) -> None:
+            if forced and message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"x-profile-id", profile_id.encode())
+                ]
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_profile_id)
+            finally:
+                profile.disable()
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            if forced or elapsed_ms >= profiler.threshold_ms:
+                route = getattr(scope.get("route"), "path", "<unmatched>")
+                await run_in_threadpool(
+                    profiler.record,
+                    profile,
+                    profile_id,
+                    scope["method"],
+                    route,
+                    scope["path"],
+                    elapsed_ms,
+                )
+        finally:
+            profiler.release()
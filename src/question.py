@@ -1,23 +1,40 @@
-from typing import List, Optional
+import sys
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 
 class Question:
-    """Represents a single quiz question with multiple choice options"""
+    """
+    Represents a single quiz question with multiple choice options.
+
+    Questions are immutable once created, which lets quizzes and database
+    snapshots share the same Question objects instead of copying them.
+    They use __slots__ and interned difficulty/category strings to keep
+    large question banks small in memory.
+    """
+
+    __slots__ = ("text", "options", "correct_answer", "correct_index", "difficulty", "category")
 
     def __init__(
         self,
         text: str,
-        options: List[str],
+        options: Sequence[str],
         correct_answer: str,
         difficulty: str = "medium",
         category: Optional[str] = None,
     ) -> None:
         self._validate_text(text)
-        self.text = text
-        self.options = options
-        self.correct_answer = correct_answer
-        self.difficulty = difficulty
-        self.category = category
+        set_attribute = object.__setattr__
+        set_attribute(self, "text", text)
+        set_attribute(self, "options", tuple(options))
+        set_attribute(self, "correct_answer", correct_answer)
+        # Position of the correct answer among the options, or None if it is not one
+        set_attribute(
+            self,
+            "correct_index",
+            self.options.index(correct_answer) if correct_answer in self.options else None,
+        )
+        set_attribute(self, "difficulty", sys.intern(difficulty))
+        set_attribute(self, "category", None if category is None else sys.intern(category))
 
     @staticmethod
     def _validate_text(text: str) -> None:
@@ -29,6 +46,52 @@ class Question:
         """Check if the provided answer is correct"""
         return answer == self.correct_answer
 
+    def option_index(self, answer: str) -> int:
+        """
+        Return the position of an answer among the options.
+
+        Raises:
+            ValueError: If the answer is not one of the options
+        """
+        try:
+            return self.options.index(answer)
+        except ValueError:
+            raise ValueError(f"{answer!r} is not an option") from None
+
+    def check_answer_index(self, option_index: int) -> bool:
+        """
+        Check an answer given as an option index.
+
+        Raises:
+            ValueError: If the index does not refer to an option
+        """
+        if not 0 <= option_index < len(self.options):
+            raise ValueError("Invalid option index")
+        return option_index == self.correct_index
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Reject attribute changes so shared questions cannot be mutated"""
+        raise AttributeError("Question objects are immutable")
+
+    def __delattr__(self, name: str) -> None:
+        """Reject attribute deletion so shared questions cannot be mutated"""
+        raise AttributeError("Question objects are immutable")
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        """Pickle through the constructor, since attributes cannot be set afterwards"""
+        return (
+            Question,
+            (self.text, self.options, self.correct_answer, self.difficulty, self.category),
+        )
+
+    def __copy__(self) -> "Question":
+        """Immutable questions can be shared instead of copied"""
+        return self
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "Question":
+        """Immutable questions can be shared instead of copied"""
+        return self
+
     def __eq__(self, other: object) -> bool:
         """Check equality based on question text and options"""
         if not isinstance(other, Question):
@@ -41,7 +104,7 @@ class Question:
 
     def __hash__(self) -> int:
         """Make Question hashable for use in sets"""
-        return hash((self.text, tuple(self.options), self.correct_answer))  # pragma: no cover
+        return hash((self.text, self.options, self.correct_answer))
 
     def __repr__(self) -> str:
         """String representation for debugging"""
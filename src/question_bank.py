@@ -0,0 +1,163 @@
+import hashlib
+import json
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from src.question import Question
+
+# All the fields that make two questions interchangeable
+ContentKey = Tuple[str, Tuple[str, ...], str, str, Optional[str]]
+
+
+def question_id(question: Question) -> str:
+    """
+    Return the content ID of a question: a hash of all its fields.
+
+    Questions with the same text, options, correct answer, difficulty and
+    category get the same ID in every process and every backend.
+    """
+    content = [
+        question.text,
+        list(question.options),
+        question.correct_answer,
+        question.difficulty,
+        question.category,
+    ]
+    encoded = json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()[:32]
+
+
+class QuestionBank:
+    """
+    A store of reusable questions, kept once each by content.
+
+    Adding a question whose content is already in the bank returns the
+    existing ID, and ``intern`` returns the stored instance, so any number of
+    quizzes can share one Question object per unique question. Questions are
+    immutable, which makes the sharing safe.
+
+    Questions added with ``add`` stay until the bank is cleared. Questions
+    that only quizzes use are reference-counted: ``intern`` takes a
+    reference and ``release`` drops it, and a question is removed once its
+    last reference is released.
+
+    The bank is thread-safe. Lookups do not lock; adding and releasing do.
+    """
+
+    def __init__(self) -> None:
+        self._questions: Dict[str, Question] = {}  # Content ID -> shared instance
+        self._ids: Dict[ContentKey, str] = {}  # Content -> content ID, to skip rehashing
+        self._references: Dict[str, int] = {}  # Content ID -> uses by interned quizzes
+        self._pinned: Set[str] = set()  # Content IDs added to the bank itself
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _content_key(question: Question) -> ContentKey:
+        """Return the fields that identify a question's content"""
+        return (
+            question.text,
+            question.options,
+            question.correct_answer,
+            question.difficulty,
+            question.category,
+        )
+
+    def content_id(self, question: Question) -> str:
+        """Return the content ID of a question, without hashing it if the bank holds it"""
+        existing = self._ids.get(self._content_key(question))
+        return question_id(question) if existing is None else existing
+
+    def _store(self, key: ContentKey, question: Question, known_id: Optional[str]) -> str:
+        """Store a question unless present and return its ID; the caller holds the lock"""
+        existing = self._ids.get(key)
+        if existing is not None:
+            return existing
+        new_id = question_id(question) if known_id is None else known_id
+        self._questions[new_id] = question
+        self._ids[key] = new_id
+        return new_id
+
+    def add(self, question: Question, known_id: Optional[str] = None) -> str:
+        """
+        Store a question unless its content is already present, and return its ID.
+
+        The question stays in the bank until it is cleared.
+
+        Args:
+            question: The question to store
+            known_id: The question's content ID, if the caller already has it (skips hashing)
+        """
+        key = self._content_key(question)
+        with self._lock:
+            new_id = self._store(key, question, known_id)
+            self._pinned.add(new_id)
+        return new_id
+
+    def add_many(self, questions: Iterable[Question]) -> List[str]:
+        """Store several questions and return their IDs, in order"""
+        return [self.add(question) for question in questions]
+
+    def intern(self, question: Question, known_id: Optional[str] = None) -> Question:
+        """Return the bank's instance of a question, adding it if needed, and take a reference"""
+        key = self._content_key(question)
+        with self._lock:
+            new_id = self._store(key, question, known_id)
+            self._references[new_id] = self._references.get(new_id, 0) + 1
+            return self._questions[new_id]
+
+    def release(self, questions: Iterable[Question]) -> None:
+        """Drop one reference to each question, removing those no longer used"""
+        with self._lock:
+            for question in questions:
+                key = self._content_key(question)
+                existing = self._ids.get(key)
+                if existing is None or existing not in self._references:
+                    continue
+                remaining = self._references[existing] - 1
+                if remaining:
+                    self._references[existing] = remaining
+                    continue
+                del self._references[existing]
+                if existing not in self._pinned:
+                    del self._questions[existing]
+                    del self._ids[key]
+
+    def is_pinned(self, question_id: str) -> bool:
+        """Check whether a question was added to the bank itself rather than only by quizzes"""
+        return question_id in self._pinned
+
+    def get(self, question_id: str) -> Optional[Question]:
+        """Return the question with the given content ID, or None if not found"""
+        return self._questions.get(question_id)
+
+    def get_many(self, question_ids: Iterable[str]) -> List[Question]:
+        """
+        Return the questions with the given content IDs, in order.
+
+        Raises:
+            KeyError: With the first ID that is not in the bank
+        """
+        return [self._questions[question_id] for question_id in question_ids]
+
+    def clear(self) -> None:
+        """Remove every question from the bank"""
+        with self._lock:
+            self._questions.clear()
+            self._ids.clear()
+            self._references.clear()
+            self._pinned.clear()
+
+    def __iter__(self) -> Iterator[Question]:
+        """Iterate over the stored questions, in the order they were added"""
+        return iter(list(self._questions.values()))
+
+    def __contains__(self, question_id: object) -> bool:
+        """Check whether a content ID is in the bank"""
+        return question_id in self._questions
+
+    def __len__(self) -> int:
+        """Return the number of unique questions"""
+        return len(self._questions)
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"QuestionBank(questions={len(self._questions)})"
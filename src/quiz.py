@@ -1,4 +1,5 @@
-from typing import Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple
 from src.question import Question
 from src.result import QuizResult
 import time
@@ -12,35 +13,191 @@ class Quiz:
     - Time limits
     - Question categorization and difficulty levels
     - Answer review and detailed feedback
+
+    Question and answer storage is copy-on-write: ``snapshot()`` returns a quiz
+    that shares both with the original until one of them is modified.
     """
 
+    __slots__ = (
+        "id",
+        "version",
+        "title",
+        "_questions",
+        "_question_positions",
+        "_category_index",
+        "_difficulty_index",
+        "_answers",
+        "_score",
+        "_incorrect",
+        "_questions_view",
+        "_questions_shared",
+        "_answers_shared",
+        "time_limit_seconds",
+        "start_time",
+    )
+
     def __init__(
         self, title: str, time_limit_seconds: Optional[int] = None, quiz_id: Optional[str] = None
     ) -> None:
         self.id = quiz_id
+        self.version = 0  # Set by the database; incremented on every stored update
         self.title = title
-        self.questions: List[Question] = []
-        self.answers: Dict[int, str] = {}  # Maps question index to submitted answer
+        self._questions: List[Question] = []
+        self._question_positions: Dict[Question, int] = {}  # Duplicate-detection index
+        self._category_index: Dict[Optional[str], List[int]] = {}  # Category -> indices
+        self._difficulty_index: Dict[str, List[int]] = {}  # Difficulty -> indices
+        self._answers: Dict[int, str] = {}  # Maps question index to submitted answer
+        self._score = 0  # Running count of correct answers
+        self._incorrect: Dict[int, None] = {}  # Incorrectly answered indices, in order
+        self._questions_view: Optional[Tuple[Question, ...]] = None
+        self._questions_shared = False
+        self._answers_shared = False
         self.time_limit_seconds = time_limit_seconds
         self.start_time: Optional[float] = None
 
+    @property
+    def questions(self) -> Tuple[Question, ...]:
+        """Read-only view of the quiz questions"""
+        if self._questions_view is None:
+            self._questions_view = tuple(self._questions)
+        return self._questions_view
+
+    @property
+    def answers(self) -> Mapping[int, str]:
+        """Read-only view of submitted answers keyed by question index"""
+        return MappingProxyType(self._answers)
+
+    # Copy-on-write Snapshots
+
+    def snapshot(self, include_answers: bool = True) -> "Quiz":
+        """
+        Return a copy of the quiz without copying its questions or answers.
+
+        The copy shares question and answer storage with this quiz; whichever
+        side is modified first takes a private copy, so neither can observe
+        the other's changes. The read-only question view is built here, once,
+        so every snapshot of an unchanged quiz reuses it.
+
+        Args:
+            include_answers: If False, the copy starts with no answers and no timer
+        """
+        if self._questions_view is None:
+            self._questions_view = tuple(self._questions)
+        self._questions_shared = True
+        quiz_copy = Quiz.__new__(Quiz)
+        for name in Quiz.__slots__:
+            setattr(quiz_copy, name, getattr(self, name))
+        if include_answers:
+            self._answers_shared = quiz_copy._answers_shared = True
+        else:
+            quiz_copy._answers = {}
+            quiz_copy._score = 0
+            quiz_copy._incorrect = {}
+            quiz_copy._answers_shared = False
+            quiz_copy.start_time = None
+        return quiz_copy
+
+    def _prepare_questions_write(self) -> None:
+        """Take a private copy of shared question storage before modifying it"""
+        if self._questions_shared:
+            self._questions = list(self._questions)
+            self._question_positions = dict(self._question_positions)
+            self._category_index = {key: list(v) for key, v in self._category_index.items()}
+            self._difficulty_index = {key: list(v) for key, v in self._difficulty_index.items()}
+            self._questions_shared = False
+
+    def _prepare_answers_write(self) -> None:
+        """Take a private copy of shared answer storage before modifying it"""
+        if self._answers_shared:
+            self._answers = dict(self._answers)
+            self._incorrect = dict(self._incorrect)
+            self._answers_shared = False
+
     # Question Management
 
     def add_question(self, question: Question) -> None:
         """Add a question to the quiz, avoiding duplicates"""
-        if question not in self.questions:
-            self.questions.append(question)
+        if question not in self._question_positions:
+            self._prepare_questions_write()
+            self._append_question(question)
+            self._questions_view = None
+
+    def add_questions(self, questions: Iterable[Question]) -> None:
+        """Add several questions in one pass, skipping duplicates"""
+        self._prepare_questions_write()
+        for question in questions:
+            if question not in self._question_positions:
+                self._append_question(question)
+        self._questions_view = None
+
+    def _append_question(self, question: Question) -> None:
+        """Append a question and record it in the duplicate and filter indexes"""
+        index = len(self._questions)
+        self._question_positions[question] = index
+        self._category_index.setdefault(question.category, []).append(index)
+        self._difficulty_index.setdefault(question.difficulty, []).append(index)
+        self._questions.append(question)
+        # An answer submitted before its question existed was counted as incorrect
+        if index in self._answers and question.check_answer(self._answers[index]):
+            self._prepare_answers_write()
+            del self._incorrect[index]
+            self._score += 1
+
+    def share_questions(self, intern: Callable[[Question], Question]) -> None:
+        """
+        Replace questions with equal shared instances, such as those of a QuestionBank.
+
+        Args:
+            intern: Returns the shared instance of a question with the same content
+        """
+        shared = [intern(question) for question in self._questions]
+        if all(new is old for new, old in zip(shared, self._questions)):
+            return
+        self._prepare_questions_write()
+        self._questions = shared
+        self._question_positions = {question: index for index, question in enumerate(shared)}
+        self._questions_view = None
 
     def get_question(self, index: int) -> Question:
         """Get a question by its index"""
-        return self.questions[index]
+        return self._questions[index]
 
     # Answer Submission and Timing
 
     def submit_answer(self, question_index: int, answer: str) -> None:
         """Submit an answer for a specific question"""
+        self._record_answer(question_index, answer, self._is_answer_correct(question_index, answer))
+
+    def submit_answer_index(self, question_index: int, option_index: int) -> None:
+        """
+        Submit an answer given as the index of one of the question's options.
+
+        The stored answer is the option string the question already holds, and
+        checking it is an integer comparison with the precomputed correct index.
+
+        Raises:
+            IndexError: If the question index is out of range
+            ValueError: If the option index does not refer to an option
+        """
+        if not 0 <= question_index < len(self._questions):
+            raise IndexError("Invalid question index")
+        question = self._questions[question_index]
+        is_correct = question.check_answer_index(option_index)
+        self._record_answer(question_index, question.options[option_index], is_correct)
+
+    def _record_answer(self, question_index: int, answer: str, is_correct: bool) -> None:
+        """Store an answer whose correctness is already known"""
         self._start_timer_if_needed()
-        self.answers[question_index] = answer
+        self._prepare_answers_write()
+        was_correct = question_index in self._answers and question_index not in self._incorrect
+        self._answers[question_index] = answer
+
+        # Keep the running score and incorrect set up to date, including overwrites
+        self._score += is_correct - was_correct
+        if is_correct:
+            self._incorrect.pop(question_index, None)
+        else:
+            self._incorrect[question_index] = None
 
     def _start_timer_if_needed(self) -> None:
         """Start the timer on first answer submission"""
@@ -64,37 +221,29 @@ class Quiz:
     def get_result(self) -> QuizResult:
         """Calculate and return the quiz result"""
         score = self._calculate_score()
-        total = len(self.questions)
+        total = len(self._questions)
         return QuizResult(score, total)
 
     def _calculate_score(self) -> int:
-        """Calculate the total number of correct answers"""
-        score = 0
-        for index, answer in self.answers.items():
-            if self._is_answer_correct(index, answer):
-                score += 1
-        return score
+        """Return the total number of correct answers, kept up to date by submit_answer"""
+        return self._score
 
     def _is_answer_correct(self, index: int, answer: str) -> bool:
         """Check if an answer at a given index is correct"""
-        if index >= len(self.questions):
-            return False  # pragma: no cover
-        return self.questions[index].check_answer(answer)
+        if index >= len(self._questions):
+            return False
+        return self._questions[index].check_answer(answer)
 
     # Answer Review
 
     def get_incorrect_answers(self) -> List[int]:
         """Get a list of indices for incorrectly answered questions"""
-        incorrect = []
-        for index, answer in self.answers.items():
-            if not self._is_answer_correct(index, answer):
-                incorrect.append(index)
-        return incorrect
+        return list(self._incorrect)
 
     def get_answer_details(self, question_index: int) -> Dict:
         """Get detailed information about a specific answer"""
-        question = self.questions[question_index]
-        submitted_answer = self.answers.get(question_index)
+        question = self._questions[question_index]
+        submitted_answer = self._answers.get(question_index)
 
         return {
             "question": question,
@@ -107,35 +256,65 @@ class Quiz:
 
     def get_questions_by_difficulty(self, difficulty: str) -> List[Question]:
         """Get all questions with a specific difficulty level"""
-        return [q for q in self.questions if q.difficulty == difficulty]
+        return [self._questions[i] for i in self._difficulty_index.get(difficulty, ())]
 
     def get_questions_by_category(self, category: Optional[str]) -> List[Question]:
         """Get all questions in a specific category"""
-        return [q for q in self.questions if q.category == category]
+        return [self._questions[i] for i in self._category_index.get(category, ())]
 
     def get_score_by_category(self, category: Optional[str]) -> Dict[str, float]:
         """Get the score for questions in a specific category"""
         category_indices = self._get_category_question_indices(category)
         score = self._calculate_category_score(category_indices)
-        total = len(category_indices)
-        percentage = (score / total * 100) if total > 0 else 0.0
+        return self._score_entry(score, len(category_indices))
 
+    def get_score_breakdown(self) -> Dict[str, Dict[Any, Dict[str, float]]]:
+        """
+        Get the score for every category and every difficulty level at once.
+
+        Walks the submitted answers a single time instead of once per category.
+
+        Returns:
+            {"categories": {category: score}, "difficulties": {difficulty: score}},
+            where each score has the same fields as get_score_by_category
+        """
+        category_scores = dict.fromkeys(self._category_index, 0)
+        difficulty_scores = dict.fromkeys(self._difficulty_index, 0)
+        for index in self._answers:
+            if index not in self._incorrect:
+                question = self._questions[index]
+                category_scores[question.category] += 1
+                difficulty_scores[question.difficulty] += 1
+
+        return {
+            "categories": {
+                category: self._score_entry(score, len(self._category_index[category]))
+                for category, score in category_scores.items()
+            },
+            "difficulties": {
+                difficulty: self._score_entry(score, len(self._difficulty_index[difficulty]))
+                for difficulty, score in difficulty_scores.items()
+            },
+        }
+
+    @staticmethod
+    def _score_entry(score: int, total: int) -> Dict[str, float]:
+        """Build a score/total/percentage entry for a group of questions"""
+        percentage = (score / total * 100) if total > 0 else 0.0
         return {"score": score, "total": total, "percentage": percentage}
 
     def _get_category_question_indices(self, category: Optional[str]) -> List[int]:
         """Get indices of all questions in a category"""
-        return [
-            index for index, question in enumerate(self.questions) if question.category == category
-        ]
+        return list(self._category_index.get(category, ()))
 
     def _calculate_category_score(self, indices: List[int]) -> int:
         """Calculate score for a list of question indices"""
         score = 0
         for index in indices:
-            if index in self.answers and self._is_answer_correct(index, self.answers[index]):
+            if index in self._answers and index not in self._incorrect:
                 score += 1
         return score
 
     def __repr__(self) -> str:
         """String representation for debugging"""
-        return f"Quiz(id='{self.id}', title='{self.title}', questions={len(self.questions)})"
+        return f"Quiz(id='{self.id}', title='{self.title}', questions={len(self._questions)})"
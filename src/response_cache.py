@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Bounded cache of encoded JSON response bodies, keyed by quiz ID and version.
+
+    Because the version is part of the key, an entry can never be served for
+    a quiz that has since changed; invalidate() just frees memory early.
+    The least recently used entry is evicted once ``max_entries`` is reached.
+    """
+
+    def __init__(self, max_entries: int = 1024) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, quiz_id: str, version: int) -> Optional[bytes]:
+        """Return the cached body for this quiz version, or None"""
+        with self._lock:
+            entry = self._entries.get(quiz_id)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(quiz_id)
+            return entry[1]
+
+    def put(self, quiz_id: str, version: int, body: bytes) -> None:
+        """Cache the body for this quiz version, replacing any older version"""
+        with self._lock:
+            self._entries[quiz_id] = (version, body)
+            self._entries.move_to_end(quiz_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, quiz_id: str) -> None:
+        """Drop the cached body for a quiz"""
+        with self._lock:
+            self._entries.pop(quiz_id, None)
+
+    def clear(self) -> None:
+        """Drop all cached bodies"""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached bodies"""
+        return len(self._entries)
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"ResponseCache(entries={len(self._entries)}, max_entries={self.max_entries})"
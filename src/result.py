@@ -1,6 +1,8 @@
 class QuizResult:
     """Represents the result of a completed quiz"""
 
+    __slots__ = ("score", "total", "percentage")
+
     def __init__(self, score: int, total: int) -> None:
         self.score = score
         self.total = total
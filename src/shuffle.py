@@ -0,0 +1,136 @@
+"""
+Per-attempt question and option order, derived from a single seed.
+
+A shuffled attempt stores only a seed. ``Permutation`` turns a seed into a
+pseudorandom permutation of range(size) that maps one index at a time, in
+either direction, without building the shuffled sequence: it is a small
+Feistel network over the next power of four at or above size, and values
+outside range(size) are mapped again until they fall inside ("cycle
+walking"). Each lookup is O(1), so serving one question of a shuffled
+attempt, or mapping one submitted answer back, never touches the rest of
+the quiz.
+
+The order is for presentation only; it is not a cryptographic shuffle.
+"""
+
+import secrets
+from typing import Iterator, List
+
+SEED_BITS = 32
+FEISTEL_ROUNDS = 4
+_MASK64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15  # Spreads consecutive inputs across the mixer
+
+
+def new_seed() -> int:
+    """Return a random seed for a shuffled attempt"""
+    return secrets.randbits(SEED_BITS)
+
+
+def _mix(value: int) -> int:
+    """Scramble a 64-bit integer (the splitmix64 finalizer)"""
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & _MASK64
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & _MASK64
+    return value ^ (value >> 31)
+
+
+class Permutation:
+    """
+    A pseudorandom permutation of range(size), chosen by seed.
+
+    ``p[position]`` is the value at a position of the shuffled sequence and
+    ``p.index(value)`` is its inverse. The same size and seed always give
+    the same permutation.
+    """
+
+    __slots__ = ("size", "_half_bits", "_half_mask", "_keys")
+
+    def __init__(self, size: int, seed: int) -> None:
+        self.size = size
+        bits = max(size - 1, 1).bit_length()
+        self._half_bits = (bits + 1) // 2  # Both halves the same width
+        self._half_mask = (1 << self._half_bits) - 1
+        self._keys = [
+            _mix((seed * FEISTEL_ROUNDS + r) * _GOLDEN & _MASK64) for r in range(FEISTEL_ROUNDS)
+        ]
+
+    def _round(self, key: int, half: int) -> int:
+        """Round function of the Feistel network"""
+        return _mix(key ^ half) & self._half_mask
+
+    def _encrypt(self, value: int) -> int:
+        """One pass of the network over the power-of-four domain"""
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in self._keys:
+            left, right = right, left ^ self._round(key, right)
+        return (left << self._half_bits) | right
+
+    def _decrypt(self, value: int) -> int:
+        """Inverse of _encrypt"""
+        left, right = value >> self._half_bits, value & self._half_mask
+        for key in reversed(self._keys):
+            left, right = right ^ self._round(key, left), left
+        return (left << self._half_bits) | right
+
+    def __getitem__(self, position: int) -> int:
+        """Return the value at a position of the shuffled sequence"""
+        if not 0 <= position < self.size:
+            raise IndexError("Position out of range")
+        value = self._encrypt(position)
+        while value >= self.size:
+            value = self._encrypt(value)
+        return value
+
+    def index(self, value: int) -> int:
+        """Return the position of a value in the shuffled sequence"""
+        if not 0 <= value < self.size:
+            raise ValueError("Value out of range")
+        position = self._decrypt(value)
+        while position >= self.size:
+            position = self._decrypt(position)
+        return position
+
+    def __iter__(self) -> Iterator[int]:
+        """Yield the shuffled sequence"""
+        return (self[position] for position in range(self.size))
+
+    def __len__(self) -> int:
+        """Return the number of values"""
+        return self.size
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"Permutation(size={self.size})"
+
+
+class AttemptOrder:
+    """
+    The order in which a shuffled attempt presents questions and options.
+
+    Question positions and option positions are what the person taking the
+    attempt sees; indices are positions in the quiz itself. Each question's
+    options have their own permutation, derived from the seed and the
+    question's index.
+    """
+
+    __slots__ = ("seed", "questions")
+
+    def __init__(self, seed: int, question_count: int) -> None:
+        self.seed = seed
+        self.questions = Permutation(question_count, seed)
+
+    def options(self, question_index: int, option_count: int) -> Permutation:
+        """Return the option order of the question at a quiz index"""
+        return Permutation(option_count, _mix(self.seed ^ (question_index + 1) * _GOLDEN))
+
+    def question_index(self, position: int) -> int:
+        """Return the quiz index of the question presented at a position"""
+        return self.questions[position]
+
+    def question_positions(self, question_indices: List[int]) -> List[int]:
+        """Return the presented positions of questions given by quiz index, in ascending order"""
+        return sorted(self.questions.index(index) for index in question_indices)
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"AttemptOrder(seed={self.seed}, questions={self.questions.size})"
@@ -0,0 +1,367 @@
+"""
+Snapshot files of the durable in-memory store, readable without decoding them.
+
+A snapshot is a log file (see src/wal.py) holding, in order: a header
+record, every unique question, every quiz, every attempt, a question index,
+a main index and a fixed-size end record pointing at the main index. The
+main index lists the quiz headers needed for listings and the byte offsets
+of the quiz and attempt records; the question index lists the offset and
+content ID of every question, and which questions were added to the question
+bank directly rather than only used by quizzes. ``Snapshot`` memory-maps the file and decodes
+only the main index when opened, the question index when a question is first
+needed, and each record the first time it is read.
+"""
+
+import json
+import mmap
+import os
+import threading
+import zlib
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.quiz import Quiz
+from src.wal import FILE_MAGIC, RECORD_HEADER, encode_record, sync_directory
+
+SNAPSHOT_FORMAT = 2
+END_RECORD_SIZE = len(encode_record(["end", "0" * 20]))  # The offset is zero-padded
+
+# Encoded forms used in records:
+# question: [text, options, correct_answer, difficulty, category]
+# quiz: [title, time_limit_seconds, start_time, version, questions, [[index, answer], ...]]
+#   where questions is a list of encoded questions in the log, a list of
+#   question numbers in a snapshot, or None in an update that kept them.
+# attempt: ["attempt", attempt_id, quiz_id, quiz, seed] in a snapshot, where
+#   quiz is the attempt's session and seed is None for an unshuffled attempt.
+
+
+def encode_question(question: Question) -> List[Any]:
+    """Encode a question for a record"""
+    return [
+        question.text,
+        question.options,
+        question.correct_answer,
+        question.difficulty,
+        question.category,
+    ]
+
+
+def decode_question(encoded: Sequence[Any]) -> Question:
+    """Build a Question from its encoded form"""
+    text, options, correct_answer, difficulty, category = encoded
+    return Question(text, options, correct_answer, difficulty, category)
+
+
+def encode_quiz(quiz: Quiz, questions: Optional[List[Any]]) -> List[Any]:
+    """Encode a quiz, with its questions already encoded by the caller"""
+    return [
+        quiz.title,
+        quiz.time_limit_seconds,
+        quiz.start_time,
+        quiz.version,
+        questions,
+        [[index, answer] for index, answer in quiz.answers.items()],
+    ]
+
+
+class QuizHeader(NamedTuple):
+    """What a snapshot index holds about a quiz, enough to list it"""
+
+    quiz_id: str
+    title: str
+    time_limit_seconds: Optional[float]
+    question_count: int
+    offset: int  # Byte offset of the quiz record
+
+
+class AttemptHeader(NamedTuple):
+    """What a snapshot index holds about an attempt"""
+
+    attempt_id: str
+    quiz_id: str
+    offset: int  # Byte offset of the attempt record
+
+
+def write_snapshot(
+    path: str,
+    next_segment: int,
+    questions: Sequence[Question],
+    question_ids: Sequence[str],
+    quizzes: Sequence[Quiz],
+    attempts: Sequence[QuizAttempt],
+    pinned: Sequence[int] = (),
+) -> None:
+    """
+    Atomically replace path with a snapshot of the given state.
+
+    Args:
+        path: The snapshot file
+        next_segment: First log segment not covered by the snapshot
+        questions: Every unique question, including those of quizzes and attempts
+        question_ids: Content ID of each question, in the same order
+        quizzes: The stored quizzes, in listing order
+        attempts: The stored attempts
+        pinned: Numbers of the questions added to the question bank directly
+    """
+    numbers = {question: number for number, question in enumerate(questions)}
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as out:
+        offset = out.write(FILE_MAGIC)
+
+        def write(record: List[Any]) -> int:
+            nonlocal offset
+            start = offset
+            offset += out.write(encode_record(record))
+            return start
+
+        write(["snapshot", SNAPSHOT_FORMAT, next_segment])
+        question_offsets = [write(["question", encode_question(q)]) for q in questions]
+        quiz_index = []
+        for quiz in quizzes:
+            encoded = encode_quiz(quiz, [numbers[q] for q in quiz.questions])
+            record_offset = write(["quiz", quiz.id, encoded])
+            quiz_index.append(
+                [quiz.id, quiz.title, quiz.time_limit_seconds, len(quiz.questions), record_offset]
+            )
+        attempt_index = []
+        for attempt in attempts:
+            session = attempt.quiz
+            encoded = encode_quiz(session, [numbers[q] for q in session.questions])
+            record_offset = write(["attempt", attempt.id, attempt.quiz_id, encoded, attempt.seed])
+            attempt_index.append([attempt.id, attempt.quiz_id, record_offset])
+        question_index_offset = write(
+            ["question_index", question_offsets, list(question_ids), list(pinned)]
+        )
+        index_offset = write(
+            ["index", question_index_offset, len(questions), quiz_index, attempt_index]
+        )
+        write(["end", f"{index_offset:020d}"])
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(temporary, path)
+    sync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file.
+
+    Opening one decodes only its index; ``record`` decodes a single record
+    on demand. The mapping stays valid after the file is replaced by a newer
+    snapshot, until ``close`` is called.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Map a snapshot file and read its index.
+
+        Raises:
+            ValueError: If the file is not a complete snapshot
+        """
+        self.path = path
+        with open(path, "rb") as snapshot_file:
+            if os.fstat(snapshot_file.fileno()).st_size <= len(FILE_MAGIC):
+                raise ValueError(f"Not a quiz snapshot: {path}")
+            self._map = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(FILE_MAGIC)] != FILE_MAGIC:
+            self.close()
+            raise ValueError(f"Not a quiz snapshot: {path}")
+        header, _ = self._read(len(FILE_MAGIC))
+        if header[0] != "snapshot" or header[1] != SNAPSHOT_FORMAT:
+            self.close()
+            raise ValueError(f"Not a quiz snapshot: {path}")
+        self.next_segment: int = header[2]
+        self.question_count = 0
+        self._question_index_offset = 0
+        self._question_index: Optional[Tuple[List[int], List[str], List[int]]] = None
+        self._lock = threading.Lock()
+        self.quizzes: List[QuizHeader] = []
+        self.attempts: List[AttemptHeader] = []
+        self._read_index()
+
+    def record(self, offset: int) -> List[Any]:
+        """
+        Decode the record at a byte offset.
+
+        Raises:
+            ValueError: If the record is truncated or fails its checksum
+        """
+        return self._read(offset)[0]
+
+    def question(self, number: int) -> Question:
+        """Decode the question with the given number"""
+        return decode_question(self.record(self.question_offsets[number])[1])
+
+    @property
+    def question_offsets(self) -> List[int]:
+        """Byte offset of each question record, by question number"""
+        return self._read_question_index()[0]
+
+    @property
+    def question_ids(self) -> List[str]:
+        """Content ID of each question, by question number"""
+        return self._read_question_index()[1]
+
+    @property
+    def pinned_questions(self) -> List[int]:
+        """Numbers of the questions added to the question bank directly"""
+        return self._read_question_index()[2]
+
+    def _read_question_index(self) -> Tuple[List[int], List[str], List[int]]:
+        """Decode the question index the first time it is needed"""
+        if self._question_index is None:
+            with self._lock:
+                if self._question_index is None:
+                    _, offsets, ids, pinned = self.record(self._question_index_offset)
+                    self._question_index = (offsets, ids, pinned)
+        return self._question_index
+
+    @property
+    def size(self) -> int:
+        """Size of the mapped file in bytes"""
+        return len(self._map)
+
+    def _read(self, offset: int) -> Tuple[List[Any], int]:
+        """Decode the record at offset and return it with the offset after it"""
+        end = offset + RECORD_HEADER.size
+        if end > len(self._map):
+            raise ValueError(f"Truncated quiz snapshot: {self.path}")
+        length, checksum = RECORD_HEADER.unpack_from(self._map, offset)
+        stop = end + length
+        payload = self._map[end:stop]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            raise ValueError(f"Corrupt quiz snapshot: {self.path}")
+        return json.loads(payload), stop
+
+    def _read_index(self) -> None:
+        """Read the index through the end record"""
+        if len(self._map) < END_RECORD_SIZE:
+            raise ValueError(f"Truncated quiz snapshot: {self.path}")
+        end = self.record(len(self._map) - END_RECORD_SIZE)
+        if end[0] != "end":
+            raise ValueError(f"Truncated quiz snapshot: {self.path}")
+        _, self._question_index_offset, self.question_count, quizzes, attempts = self.record(
+            int(end[1])
+        )
+        self.quizzes = [QuizHeader(*entry) for entry in quizzes]
+        self.attempts = [AttemptHeader(*entry) for entry in attempts]
+
+    def close(self) -> None:
+        """Unmap the file"""
+        self._map.close()
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"Snapshot(path='{self.path}', quizzes={len(self.quizzes)})"
+
+
+_MISSING = object()
+
+
+class DeferredDict(dict):
+    """
+    A dict whose values for some keys are loaded on first access.
+
+    ``defer(key, token)`` registers a key whose value ``load(key, token)``
+    builds when the key is first read. Deferred keys behave as present for
+    ``in``, ``len``, ``get``, indexing, ``pop`` and deletion; ``values`` and
+    ``items`` load everything first. Plain reads of loaded keys cost one
+    extra Python call over a dict.
+
+    Loading is serialized by a lock, so each value is built once even when
+    several threads ask for it together.
+    """
+
+    def __init__(self, load: Callable[[str, Any], Any]) -> None:
+        super().__init__()
+        self._load = load
+        self._deferred: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def defer(self, key: str, token: Any) -> None:
+        """Register a key whose value is loaded from token on first access"""
+        self._deferred[key] = token
+
+    def deferred_token(self, key: str) -> Any:
+        """Return the token of a key that is not loaded yet, or None"""
+        return self._deferred.get(key)
+
+    def deferred_tokens(self) -> List[Any]:
+        """Return the tokens of every key that is not loaded yet"""
+        return list(self._deferred.values())
+
+    def loaded_values(self) -> List[Any]:
+        """Return the values loaded so far, without loading any"""
+        return list(dict.values(self))
+
+    def load_all(self) -> None:
+        """Load every deferred value"""
+        for key in list(self._deferred):
+            self._materialize(key)
+
+    def _materialize(self, key: str) -> Any:
+        """Load a deferred value, or return _MISSING if the key is not deferred"""
+        with self._lock:
+            value = dict.get(self, key, _MISSING)
+            if value is not _MISSING:
+                return value  # Loaded by another thread meanwhile
+            token = self._deferred.get(key, _MISSING)
+            if token is _MISSING:
+                return _MISSING
+            value = self._load(key, token)
+            dict.__setitem__(self, key, value)
+            del self._deferred[key]
+            return value
+
+    def get(self, key: str, default: Any = None) -> Any:  # type: ignore[override]
+        value = dict.get(self, key, _MISSING)
+        if value is _MISSING and self._deferred:
+            value = self._materialize(key)
+        return default if value is _MISSING else value
+
+    def __missing__(self, key: str) -> Any:
+        value = self._materialize(key) if self._deferred else _MISSING
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if self._deferred:
+            with self._lock:
+                self._deferred.pop(key, None)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key: str) -> None:
+        with self._lock:
+            if self._deferred.pop(key, _MISSING) is _MISSING:
+                dict.__delitem__(self, key)
+
+    def pop(self, key: str, default: Any = _MISSING) -> Any:  # type: ignore[override]
+        if self._deferred:
+            self._materialize(key)
+        if default is _MISSING:
+            return dict.pop(self, key)
+        return dict.pop(self, key, default)
+
+    def __contains__(self, key: object) -> bool:
+        return dict.__contains__(self, key) or key in self._deferred
+
+    def __len__(self) -> int:
+        return dict.__len__(self) + len(self._deferred)
+
+    def __iter__(self) -> Iterator[str]:
+        self.load_all()
+        return dict.__iter__(self)
+
+    def values(self) -> Any:
+        self.load_all()
+        return dict.values(self)
+
+    def items(self) -> Any:
+        self.load_all()
+        return dict.items(self)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._deferred.clear()
+            dict.clear(self)
@@ -0,0 +1,732 @@
+import json
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.question_bank import question_id as content_id
+from src.quiz import Quiz
+from src.shuffle import AttemptOrder, new_seed
+from src.metrics import timed
+from src.storage import AttemptClosedError, QuizStorage, QuizSummary, VersionConflictError
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS quizzes (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL,
+    time_limit_seconds REAL,
+    start_time REAL,
+    question_count INTEGER NOT NULL DEFAULT 0,
+    version INTEGER NOT NULL DEFAULT 1
+);
+
+-- A question is in the bank while it is pinned (added to the bank itself) or a
+-- quiz uses it; rows only attempts still use are kept but do not resolve
+CREATE TABLE IF NOT EXISTS bank_questions (
+    id TEXT PRIMARY KEY,
+    text TEXT NOT NULL,
+    options TEXT NOT NULL,
+    correct_answer TEXT NOT NULL,
+    difficulty TEXT NOT NULL,
+    category TEXT,
+    pinned INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_bank_questions_category ON bank_questions(category);
+CREATE INDEX IF NOT EXISTS idx_bank_questions_difficulty ON bank_questions(difficulty);
+
+CREATE TABLE IF NOT EXISTS quiz_questions (
+    quiz_id TEXT NOT NULL REFERENCES quizzes(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL REFERENCES bank_questions(id),
+    PRIMARY KEY (quiz_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_quiz_questions_question ON quiz_questions(question_id);
+
+CREATE TABLE IF NOT EXISTS quiz_answers (
+    quiz_id TEXT NOT NULL REFERENCES quizzes(id) ON DELETE CASCADE,
+    question_index INTEGER NOT NULL,
+    answer TEXT NOT NULL,
+    PRIMARY KEY (quiz_id, question_index)
+);
+
+-- An attempt keeps the quiz as it was when the attempt started, so later edits
+-- to the quiz do not change it
+CREATE TABLE IF NOT EXISTS attempts (
+    id TEXT PRIMARY KEY,
+    quiz_id TEXT NOT NULL REFERENCES quizzes(id) ON DELETE CASCADE,
+    start_time REAL NOT NULL,
+    seed INTEGER,
+    title TEXT NOT NULL,
+    time_limit_seconds REAL,
+    question_count INTEGER NOT NULL,
+    version INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_attempts_quiz ON attempts(quiz_id);
+
+CREATE TABLE IF NOT EXISTS attempt_questions (
+    attempt_id TEXT NOT NULL REFERENCES attempts(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    question_id TEXT NOT NULL REFERENCES bank_questions(id),
+    PRIMARY KEY (attempt_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_attempt_questions_question ON attempt_questions(question_id);
+
+CREATE TABLE IF NOT EXISTS attempt_answers (
+    attempt_id TEXT NOT NULL REFERENCES attempts(id) ON DELETE CASCADE,
+    question_index INTEGER NOT NULL,
+    answer TEXT NOT NULL,
+    PRIMARY KEY (attempt_id, question_index)
+);
+"""
+
+# Parameterised statements are compiled once and reused from sqlite3's statement cache
+INSERT_QUIZ = (
+    "INSERT INTO quizzes (id, title, time_limit_seconds, start_time, question_count)"
+    " VALUES (?, ?, ?, ?, ?)"
+)
+UPDATE_QUIZ = (
+    "UPDATE quizzes SET title = ?, time_limit_seconds = ?, start_time = ?, question_count = ?,"
+    " version = version + 1 WHERE id = ?"
+)
+SELECT_VERSION = "SELECT version FROM quizzes WHERE id = ?"
+SELECT_QUIZ = "SELECT id, title, time_limit_seconds, start_time, version FROM quizzes WHERE id = ?"
+SELECT_ALL_QUIZZES = (
+    "SELECT id, title, time_limit_seconds, start_time, version FROM quizzes ORDER BY seq"
+)
+SELECT_SUMMARIES = (
+    "SELECT seq, id, title, time_limit_seconds, question_count FROM quizzes"
+    " WHERE seq > ? ORDER BY seq LIMIT ?"
+)
+DELETE_QUIZ = "DELETE FROM quizzes WHERE id = ?"
+COUNT_QUIZZES = "SELECT COUNT(*) FROM quizzes"
+# Bank rows a lookup resolves: pinned ones and those a quiz uses
+IN_BANK = "(b.pinned OR EXISTS (SELECT 1 FROM quiz_questions q WHERE q.question_id = b.id))"
+SELECT_STATS = (
+    "SELECT (SELECT COUNT(*) FROM quizzes), (SELECT COUNT(*) FROM quiz_questions),"
+    f" (SELECT COUNT(*) FROM bank_questions b WHERE {IN_BANK}), (SELECT COUNT(*) FROM attempts)"
+)
+INSERT_BANK_QUESTION = (
+    "INSERT OR IGNORE INTO bank_questions"
+    " (id, text, options, correct_answer, difficulty, category) VALUES (?, ?, ?, ?, ?, ?)"
+)
+PIN_BANK_QUESTION = "UPDATE bank_questions SET pinned = 1 WHERE id = ?"
+SELECT_BANK_QUESTION = (
+    "SELECT id, text, options, correct_answer, difficulty, category FROM bank_questions b"
+    f" WHERE id = ? AND {IN_BANK}"
+)
+SELECT_USED_QUESTIONS = (
+    "SELECT question_id FROM quiz_questions WHERE quiz_id = ?1 UNION SELECT q.question_id"
+    " FROM attempt_questions q JOIN attempts a ON a.id = q.attempt_id WHERE a.quiz_id = ?1"
+)
+# Removes a bank row once nothing refers to it
+DELETE_UNUSED_BANK_QUESTION = (
+    "DELETE FROM bank_questions WHERE id = ?1 AND NOT pinned"
+    " AND NOT EXISTS (SELECT 1 FROM quiz_questions WHERE question_id = ?1)"
+    " AND NOT EXISTS (SELECT 1 FROM attempt_questions WHERE question_id = ?1)"
+)
+INSERT_QUIZ_QUESTION = (
+    "INSERT INTO quiz_questions (quiz_id, position, question_id) VALUES (?, ?, ?)"
+)
+SELECT_QUESTIONS = (
+    "SELECT b.id, b.text, b.options, b.correct_answer, b.difficulty, b.category"
+    " FROM quiz_questions q JOIN bank_questions b ON b.id = q.question_id"
+    " WHERE q.quiz_id = ? ORDER BY q.position"
+)
+DELETE_QUESTIONS = "DELETE FROM quiz_questions WHERE quiz_id = ?"
+INSERT_QUIZ_ANSWER = "INSERT INTO quiz_answers (quiz_id, question_index, answer) VALUES (?, ?, ?)"
+SELECT_QUIZ_ANSWERS = "SELECT question_index, answer FROM quiz_answers WHERE quiz_id = ?"
+DELETE_QUIZ_ANSWERS = "DELETE FROM quiz_answers WHERE quiz_id = ?"
+INSERT_ATTEMPT = (
+    "INSERT INTO attempts (id, quiz_id, start_time, seed, title, time_limit_seconds,"
+    " question_count, version) SELECT ?, id, ?, ?, title, time_limit_seconds, question_count,"
+    " version FROM quizzes WHERE id = ?"
+)
+INSERT_ATTEMPT_QUESTIONS = (
+    "INSERT INTO attempt_questions (attempt_id, position, question_id)"
+    " SELECT ?, position, question_id FROM quiz_questions WHERE quiz_id = ?"
+)
+SELECT_ATTEMPT = (
+    "SELECT quiz_id, start_time, seed, title, time_limit_seconds, version FROM attempts"
+    " WHERE id = ?"
+)
+SELECT_ATTEMPT_QUESTIONS = (
+    "SELECT b.id, b.text, b.options, b.correct_answer, b.difficulty, b.category"
+    " FROM attempt_questions q JOIN bank_questions b ON b.id = q.question_id"
+    " WHERE q.attempt_id = ? ORDER BY q.position"
+)
+SELECT_ATTEMPT_QUESTION = (
+    "SELECT b.correct_answer, b.options, a.start_time, a.time_limit_seconds, a.seed,"
+    " a.question_count FROM attempts a JOIN attempt_questions q ON q.attempt_id = a.id"
+    " JOIN bank_questions b ON b.id = q.question_id WHERE a.id = ? AND q.position = ?"
+)
+SELECT_ATTEMPT_LIMITS = (
+    "SELECT question_count, start_time, time_limit_seconds, seed FROM attempts WHERE id = ?"
+)
+SELECT_CORRECT_ANSWER = (
+    "SELECT b.correct_answer, b.options FROM attempt_questions q"
+    " JOIN bank_questions b ON b.id = q.question_id WHERE q.attempt_id = ? AND q.position = ?"
+)
+UPSERT_ATTEMPT_ANSWER = (
+    "INSERT OR REPLACE INTO attempt_answers (attempt_id, question_index, answer) VALUES (?, ?, ?)"
+)
+SELECT_ATTEMPT_ANSWERS = "SELECT question_index, answer FROM attempt_answers WHERE attempt_id = ?"
+
+QuizRow = Tuple[str, str, Optional[float], Optional[float], int]
+BankQuestionRow = Tuple[str, str, str, str, str, Optional[str]]
+
+
+class SQLiteQuizDatabase(QuizStorage):
+    """
+    SQLite database for storing and managing quizzes.
+
+    Provides the same operations as QuizDatabase, but data is kept in a
+    SQLite file and survives restarts. Quizzes, questions, answers and
+    attempts live in separate tables; the database runs in WAL mode so
+    readers never wait for a writer. Question content is stored once per
+    unique question in the bank_questions table, and quizzes refer to it by
+    content ID; a row is deleted once no quiz or attempt uses it, unless it
+    was added to the bank itself. An attempt copies the quiz's title, time
+    limit and question links when it starts, so later edits to the quiz
+    never change it.
+
+    Several processes (e.g. uvicorn workers) can open the same file and see
+    one consistent database: reads run in a transaction so they see a single
+    snapshot, and writes take SQLite's write lock up front, waiting up to
+    ``timeout`` seconds for other writers instead of failing.
+    """
+
+    def __init__(self, path: str = "quizzes.db", timeout: float = 30.0) -> None:
+        """
+        Open (or create) a SQLite database.
+
+        Args:
+            path: Database file, or ":memory:" for a private in-memory database
+            timeout: Seconds to wait for another process holding the write lock
+        """
+        self.path = path
+        self._lock = threading.RLock()
+        # Autocommit mode: transactions are opened explicitly by _transaction()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute("PRAGMA foreign_keys=ON")
+        self._connection.executescript(SCHEMA)
+
+    @timed("add_quiz")
+    def add_quiz(self, quiz: Quiz) -> str:
+        """
+        Create - Add a new quiz to the database.
+
+        Args:
+            quiz: The Quiz object to store
+
+        Returns:
+            str: Unique ID assigned to the quiz
+        """
+        quiz_id = str(uuid.uuid4())
+        with self._transaction(write=True):
+            self._insert_quiz(quiz_id, quiz)
+        return quiz_id
+
+    @timed("add_quizzes")
+    def add_quizzes(self, quizzes: Iterable[Quiz]) -> List[str]:
+        """
+        Create - Add several new quizzes in a single transaction.
+
+        Args:
+            quizzes: The Quiz objects to store
+
+        Returns:
+            List[str]: Unique IDs assigned to the quizzes, in order
+        """
+        quiz_ids = []
+        with self._transaction(write=True):
+            for quiz in quizzes:
+                quiz_id = str(uuid.uuid4())
+                self._insert_quiz(quiz_id, quiz)
+                quiz_ids.append(quiz_id)
+        return quiz_ids
+
+    @timed("get_quiz")
+    def get_quiz(self, quiz_id: str) -> Optional[Quiz]:
+        """
+        Read - Retrieve a quiz from the database by ID.
+
+        Args:
+            quiz_id: The unique identifier of the quiz
+
+        Returns:
+            Quiz object if found, None otherwise
+        """
+        with self._transaction():
+            row = self._connection.execute(SELECT_QUIZ, (quiz_id,)).fetchone()
+            if row is None:
+                return None
+            return self._load_quiz(row)
+
+    @timed("get_quiz_version")
+    def get_quiz_version(self, quiz_id: str) -> Optional[int]:
+        """
+        Read the version of a quiz without loading its questions.
+
+        Args:
+            quiz_id: The unique identifier of the quiz
+
+        Returns:
+            int: The stored version, or None if quiz not found
+        """
+        with self._lock:
+            row = self._connection.execute(SELECT_VERSION, (quiz_id,)).fetchone()
+        return None if row is None else int(row[0])
+
+    @timed("update_quiz")
+    def update_quiz(self, quiz_id: str, quiz: Quiz, expected_version: Optional[int] = None) -> bool:
+        """
+        Update - Modify an existing quiz in the database.
+
+        Args:
+            quiz_id: The unique identifier of the quiz to update
+            quiz: The updated Quiz object
+            expected_version: If given, only update if the stored quiz is at this version
+
+        Returns:
+            bool: True if update successful, False if quiz not found
+
+        Raises:
+            VersionConflictError: If the stored quiz is not at expected_version
+        """
+        with self._transaction(write=True):
+            row = self._connection.execute(SELECT_VERSION, (quiz_id,)).fetchone()
+            if row is None:
+                return False
+            if expected_version is not None and row[0] != expected_version:
+                raise VersionConflictError(quiz_id, expected_version, row[0])
+            self._connection.execute(
+                UPDATE_QUIZ,
+                (
+                    quiz.title,
+                    quiz.time_limit_seconds,
+                    quiz.start_time,
+                    len(quiz.questions),
+                    quiz_id,
+                ),
+            )
+            replaced = self._connection.execute(SELECT_USED_QUESTIONS, (quiz_id,)).fetchall()
+            self._connection.execute(DELETE_QUESTIONS, (quiz_id,))
+            self._connection.execute(DELETE_QUIZ_ANSWERS, (quiz_id,))
+            self._insert_quiz_contents(quiz_id, quiz)
+            self._connection.executemany(DELETE_UNUSED_BANK_QUESTION, replaced)
+        return True
+
+    @timed("delete_quiz")
+    def delete_quiz(self, quiz_id: str) -> bool:
+        """
+        Delete - Remove a quiz, its questions, answers and attempts.
+
+        Args:
+            quiz_id: The unique identifier of the quiz to delete
+
+        Returns:
+            bool: True if deletion successful, False if quiz not found
+        """
+        with self._transaction(write=True):
+            used = self._connection.execute(SELECT_USED_QUESTIONS, (quiz_id,)).fetchall()
+            cursor = self._connection.execute(DELETE_QUIZ, (quiz_id,))
+            self._connection.executemany(DELETE_UNUSED_BANK_QUESTION, used)
+        return cursor.rowcount > 0
+
+    @timed("list_quizzes")
+    def list_quizzes(self) -> List[Quiz]:
+        """
+        List all quizzes in the database.
+
+        Returns:
+            List of all Quiz objects
+        """
+        with self._transaction():
+            rows = self._connection.execute(SELECT_ALL_QUIZZES).fetchall()
+            return [self._load_quiz(row) for row in rows]
+
+    @timed("list_quiz_summaries")
+    def list_quiz_summaries(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Tuple[List[QuizSummary], Optional[str]]:
+        """
+        List one page of quiz summaries from the quizzes table alone.
+
+        Args:
+            limit: Maximum number of summaries to return (None for all)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            The page of summaries, and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is not valid
+        """
+        after = 0 if cursor is None else int(cursor)
+        # Fetch one extra row to know whether another page follows; -1 means no limit
+        with self._lock:
+            rows = self._connection.execute(
+                SELECT_SUMMARIES, (after, -1 if limit is None else limit + 1)
+            ).fetchall()
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor: Optional[str] = str(rows[-1][0])
+        else:
+            next_cursor = None
+        return [QuizSummary(*row[1:]) for row in rows], next_cursor
+
+    @timed("start_attempt")
+    def start_attempt(self, quiz_id: str, shuffle: bool = False) -> Optional[str]:
+        """
+        Start a new attempt at a quiz.
+
+        Args:
+            quiz_id: The unique identifier of the quiz to attempt
+            shuffle: Whether the attempt presents questions and options in its own order
+
+        Returns:
+            str: Unique ID assigned to the attempt, or None if quiz not found
+        """
+        attempt_id = str(uuid.uuid4())
+        seed = new_seed() if shuffle else None
+        with self._transaction(write=True):
+            cursor = self._connection.execute(
+                INSERT_ATTEMPT, (attempt_id, time.time(), seed, quiz_id)
+            )
+            if cursor.rowcount == 0:
+                return None
+            # Pin the questions, so later edits to the quiz do not change the attempt
+            self._connection.execute(INSERT_ATTEMPT_QUESTIONS, (attempt_id, quiz_id))
+        return attempt_id
+
+    @timed("get_attempt")
+    def get_attempt(self, attempt_id: str) -> Optional[QuizAttempt]:
+        """
+        Retrieve an attempt by ID.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+
+        Returns:
+            QuizAttempt object if found, None otherwise
+        """
+        with self._transaction():
+            row = self._connection.execute(SELECT_ATTEMPT, (attempt_id,)).fetchone()
+            if row is None:
+                return None
+            quiz_id, start_time, seed, title, time_limit_seconds, version = row
+            quiz = Quiz(title=title, time_limit_seconds=time_limit_seconds, quiz_id=quiz_id)
+            quiz.version = version
+            quiz.add_questions(
+                self._bank_question(question_row)
+                for question_row in self._connection.execute(
+                    SELECT_ATTEMPT_QUESTIONS, (attempt_id,)
+                )
+            )
+            answers = self._connection.execute(SELECT_ATTEMPT_ANSWERS, (attempt_id,)).fetchall()
+        attempt = QuizAttempt(quiz, attempt_id, start_time=start_time, seed=seed)
+        for question_index, answer in answers:
+            attempt.submit_answer(question_index, answer)
+        return attempt
+
+    @timed("submit_attempt_answer")
+    def submit_attempt_answer(
+        self, attempt_id: str, question_index: int, answer: Union[str, int]
+    ) -> bool:
+        """
+        Record an answer on an attempt with a single indexed lookup and write.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+            question_index: Index of the answered question
+            answer: The submitted answer text, or an option index
+
+        Returns:
+            bool: True if the answer is correct
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If the question index is out of range
+            ValueError: If an option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+        with self._transaction(write=True):
+            row = self._connection.execute(
+                SELECT_ATTEMPT_QUESTION, (attempt_id, question_index)
+            ).fetchone()
+            if row is None:
+                if self._connection.execute(SELECT_ATTEMPT, (attempt_id,)).fetchone() is None:
+                    raise KeyError(attempt_id)
+                raise IndexError("Invalid question index")
+            correct_answer, options_json, start_time, time_limit_seconds, seed = row[:5]
+            self._check_open(attempt_id, start_time, time_limit_seconds)
+            order = None
+            if seed is not None:
+                # The position was looked up as an index; look up the question shown there
+                order = AttemptOrder(seed, row[5])
+                question_index = order.question_index(question_index)
+                correct_answer, options_json = self._connection.execute(
+                    SELECT_CORRECT_ANSWER, (attempt_id, question_index)
+                ).fetchone()
+            text, is_correct = self._resolve_answer(
+                answer, correct_answer, options_json, order, question_index
+            )
+            self._connection.execute(UPSERT_ATTEMPT_ANSWER, (attempt_id, question_index, text))
+        return is_correct
+
+    @timed("submit_attempt_answers")
+    def submit_attempt_answers(
+        self, attempt_id: str, answers: Sequence[Tuple[int, Union[str, int]]]
+    ) -> List[bool]:
+        """
+        Record several answers on an attempt in a single transaction.
+
+        Args:
+            attempt_id: The unique identifier of the attempt
+            answers: (question index, answer text or option index) pairs, applied in order
+
+        Returns:
+            List[bool]: Whether each answer is correct, in order
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If any question index is out of range (nothing is recorded)
+            ValueError: If any option index is invalid (nothing is recorded)
+            AttemptClosedError: If the attempt's time limit has run out (nothing is recorded)
+        """
+        with self._transaction(write=True):
+            row = self._connection.execute(SELECT_ATTEMPT_LIMITS, (attempt_id,)).fetchone()
+            if row is None:
+                raise KeyError(attempt_id)
+            question_count, start_time, time_limit_seconds, seed = row
+            self._check_open(attempt_id, start_time, time_limit_seconds)
+            if any(not 0 <= index < question_count for index, _ in answers):
+                raise IndexError("Invalid question index")
+            order = None if seed is None else AttemptOrder(seed, question_count)
+            if order is not None:
+                answers = [(order.question_index(index), answer) for index, answer in answers]
+            resolved = [
+                self._resolve_answer(
+                    answer,
+                    *self._connection.execute(
+                        SELECT_CORRECT_ANSWER, (attempt_id, index)
+                    ).fetchone(),
+                    order,
+                    index,
+                )
+                for index, answer in answers
+            ]
+            self._connection.executemany(
+                UPSERT_ATTEMPT_ANSWER,
+                ((attempt_id, index, text) for (index, _), (text, _) in zip(answers, resolved)),
+            )
+        return [is_correct for _, is_correct in resolved]
+
+    @staticmethod
+    def _check_open(
+        attempt_id: str, start_time: float, time_limit_seconds: Optional[float]
+    ) -> None:
+        """
+        Reject answers to an attempt whose time limit has run out.
+
+        Uses the wall clock, because the attempt may have been started by
+        another process whose monotonic clock is not comparable.
+        """
+        if time_limit_seconds is not None and time.time() >= start_time + time_limit_seconds:
+            raise AttemptClosedError(attempt_id)
+
+    @staticmethod
+    def _resolve_answer(
+        answer: Union[str, int],
+        correct_answer: str,
+        options_json: str,
+        order: Optional[AttemptOrder] = None,
+        question_index: int = 0,
+    ) -> Tuple[str, bool]:
+        """
+        Return the answer text to store and whether it is correct.
+
+        Options are only decoded for option-index answers. For a shuffled
+        attempt, the option index is a position in the attempt's option order
+        for the question at question_index.
+        """
+        if not isinstance(answer, int):
+            return answer, answer == correct_answer
+        options = json.loads(options_json)
+        if not 0 <= answer < len(options):
+            raise ValueError("Invalid option index")
+        if order is not None:
+            answer = order.options(question_index, len(options))[answer]
+        return options[answer], options[answer] == correct_answer
+
+    def get_stats(self) -> Dict[str, int]:
+        """Return object counts and the size of the database file in bytes"""
+        with self._transaction():
+            quizzes, questions, bank_questions, attempts = self._connection.execute(
+                SELECT_STATS
+            ).fetchone()
+            page_count = self._connection.execute("PRAGMA page_count").fetchone()[0]
+            page_size = self._connection.execute("PRAGMA page_size").fetchone()[0]
+        return {
+            "quizzes": quizzes,
+            "questions": questions,
+            "bank_questions": bank_questions,
+            "attempts": attempts,
+            "bytes": page_count * page_size,
+        }
+
+    @timed("add_bank_questions")
+    def add_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """
+        Store questions in the question bank, where they stay until it is cleared.
+
+        Args:
+            questions: The questions to store
+
+        Returns:
+            List[str]: Content IDs of the questions, in order
+        """
+        with self._transaction(write=True):
+            question_ids = self._insert_bank_questions(questions)
+            self._connection.executemany(
+                PIN_BANK_QUESTION, ((question_id,) for question_id in question_ids)
+            )
+        return question_ids
+
+    @timed("get_bank_questions")
+    def get_bank_questions(self, question_ids: Sequence[str]) -> List[Question]:
+        """
+        Read questions from the question bank.
+
+        Args:
+            question_ids: Content IDs of the questions
+
+        Returns:
+            List[Question]: The questions, in order
+
+        Raises:
+            KeyError: If any ID is not in the bank
+        """
+        questions = []
+        with self._transaction():
+            for question_id in question_ids:
+                row = self._connection.execute(SELECT_BANK_QUESTION, (question_id,)).fetchone()
+                if row is None:
+                    raise KeyError(question_id)
+                questions.append(self._bank_question(row))
+        return questions
+
+    def clear(self) -> None:
+        """Remove all quizzes, attempts and bank questions from the database"""
+        with self._transaction(write=True):
+            self._connection.execute("DELETE FROM quizzes")
+            self._connection.execute("DELETE FROM bank_questions")
+
+    def close(self) -> None:
+        """Close the underlying SQLite connection"""
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def _transaction(self, write: bool = False) -> Iterator[None]:
+        """
+        Run a block in one SQLite transaction, holding the connection lock.
+
+        Write transactions use BEGIN IMMEDIATE so the write lock is taken
+        before any read, which avoids lock-upgrade failures between processes.
+        """
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            try:
+                yield
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+            self._connection.execute("COMMIT")
+
+    def _insert_quiz(self, quiz_id: str, quiz: Quiz) -> None:
+        """Insert a quiz row with its questions and answers (inside an open transaction)"""
+        self._connection.execute(
+            INSERT_QUIZ,
+            (quiz_id, quiz.title, quiz.time_limit_seconds, quiz.start_time, len(quiz.questions)),
+        )
+        self._insert_quiz_contents(quiz_id, quiz)
+
+    def _insert_quiz_contents(self, quiz_id: str, quiz: Quiz) -> None:
+        """Insert the questions and answers of a quiz (inside an open transaction)"""
+        question_ids = self._insert_bank_questions(quiz.questions)
+        self._connection.executemany(
+            INSERT_QUIZ_QUESTION,
+            ((quiz_id, position, question_id) for position, question_id in enumerate(question_ids)),
+        )
+        self._connection.executemany(
+            INSERT_QUIZ_ANSWER,
+            ((quiz_id, index, answer) for index, answer in quiz.answers.items()),
+        )
+
+    def _insert_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """Insert questions into the bank unless present and return their IDs (in a transaction)"""
+        questions = list(questions)
+        question_ids = [content_id(question) for question in questions]
+        self._connection.executemany(
+            INSERT_BANK_QUESTION,
+            (
+                (
+                    new_id,
+                    q.text,
+                    json.dumps(q.options),
+                    q.correct_answer,
+                    q.difficulty,
+                    q.category,
+                )
+                for new_id, q in zip(question_ids, questions)
+            ),
+        )
+        return question_ids
+
+    def _load_quiz(self, row: QuizRow) -> Quiz:
+        """Build a Quiz object from its row, questions and answers"""
+        quiz_id, title, time_limit_seconds, start_time, version = row
+        quiz = Quiz(title=title, time_limit_seconds=time_limit_seconds, quiz_id=quiz_id)
+        quiz.version = version
+        quiz.add_questions(self._load_questions(quiz_id))
+        answers: Dict[int, str] = dict(
+            self._connection.execute(SELECT_QUIZ_ANSWERS, (quiz_id,)).fetchall()
+        )
+        for question_index, answer in answers.items():
+            quiz.submit_answer(question_index, answer)
+        quiz.start_time = start_time
+        return quiz
+
+    def _load_questions(self, quiz_id: str) -> Iterable[Question]:
+        """Yield the questions of a quiz in order"""
+        for row in self._connection.execute(SELECT_QUESTIONS, (quiz_id,)):
+            yield self._bank_question(row)
+
+    @staticmethod
+    def _bank_question(row: BankQuestionRow) -> Question:
+        """
+        Build a Question from its bank row.
+
+        Rows are decoded on every read rather than cached, so the memory a
+        process uses does not grow with the size of the database.
+        """
+        _, text, options, correct_answer, difficulty, category = row
+        return Question(text, json.loads(options), correct_answer, difficulty, category)
+
+    def __len__(self) -> int:
+        """Return the number of quizzes in the database"""
+        with self._lock:
+            return int(self._connection.execute(COUNT_QUIZZES).fetchone()[0])
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"SQLiteQuizDatabase(path='{self.path}', quizzes={len(self)})"
@@ -0,0 +1,279 @@
+"""
+Storage backend interface for quizzes and attempts.
+
+``QuizDatabase`` (in memory) and ``SQLiteQuizDatabase`` (on disk) both
+implement ``QuizStorage``; use ``create_database`` to pick one by name.
+"""
+
+from abc import ABC, abstractmethod
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.quiz import Quiz
+
+
+class VersionConflictError(Exception):
+    """Raised when a quiz was changed by someone else since it was read"""
+
+    def __init__(self, quiz_id: str, expected_version: int, actual_version: int) -> None:
+        super().__init__(
+            f"Quiz {quiz_id} is at version {actual_version}, expected {expected_version}"
+        )
+        self.quiz_id = quiz_id
+        self.expected_version = expected_version
+        self.actual_version = actual_version
+
+
+class AttemptClosedError(Exception):
+    """Raised when an answer is submitted to an attempt whose time limit has run out"""
+
+    def __init__(self, attempt_id: str) -> None:
+        super().__init__(f"Attempt {attempt_id} is closed: its time limit has run out")
+        self.attempt_id = attempt_id
+
+
+class QuizSummary(NamedTuple):
+    """Summary fields of a stored quiz, available without loading its questions"""
+
+    quiz_id: str
+    title: str
+    time_limit_seconds: Optional[float]
+    question_count: int
+
+
+class QuizStorage(ABC):
+    """
+    Interface implemented by every quiz storage backend.
+
+    Quizzes and attempts returned by a backend are always copies: modifying
+    them never changes stored data until they are written back. Every stored
+    quiz carries a version number, starting at 1 and incremented by each
+    update, so writers can detect concurrent changes.
+
+    Questions are kept once per unique content in a question bank shared by
+    all quizzes; quizzes can be built from bank questions by content ID.
+
+    Backends must be safe to use from several threads at once.
+    """
+
+    # Operations cheap enough to call on an event loop; AsyncQuizStorage runs
+    # every other operation in a worker thread
+    inline_operations: FrozenSet[str] = frozenset()
+
+    def runs_inline(self, operation: str, *args: Any) -> bool:
+        """Whether a call to an operation with these arguments is cheap enough for an event loop"""
+        return operation in self.inline_operations
+
+    @abstractmethod
+    def add_quiz(self, quiz: Quiz) -> str:
+        """Store a new quiz and return its generated ID"""
+
+    def add_quizzes(self, quizzes: Iterable[Quiz]) -> List[str]:
+        """
+        Store several new quizzes and return their generated IDs, in order.
+
+        Backends override this to insert the whole batch in one write.
+        """
+        return [self.add_quiz(quiz) for quiz in quizzes]
+
+    @abstractmethod
+    def get_quiz(self, quiz_id: str) -> Optional[Quiz]:
+        """Return the quiz with the given ID, or None if not found"""
+
+    def get_quiz_version(self, quiz_id: str) -> Optional[int]:
+        """Return the version of a stored quiz, or None if not found"""
+        quiz = self.get_quiz(quiz_id)
+        return None if quiz is None else quiz.version
+
+    @abstractmethod
+    def update_quiz(self, quiz_id: str, quiz: Quiz, expected_version: Optional[int] = None) -> bool:
+        """
+        Replace a stored quiz, returning False if it does not exist.
+
+        Raises:
+            VersionConflictError: If expected_version is given and does not match
+        """
+
+    @abstractmethod
+    def delete_quiz(self, quiz_id: str) -> bool:
+        """Delete a quiz and its attempts, returning False if it does not exist"""
+
+    @abstractmethod
+    def list_quizzes(self) -> List[Quiz]:
+        """Return all stored quizzes"""
+
+    @abstractmethod
+    def list_quiz_summaries(
+        self, limit: Optional[int] = None, cursor: Optional[str] = None
+    ) -> Tuple[List[QuizSummary], Optional[str]]:
+        """
+        Return one page of quiz summaries in insertion order.
+
+        Args:
+            limit: Maximum number of summaries to return (None for all)
+            cursor: Opaque cursor returned with the previous page
+
+        Returns:
+            The page of summaries, and the cursor for the next page (None on the last page)
+
+        Raises:
+            ValueError: If the cursor is not valid
+        """
+
+    def iter_quizzes(self, page_size: int = 100) -> Iterator[Quiz]:
+        """
+        Yield every stored quiz in insertion order, one page at a time.
+
+        Only one page of summaries is held at once, so memory use does not
+        grow with the size of the store.
+        """
+        cursor: Optional[str] = None
+        while True:
+            summaries, cursor = self.list_quiz_summaries(limit=page_size, cursor=cursor)
+            for summary in summaries:
+                quiz = self.get_quiz(summary.quiz_id)
+                if quiz is not None:
+                    yield quiz
+            if cursor is None:
+                return
+
+    @abstractmethod
+    def start_attempt(self, quiz_id: str, shuffle: bool = False) -> Optional[str]:
+        """
+        Start an attempt at a quiz and return its ID, or None if quiz not found.
+
+        A shuffled attempt gets a random seed that fixes the order in which
+        it presents questions and options (see QuizAttempt.order).
+        """
+
+    @abstractmethod
+    def get_attempt(self, attempt_id: str) -> Optional[QuizAttempt]:
+        """Return the attempt with the given ID, or None if not found"""
+
+    @abstractmethod
+    def submit_attempt_answer(
+        self, attempt_id: str, question_index: int, answer: Union[str, int]
+    ) -> bool:
+        """
+        Record an answer on an attempt and return whether it is correct.
+
+        An int answer is the index of one of the question's options. For a
+        shuffled attempt, the question index and option index are positions
+        in the attempt's presented order.
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If the question index is out of range
+            ValueError: If an option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+
+    @abstractmethod
+    def submit_attempt_answers(
+        self, attempt_id: str, answers: Sequence[Tuple[int, Union[str, int]]]
+    ) -> List[bool]:
+        """
+        Record several (question index, answer) pairs on an attempt in one write.
+
+        Either every answer is recorded or none is. Answers may be text or
+        option indices, as for submit_attempt_answer.
+
+        Returns:
+            List[bool]: Whether each answer is correct, in order
+
+        Raises:
+            KeyError: If the attempt does not exist
+            IndexError: If any question index is out of range
+            ValueError: If any option index does not refer to an option
+            AttemptClosedError: If the attempt's time limit has run out
+        """
+
+    def close_expired_attempts(self) -> int:
+        """
+        Close every attempt whose time limit has run out, fixing its result.
+
+        Late answers are rejected whether or not this has run; closing lets a
+        backend finalize results in bulk and stop tracking the deadlines.
+        The default does nothing, for backends that only check deadlines on write.
+
+        Returns:
+            int: The number of attempts closed
+        """
+        return 0
+
+    @abstractmethod
+    def add_bank_questions(self, questions: Iterable[Question]) -> List[str]:
+        """
+        Store questions in the shared question bank and return their content IDs.
+
+        A question whose content is already in the bank is stored only once.
+        """
+
+    @abstractmethod
+    def get_bank_questions(self, question_ids: Sequence[str]) -> List[Question]:
+        """
+        Return questions from the question bank by content ID, in order.
+
+        The bank holds the questions added with add_bank_questions, until
+        clear(), and those of stored quizzes, while a quiz uses them.
+
+        Raises:
+            KeyError: If any ID is not in the bank
+        """
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Return object counts and the approximate size of the store.
+
+        Backends override this with what they can report cheaply; keys are
+        "quizzes", "questions", "bank_questions", "attempts" and "bytes".
+        """
+        return {"quizzes": len(self)}
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove all quizzes, attempts and bank questions"""
+
+    @abstractmethod
+    def __len__(self) -> int:
+        """Return the number of stored quizzes"""
+
+
+def create_database(backend: str = "memory", path: Optional[str] = None) -> QuizStorage:
+    """
+    Create a storage backend by name.
+
+    Args:
+        backend: "memory" for the in-memory database, "durable" for the in-memory
+            database with a write-ahead log, or "sqlite" for SQLite
+        path: Database file for the SQLite backend (default: quizzes.db), or log
+            directory for the durable backend (default: quizzes.wal)
+
+    Returns:
+        QuizStorage: The configured backend
+    """
+    if backend == "memory":
+        from src.database import QuizDatabase
+
+        return QuizDatabase()
+    if backend == "durable":
+        from src.durable_database import DurableQuizDatabase
+
+        return DurableQuizDatabase(path or "quizzes.wal")
+    if backend == "sqlite":
+        from src.sqlite_database import SQLiteQuizDatabase
+
+        return SQLiteQuizDatabase(path or "quizzes.db")
+    raise ValueError(f"Unknown storage backend: {backend}")
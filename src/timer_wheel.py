@@ -0,0 +1,186 @@
+"""
+A hierarchical timer wheel for tracking many deadlines at once.
+
+Deadlines are rounded up to ticks of ``resolution`` seconds on the monotonic
+clock. Level 0 has one slot per tick for the next ``slots`` ticks; each
+higher level has slots covering ``slots`` times as many ticks as the level
+below. A deadline goes into the lowest level whose range reaches it, and
+when the current tick enters the span of a higher-level slot, that slot's
+deadlines are moved down ("cascaded") to finer levels. Scheduling and
+cancelling are O(1). Advancing jumps straight to the next tick at which a
+slot expires or cascades, so it costs O(slots) per such tick plus O(1) per
+deadline moved or expired, however long the wheel was left behind and however
+many deadlines are pending.
+"""
+
+import math
+import time
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+class TimerWheel:
+    """
+    Deadlines keyed by an ID, expired in bulk by ``advance``.
+
+    Deadlines are never reported early, and at most one tick late. Deadlines
+    beyond the range of the top level wait in an overflow table until they
+    come within range. Not thread-safe; callers serialize access.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.25,
+        slots: int = 64,
+        levels: int = 4,
+        now: Optional[float] = None,
+    ) -> None:
+        """
+        Create an empty wheel.
+
+        Args:
+            resolution: Length of a tick in seconds
+            slots: Slots per level
+            levels: Number of levels, at least 2
+            now: Current time.monotonic() reading (default: now)
+
+        Raises:
+            ValueError: If levels is less than 2
+        """
+        if levels < 2:
+            raise ValueError("A timer wheel needs at least 2 levels")
+        self.resolution = resolution
+        self.slots = slots
+        self.levels = levels
+        # Ticks covered by one slot at each level, and by a whole level
+        self._spans = [slots**level for level in range(levels + 1)]
+        self._tick = math.floor((time.monotonic() if now is None else now) / resolution)
+        self._wheels: List[List[Dict[Hashable, int]]] = [
+            [{} for _ in range(slots)] for _ in range(levels)
+        ]
+        self._overflow: Dict[Hashable, int] = {}
+        # Earliest tick in the overflow table (may be early after a cancel), or None if empty
+        self._overflow_first: Optional[int] = None
+        self._due: Dict[Hashable, int] = {}  # Scheduled at or before the current tick
+        # Key -> the table holding it, for O(1) cancel
+        self._locations: Dict[Hashable, Dict[Hashable, int]] = {}
+
+    def schedule(self, key: Hashable, deadline: float) -> None:
+        """
+        Schedule key to expire at a time.monotonic() deadline, replacing any earlier schedule.
+        """
+        self.cancel(key)
+        self._place(key, math.ceil(deadline / self.resolution))
+
+    def cancel(self, key: Hashable) -> bool:
+        """Remove a scheduled key, returning False if it was not scheduled"""
+        table = self._locations.pop(key, None)
+        if table is None:
+            return False
+        del table[key]
+        return True
+
+    def advance(self, now: Optional[float] = None) -> List[Hashable]:
+        """
+        Move the wheel to the current time and return every key that has expired.
+
+        Expired keys are removed from the wheel.
+
+        Args:
+            now: Current time.monotonic() reading (default: now)
+        """
+        target = math.floor((time.monotonic() if now is None else now) / self.resolution)
+        expired = list(self._due)
+        self._due.clear()
+        while self._tick < target:
+            if not self._locations:
+                self._tick = target  # Nothing scheduled: skip the idle ticks
+                break
+            self._tick = self._next_tick(target)
+            self._cascade()
+            slot = self._wheels[0][self._tick % self.slots]
+            expired.extend(slot)
+            slot.clear()
+            if self._due:  # Cascaded straight to this tick
+                expired.extend(self._due)
+                self._due.clear()
+        for key in expired:
+            del self._locations[key]
+        return expired
+
+    def _place(self, key: Hashable, tick: int) -> None:
+        """Put key in the table that will bring it due at tick"""
+        delta = tick - self._tick
+        if delta <= 0:
+            table = self._due
+        elif delta >= self._spans[self.levels]:
+            table = self._overflow
+            if self._overflow_first is None or tick < self._overflow_first:
+                self._overflow_first = tick
+        else:
+            level = 0
+            while delta >= self._spans[level + 1]:
+                level += 1
+            table = self._wheels[level][tick // self._spans[level] % self.slots]
+        table[key] = tick
+        self._locations[key] = table
+
+    def _next_tick(self, target: int) -> int:
+        """Return the first tick after the current one that expires or cascades a slot, or target"""
+        best = target
+        for level in range(self.levels):
+            span = self._spans[level]
+            wheel = self._wheels[level]
+            first = self._tick // span + 1  # First slot boundary after the current tick
+            for boundary in range(first, first + self.slots):
+                if boundary * span >= best:
+                    break
+                if wheel[boundary % self.slots]:
+                    best = boundary * span
+                    break
+        if self._overflow:
+            # The top-level boundary at which the earliest overflow deadline comes into range
+            assert self._overflow_first is not None
+            span = self._spans[self.levels - 1]
+            start = max(self._tick + 1, self._overflow_first - self._spans[self.levels] + 1)
+            best = min(best, -(-start // span) * span)
+        return best
+
+    def _cascade(self) -> None:
+        """Move down the deadlines of every higher-level slot whose span starts at this tick"""
+        for level in range(self.levels - 1, 0, -1):
+            span = self._spans[level]
+            if self._tick % span:
+                continue
+            if level == self.levels - 1 and self._overflow:
+                self._overflow_first = None
+                self._replace(self._overflow)
+            self._replace(self._wheels[level][self._tick // span % self.slots])
+
+    def _replace(self, table: Dict[Hashable, int]) -> None:
+        """Place every key in a table again, relative to the current tick"""
+        entries: List[Tuple[Hashable, int]] = list(table.items())
+        table.clear()
+        for key, tick in entries:
+            self._place(key, tick)
+
+    def clear(self) -> None:
+        """Remove every scheduled key"""
+        for wheel in self._wheels:
+            for slot in wheel:
+                slot.clear()
+        self._overflow.clear()
+        self._overflow_first = None
+        self._due.clear()
+        self._locations.clear()
+
+    def __contains__(self, key: object) -> bool:
+        """Check whether a key is scheduled"""
+        return key in self._locations
+
+    def __len__(self) -> int:
+        """Return the number of scheduled keys"""
+        return len(self._locations)
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"TimerWheel(scheduled={len(self._locations)}, resolution={self.resolution})"
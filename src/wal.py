@@ -0,0 +1,208 @@
+"""
+Append-only log files for the durable in-memory store.
+
+A log file starts with ``FILE_MAGIC`` and holds a sequence of records. Each
+record is framed by an 8-byte header (payload length and CRC32, both
+little-endian uint32) followed by the payload, a compact JSON array. A crash
+can leave a partial record at the end of a file; readers stop at the first
+record that is incomplete or fails its checksum and report how many bytes
+were valid, so the torn tail can be truncated.
+
+Snapshots use the same format, so one reader handles both.
+"""
+
+import json
+import os
+import struct
+import threading
+import zlib
+from typing import Any, Iterable, Iterator, List, Optional, Sequence
+from src.metrics import timed
+
+FILE_MAGIC = b"QUIZLOG1"
+RECORD_HEADER = struct.Struct("<II")  # Payload length, CRC32 of the payload
+
+
+def encode_record(record: Sequence[Any]) -> bytes:
+    """Frame a record as header + compact JSON payload"""
+    payload = json.dumps(record, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+class LogReader:
+    """
+    Iterates over the records of a log or snapshot file.
+
+    After iteration, ``valid_bytes`` is the length of the intact prefix of the
+    file and ``size`` its full length; they differ if the file has a torn tail.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.size = os.path.getsize(path)
+        self.valid_bytes = 0
+
+    def __iter__(self) -> Iterator[List[Any]]:
+        with open(self.path, "rb") as log_file:
+            magic = log_file.read(len(FILE_MAGIC))
+            if len(magic) < len(FILE_MAGIC):
+                return  # Crashed while the file was being created
+            if magic != FILE_MAGIC:
+                raise ValueError(f"Not a quiz log file: {self.path}")
+            self.valid_bytes = len(FILE_MAGIC)
+            while True:
+                header = log_file.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                length, checksum = RECORD_HEADER.unpack(header)
+                payload = log_file.read(length)
+                if len(payload) < length or zlib.crc32(payload) != checksum:
+                    return
+                self.valid_bytes += RECORD_HEADER.size + length
+                yield json.loads(payload)
+
+    @property
+    def torn(self) -> bool:
+        """Whether the file ends with bytes that are not part of an intact record"""
+        return self.valid_bytes < self.size
+
+
+def write_records(path: str, records: Iterable[Sequence[Any]]) -> None:
+    """
+    Atomically replace path with a file holding the given records.
+
+    The records go to a temporary file that is fsynced and then renamed over
+    path, so readers see either the old file or the complete new one.
+    """
+    temporary = path + ".tmp"
+    with open(temporary, "wb") as out:
+        out.write(FILE_MAGIC)
+        for record in records:
+            out.write(encode_record(record))
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(temporary, path)
+    sync_directory(os.path.dirname(os.path.abspath(path)))
+
+
+def sync_directory(directory: str) -> None:
+    """Fsync a directory so that files created, renamed or deleted in it are durable"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return  # Not supported on this platform (e.g. Windows)
+    descriptor = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+class WriteAheadLog:
+    """
+    An append-only log file with group commit.
+
+    ``append`` only buffers the record, so it is cheap enough to call while
+    holding the locks that order mutations. ``sync`` then makes the record
+    durable: the first caller to arrive writes and fsyncs everything buffered
+    so far, and callers arriving meanwhile wait for that write and are
+    usually covered by it, so concurrent writers share one fsync.
+
+    With fsync=False records are still written to the operating system on
+    ``sync``, which survives a crash of the process but not of the machine.
+    """
+
+    def __init__(self, path: str, fsync: bool = True) -> None:
+        self.path = path
+        self.fsync = fsync
+        self._file = self._open(path)
+        self._buffer: List[bytes] = []
+        self._appended = 0  # Records appended since the log was opened
+        self._synced = 0  # Records written (and fsynced) since the log was opened
+        self._syncing = False  # Whether a caller is writing outside the lock
+        self._error: Optional[OSError] = None  # First write failure; the log is unusable after it
+        self._condition = threading.Condition()
+
+    @staticmethod
+    def _open(path: str) -> Any:
+        """Open a log file for appending, writing the magic bytes to a new one"""
+        log_file = open(path, "ab")
+        if log_file.tell() == 0:
+            log_file.write(FILE_MAGIC)
+            log_file.flush()
+            sync_directory(os.path.dirname(os.path.abspath(path)))
+        return log_file
+
+    def append(self, record: Sequence[Any]) -> int:
+        """
+        Buffer a record for the next write.
+
+        Returns:
+            int: The record's position, to pass to sync()
+        """
+        data = encode_record(record)
+        with self._condition:
+            self._buffer.append(data)
+            self._appended += 1
+            return self._appended
+
+    @timed("wal_sync")
+    def sync(self, position: Optional[int] = None) -> None:
+        """
+        Wait until the record at position (default: every appended record) is durable.
+
+        Raises:
+            OSError: If writing the log failed
+        """
+        with self._condition:
+            target = self._appended if position is None else position
+            while self._synced < target:
+                if self._error is not None:
+                    raise self._error
+                if self._syncing:
+                    self._condition.wait()
+                    continue
+                batch, self._buffer = self._buffer, []
+                end = self._appended
+                self._syncing = True
+                self._condition.release()
+                try:
+                    self._write(batch)
+                except OSError as error:
+                    self._error = error
+                    raise
+                finally:
+                    self._condition.acquire()
+                    self._syncing = False
+                    self._condition.notify_all()
+                self._synced = end
+
+    def _write(self, batch: List[bytes]) -> None:
+        """Write records to the file and fsync it if configured"""
+        self._file.write(b"".join(batch))
+        self._file.flush()
+        if self.fsync:
+            os.fsync(self._file.fileno())
+
+    def rotate(self, path: str) -> None:
+        """Make every appended record durable, then continue the log in a new file"""
+        with self._condition:
+            while self._syncing:
+                self._condition.wait()
+            if self._error is not None:
+                raise self._error
+            self._write(self._buffer)
+            self._buffer = []
+            self._synced = self._appended
+            self._file.close()
+            self._file = self._open(path)
+            self.path = path
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        """Make every appended record durable and close the file"""
+        self.sync()
+        with self._condition:
+            self._file.close()
+
+    def __repr__(self) -> str:
+        """String representation for debugging"""
+        return f"WriteAheadLog(path='{self.path}', pending={self._appended - self._synced})"
@@ -5,9 +5,15 @@ Tests that verify all API endpoints return the correct HTTP status codes.
 These are End-to-End tests that test the REST API through HTTP.
 """
 
+import json
+import threading
 import pytest
 from fastapi.testclient import TestClient
-from src.api import app, db
+from src import api
+from src.api import OFFLOAD_QUESTION_COUNT, app, db, profiler
+from src.async_storage import AsyncQuizStorage
+from src.metrics import REGISTRY
+from src.sqlite_database import SQLiteQuizDatabase
 
 
 @pytest.fixture(autouse=True)
@@ -90,6 +96,43 @@ class TestReadQuizEndpoints:
         response = client.get(f"/quizzes/{quiz_id}")
         assert response.status_code == 200
 
+    def test_get_quiz_returns_etag_and_not_modified(self, client, sample_quiz_data):
+        """Test GET /quizzes/{quiz_id} with a matching If-None-Match returns 304"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+
+        response = client.get(f"/quizzes/{quiz_id}")
+        etag = response.headers["ETag"]
+        assert response.json()["title"] == "Test Quiz"
+
+        cached_response = client.get(f"/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+        assert cached_response.status_code == 304
+
+    def test_get_large_quiz_returns_ok(self, client):
+        """Test GET /quizzes/{quiz_id} for a quiz encoded in a worker thread"""
+        questions = [
+            {"text": f"Question {i}?", "options": ["A", "B"], "correct_answer": "A"}
+            for i in range(OFFLOAD_QUESTION_COUNT)
+        ]
+        quiz_data = {"title": "Large Quiz", "questions": questions}
+        quiz_id = client.post("/quizzes", json=quiz_data).json()["quiz_id"]
+
+        response = client.get(f"/quizzes/{quiz_id}")
+        assert response.status_code == 200
+        assert response.json()["question_count"] == OFFLOAD_QUESTION_COUNT
+        assert response.json()["questions"][-1]["text"] == f"Question {OFFLOAD_QUESTION_COUNT - 1}?"
+
+    def test_get_quiz_after_update_returns_new_content(self, client, sample_quiz_data):
+        """Test GET /quizzes/{quiz_id} does not serve a cached body after PUT"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        etag = client.get(f"/quizzes/{quiz_id}").headers["ETag"]
+
+        client.put(f"/quizzes/{quiz_id}", json={**sample_quiz_data, "title": "Updated"})
+
+        response = client.get(f"/quizzes/{quiz_id}", headers={"If-None-Match": etag})
+        assert response.status_code == 200
+        assert response.json()["title"] == "Updated"
+        assert response.headers["ETag"] != etag
+
     def test_get_nonexistent_quiz_returns_not_found(self, client):
         """Test GET /quizzes/{invalid_id} returns 404 Not Found"""
         response = client.get("/quizzes/nonexistent-id-123")
@@ -106,6 +149,26 @@ class TestReadQuizEndpoints:
         response = client.get("/quizzes")
         assert response.status_code == 200
 
+    def test_list_quizzes_in_pages_returns_ok(self, client, sample_quiz_data):
+        """Test GET /quizzes?limit=&cursor= pages through all quizzes"""
+        for _ in range(3):
+            client.post("/quizzes", json=sample_quiz_data)
+
+        first_page = client.get("/quizzes", params={"limit": 2}).json()
+        second_page = client.get(
+            "/quizzes", params={"limit": 2, "cursor": first_page["next_cursor"]}
+        ).json()
+
+        assert first_page["total"] == 3
+        assert len(first_page["quizzes"]) == 2
+        assert len(second_page["quizzes"]) == 1
+        assert second_page["next_cursor"] is None
+
+    def test_list_quizzes_with_invalid_cursor_returns_bad_request(self, client):
+        """Test GET /quizzes with a malformed cursor returns 400"""
+        response = client.get("/quizzes", params={"cursor": "not-a-cursor"})
+        assert response.status_code == 400
+
 
 class TestUpdateQuizEndpoint:
     """Tests for PUT /quizzes/{quiz_id} (UPDATE operation)"""
@@ -125,6 +188,26 @@ class TestUpdateQuizEndpoint:
         response = client.put(f"/quizzes/{quiz_id}", json=updated_data)
         assert response.status_code == 200
 
+    def test_update_quiz_with_current_version_returns_ok(self, client, sample_quiz_data):
+        """Test PUT /quizzes/{quiz_id} with a matching If-Match version returns 200"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+
+        response = client.put(
+            f"/quizzes/{quiz_id}", json=sample_quiz_data, headers={"If-Match": '"1"'}
+        )
+        assert response.status_code == 200
+        assert response.json()["version"] == 2
+
+    def test_update_quiz_with_stale_version_returns_conflict(self, client, sample_quiz_data):
+        """Test PUT /quizzes/{quiz_id} with an outdated If-Match version returns 409"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        client.put(f"/quizzes/{quiz_id}", json=sample_quiz_data)
+
+        response = client.put(
+            f"/quizzes/{quiz_id}", json=sample_quiz_data, headers={"If-Match": '"1"'}
+        )
+        assert response.status_code == 409
+
     def test_update_nonexistent_quiz_returns_not_found(self, client, sample_quiz_data):
         """Test PUT /quizzes/{invalid_id} returns 404 Not Found"""
         response = client.put("/quizzes/nonexistent-id-123", json=sample_quiz_data)
@@ -197,6 +280,58 @@ class TestAnswerSubmissionEndpoint:
         response = client.post(f"/quizzes/{quiz_id}/answers", json=answer_data)
         assert response.status_code == 400
 
+    def test_submit_answers_in_batch_returns_ok(self, client):
+        """Test POST /quizzes/{quiz_id}/answers:batch records every answer"""
+        quiz_data = {
+            "title": "Math Quiz",
+            "questions": [
+                {"text": "What is 2+2?", "options": ["3", "4"], "correct_answer": "4"},
+                {"text": "What is 3+3?", "options": ["5", "6"], "correct_answer": "6"},
+            ],
+        }
+        quiz_id = client.post("/quizzes", json=quiz_data).json()["quiz_id"]
+
+        answers = [{"question_index": 0, "answer": "4"}, {"question_index": 1, "answer": "5"}]
+        response = client.post(f"/quizzes/{quiz_id}/answers:batch", json={"answers": answers})
+        assert response.status_code == 200
+        assert [a["is_correct"] for a in response.json()["answers"]] == [True, False]
+        assert response.json()["score"] == 1
+        assert response.json()["incorrect_question_indices"] == [1]
+
+    def test_submit_answers_in_batch_with_invalid_index_returns_bad_request(
+        self, client, sample_quiz_data
+    ):
+        """Test POST /quizzes/{quiz_id}/answers:batch with one invalid index records nothing"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+
+        answers = [{"question_index": 0, "answer": "4"}, {"question_index": 9, "answer": "4"}]
+        response = client.post(f"/quizzes/{quiz_id}/answers:batch", json={"answers": answers})
+        assert response.status_code == 400
+        assert client.get(f"/quizzes/{quiz_id}/results").json()["score"] == 0
+
+    def test_submit_answer_by_option_index_returns_ok(self, client, sample_quiz_data):
+        """Test POST /quizzes/{quiz_id}/answers accepts answer_index"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+
+        answer_data = {"question_index": 0, "answer_index": 1}
+        response = client.post(f"/quizzes/{quiz_id}/answers", json=answer_data)
+        assert response.status_code == 200
+        assert response.json()["is_correct"] is True
+        assert response.json()["answer_index"] == 1
+        assert client.get(f"/quizzes/{quiz_id}/results").json()["score"] == 1
+
+    def test_submit_answer_by_option_index_errors(self, client, sample_quiz_data):
+        """Test answer_index outside the options returns 400 and ambiguous answers 422"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        url = f"/quizzes/{quiz_id}/answers"
+
+        bad_option = client.post(url, json={"question_index": 0, "answer_index": 4})
+        both = client.post(url, json={"question_index": 0, "answer": "4", "answer_index": 1})
+        neither = client.post(url, json={"question_index": 0})
+        assert bad_option.status_code == 400
+        assert both.status_code == 422
+        assert neither.status_code == 422
+
 
 class TestResultsEndpoint:
     """Tests for GET /quizzes/{quiz_id}/results"""
@@ -216,6 +351,23 @@ class TestResultsEndpoint:
         response = client.get("/quizzes/nonexistent-id/results")
         assert response.status_code == 404
 
+    def test_get_results_breakdown_returns_ok(self, client, sample_quiz_data):
+        """Test GET /quizzes/{quiz_id}/results/breakdown returns 200 OK"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        client.post(f"/quizzes/{quiz_id}/answers", json={"question_index": 0, "answer": "4"})
+
+        response = client.get(f"/quizzes/{quiz_id}/results/breakdown")
+        assert response.status_code == 200
+        assert response.json()["categories"] == [
+            {"category": "Math", "score": 1, "total": 1, "percentage": 100.0}
+        ]
+        assert response.json()["difficulties"][0]["difficulty"] == "easy"
+
+    def test_get_results_breakdown_for_nonexistent_quiz_returns_not_found(self, client):
+        """Test GET /quizzes/{invalid_id}/results/breakdown returns 404"""
+        response = client.get("/quizzes/nonexistent-id/results/breakdown")
+        assert response.status_code == 404
+
 
 class TestAPIDocumentationEndpoints:
     """Tests for auto-generated API documentation"""
@@ -302,3 +454,446 @@ class TestQuizCompletionWorkflow:
         # GET results
         results_response = client.get(f"/quizzes/{quiz_id}/results")
         assert results_response.status_code == 200
+
+
+class TestAttemptEndpoints:
+    """Tests for per-attempt endpoints"""
+
+    def test_start_attempt_returns_created(self, client, sample_quiz_data):
+        """Test POST /quizzes/{quiz_id}/attempts returns 201 Created"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+
+        response = client.post(f"/quizzes/{quiz_id}/attempts")
+        assert response.status_code == 201
+        assert response.json()["quiz_id"] == quiz_id
+
+    def test_start_attempt_for_nonexistent_quiz_returns_not_found(self, client):
+        """Test POST /quizzes/{invalid_id}/attempts returns 404"""
+        response = client.post("/quizzes/nonexistent-id/attempts")
+        assert response.status_code == 404
+
+    def test_submit_attempt_answer_returns_ok(self, client, sample_quiz_data):
+        """Test POST /attempts/{attempt_id}/answers returns 200 OK"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        answer_data = {"question_index": 0, "answer": "4"}
+        response = client.post(f"/attempts/{attempt_id}/answers", json=answer_data)
+        assert response.status_code == 200
+        assert response.json()["is_correct"] is True
+
+    def test_submit_attempt_answer_to_nonexistent_attempt_returns_not_found(self, client):
+        """Test POST /attempts/{invalid_id}/answers returns 404"""
+        answer_data = {"question_index": 0, "answer": "4"}
+        response = client.post("/attempts/nonexistent-id/answers", json=answer_data)
+        assert response.status_code == 404
+
+    def test_submit_attempt_answer_with_invalid_index_returns_bad_request(
+        self, client, sample_quiz_data
+    ):
+        """Test POST /attempts/{attempt_id}/answers with invalid index returns 400"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        answer_data = {"question_index": 999, "answer": "4"}
+        response = client.post(f"/attempts/{attempt_id}/answers", json=answer_data)
+        assert response.status_code == 400
+
+    def test_submit_attempt_answers_in_batch_returns_ok(self, client, sample_quiz_data):
+        """Test POST /attempts/{attempt_id}/answers:batch returns per-answer correctness"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        answers = [{"question_index": 0, "answer": "3"}, {"question_index": 0, "answer": "4"}]
+        response = client.post(f"/attempts/{attempt_id}/answers:batch", json={"answers": answers})
+        assert response.status_code == 200
+        assert [a["is_correct"] for a in response.json()["answers"]] == [False, True]
+        assert response.json()["is_perfect"] is True
+
+    def test_submit_attempt_answers_in_batch_errors(self, client, sample_quiz_data):
+        """Test POST /attempts/{attempt_id}/answers:batch returns 404, 400 and 422"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+        invalid_index = {"answers": [{"question_index": 9, "answer": "4"}]}
+
+        missing = client.post("/attempts/nonexistent-id/answers:batch", json=invalid_index)
+        bad_index = client.post(f"/attempts/{attempt_id}/answers:batch", json=invalid_index)
+        empty = client.post(f"/attempts/{attempt_id}/answers:batch", json={"answers": []})
+        assert missing.status_code == 404
+        assert bad_index.status_code == 400
+        assert empty.status_code == 422
+
+    def test_answers_after_time_limit_return_conflict(self, client, sample_quiz_data):
+        """Test attempt answers are rejected with 409 once the time limit has run out"""
+        timed = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        started = client.post(f"/quizzes/{timed}/attempts").json()
+        assert started["expires_at"] == started["start_time"] + 600
+
+        expired_quiz = client.post(
+            "/quizzes", json={**sample_quiz_data, "time_limit_seconds": 0}
+        ).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{expired_quiz}/attempts").json()["attempt_id"]
+        answer = {"question_index": 0, "answer": "4"}
+
+        single = client.post(f"/attempts/{attempt_id}/answers", json=answer)
+        batch = client.post(f"/attempts/{attempt_id}/answers:batch", json={"answers": [answer]})
+        results = client.get(f"/attempts/{attempt_id}/results").json()
+        assert single.status_code == 409
+        assert batch.status_code == 409
+        assert results["closed"] is True
+        assert results["score"] == 0
+
+    def test_expired_attempts_are_swept_while_serving(self, monkeypatch):
+        """Test the app closes expired attempts in the background while it runs"""
+        sweeps = threading.Event()
+        close_expired_attempts = db.close_expired_attempts
+
+        def recording_close_expired_attempts():
+            sweeps.set()
+            return close_expired_attempts()
+
+        monkeypatch.setattr(api, "ATTEMPT_SWEEP_SECONDS", 0.01)
+        monkeypatch.setattr(db, "close_expired_attempts", recording_close_expired_attempts)
+        with TestClient(app):
+            assert sweeps.wait(5)
+
+    def test_sweeper_survives_a_failed_sweep(self, monkeypatch, caplog):
+        """Test a sweep that raises is logged and the next sweep still runs"""
+        sweeps = []
+        swept_again = threading.Event()
+
+        def failing_close_expired_attempts():
+            sweeps.append(None)
+            if len(sweeps) == 1:
+                raise RuntimeError("storage unavailable")
+            swept_again.set()
+            return 0
+
+        monkeypatch.setattr(api, "ATTEMPT_SWEEP_SECONDS", 0.01)
+        monkeypatch.setattr(db, "close_expired_attempts", failing_close_expired_attempts)
+        with TestClient(app):
+            assert swept_again.wait(5)
+        assert "Closing expired attempts failed" in caplog.text
+
+    def test_quiz_update_does_not_change_open_attempt_on_sqlite(
+        self, client, sample_quiz_data, monkeypatch, tmp_path
+    ):
+        """Test an attempt stored in SQLite keeps its questions when the quiz shrinks"""
+        sqlite_db = SQLiteQuizDatabase(str(tmp_path / "quizzes.db"))
+        monkeypatch.setattr(api, "db", sqlite_db)
+        monkeypatch.setattr(api, "store", AsyncQuizStorage(sqlite_db))
+        extra = {"text": "What is 3+3?", "options": ["5", "6"], "correct_answer": "6"}
+        data = {**sample_quiz_data, "questions": sample_quiz_data["questions"] + [extra]}
+        try:
+            quiz_id = client.post("/quizzes", json=data).json()["quiz_id"]
+            attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+            client.post(
+                f"/attempts/{attempt_id}/answers", json={"question_index": 1, "answer": "6"}
+            )
+            shrunk = {**sample_quiz_data, "title": "Shrunk"}
+            assert client.put(f"/quizzes/{quiz_id}", json=shrunk).status_code == 200
+
+            answer = {"question_index": 1, "answer": "6"}
+            response = client.post(f"/attempts/{attempt_id}/answers", json=answer)
+            questions = client.get(f"/attempts/{attempt_id}/questions")
+            results = client.get(f"/attempts/{attempt_id}/results")
+        finally:
+            sqlite_db.close()
+
+        assert response.status_code == 200
+        assert questions.status_code == 200
+        assert [q["text"] for q in questions.json()["questions"]][1] == "What is 3+3?"
+        assert results.status_code == 200
+        assert results.json()["score"] == 1
+
+    def test_shuffled_attempt_serves_and_maps_its_own_order(self, client):
+        """Test a shuffled attempt serves reordered questions and accepts answers in that order"""
+        questions = [
+            {
+                "text": f"Q{i}?",
+                "options": [f"{i}-A", f"{i}-B", f"{i}-C"],
+                "correct_answer": f"{i}-C",
+            }
+            for i in range(8)
+        ]
+        quiz_id = client.post("/quizzes", json={"title": "Shuffled", "questions": questions})
+        quiz_id = quiz_id.json()["quiz_id"]
+        started = client.post(f"/quizzes/{quiz_id}/attempts", params={"shuffle": True}).json()
+        attempt_id = started["attempt_id"]
+        assert started["shuffled"] is True
+
+        served = client.get(f"/attempts/{attempt_id}/questions").json()["questions"]
+        page = client.get(f"/attempts/{attempt_id}/questions", params={"offset": 6}).json()
+        assert sorted(q["text"] for q in served) == sorted(q["text"] for q in questions)
+        assert page["questions"] == served[6:]
+        assert "correct_answer" not in served[0]
+
+        # Answer every question correctly except the one presented first
+        correct = {q["text"]: q["correct_answer"] for q in questions}
+        answers = [
+            {
+                "question_index": q["question_index"],
+                "answer_index": q["options"].index(correct[q["text"]]),
+            }
+            for q in served
+        ]
+        answers[0]["answer_index"] = (answers[0]["answer_index"] + 1) % 3
+        response = client.post(f"/attempts/{attempt_id}/answers:batch", json={"answers": answers})
+        assert [a["is_correct"] for a in response.json()["answers"]] == [False] + [True] * 7
+
+        results = client.get(f"/attempts/{attempt_id}/results").json()
+        assert results["score"] == 7
+        assert results["incorrect_question_indices"] == [0]
+
+    def test_unshuffled_attempt_serves_quiz_order(self, client, sample_quiz_data):
+        """Test GET /attempts/{attempt_id}/questions follows the quiz for a plain attempt"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        served = client.get(f"/attempts/{attempt_id}/questions").json()["questions"]
+        missing = client.get("/attempts/nonexistent-id/questions")
+        assert [q["text"] for q in served] == [q["text"] for q in sample_quiz_data["questions"]]
+        assert served[0]["options"] == sample_quiz_data["questions"][0]["options"]
+        assert missing.status_code == 404
+
+    def test_submit_attempt_answers_by_option_index(self, client, sample_quiz_data):
+        """Test attempt endpoints accept answer_index and reject invalid options"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        single = client.post(
+            f"/attempts/{attempt_id}/answers", json={"question_index": 0, "answer_index": 0}
+        )
+        batch = client.post(
+            f"/attempts/{attempt_id}/answers:batch",
+            json={"answers": [{"question_index": 0, "answer_index": 1}]},
+        )
+        bad_option = client.post(
+            f"/attempts/{attempt_id}/answers", json={"question_index": 0, "answer_index": 7}
+        )
+        assert single.json()["is_correct"] is False
+        assert batch.json()["is_perfect"] is True
+        assert bad_option.status_code == 400
+
+    def test_get_attempt_results_returns_ok(self, client, sample_quiz_data):
+        """Test GET /attempts/{attempt_id}/results returns 200 OK"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+        client.post(f"/attempts/{attempt_id}/answers", json={"question_index": 0, "answer": "4"})
+
+        response = client.get(f"/attempts/{attempt_id}/results")
+        assert response.status_code == 200
+        assert response.json()["score"] == 1
+
+    def test_get_attempt_results_breakdown_returns_ok(self, client, sample_quiz_data):
+        """Test GET /attempts/{attempt_id}/results/breakdown returns 200 OK"""
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        attempt_id = client.post(f"/quizzes/{quiz_id}/attempts").json()["attempt_id"]
+
+        response = client.get(f"/attempts/{attempt_id}/results/breakdown")
+        assert response.status_code == 200
+        assert response.json()["categories"][0]["score"] == 0
+
+    def test_get_attempt_results_breakdown_for_nonexistent_attempt_returns_not_found(self, client):
+        """Test GET /attempts/{invalid_id}/results/breakdown returns 404"""
+        response = client.get("/attempts/nonexistent-id/results/breakdown")
+        assert response.status_code == 404
+
+    def test_get_results_for_nonexistent_attempt_returns_not_found(self, client):
+        """Test GET /attempts/{invalid_id}/results returns 404"""
+        response = client.get("/attempts/nonexistent-id/results")
+        assert response.status_code == 404
+
+
+class TestBulkEndpoints:
+    """Tests for NDJSON bulk import and export"""
+
+    def test_bulk_import_returns_created(self, client, sample_quiz_data):
+        """Test POST /quizzes:bulk stores every quiz in the body"""
+        quizzes = [{**sample_quiz_data, "title": f"Quiz {i}"} for i in range(3)]
+        body = "\n".join(json.dumps(quiz) for quiz in quizzes) + "\n"
+
+        response = client.post("/quizzes:bulk", content=body)
+        assert response.status_code == 201
+        assert response.json()["created"] == 3
+        assert len(db) == 3
+
+    def test_bulk_import_with_invalid_line_returns_error(self, client, sample_quiz_data):
+        """Test POST /quizzes:bulk stops at an invalid line and keeps earlier quizzes"""
+        body = "\n".join([json.dumps(sample_quiz_data), '{"title": ""}', "not json"])
+
+        response = client.post("/quizzes:bulk", content=body)
+        assert response.status_code == 422
+        assert response.json()["detail"]["line"] == 2
+        assert response.json()["detail"]["created"] == 1
+        assert len(db) == 1
+
+    def test_bulk_import_joins_lines_split_across_chunks(self, client, sample_quiz_data):
+        """Test POST /quizzes:bulk reads lines that arrive over several chunks"""
+        quizzes = [{**sample_quiz_data, "title": f"Quiz {i}"} for i in range(3)]
+        body = "\n".join(json.dumps(quiz) for quiz in quizzes).encode()
+        bounds = range(0, len(body) + 7, 7)
+        chunks = [body[start:end] for start, end in zip(bounds, bounds[1:])]
+
+        response = client.post("/quizzes:bulk", content=iter(chunks))
+        assert response.status_code == 201
+        assert [db.get_quiz(i).title for i in response.json()["quiz_ids"]] == [
+            "Quiz 0",
+            "Quiz 1",
+            "Quiz 2",
+        ]
+
+    def test_bulk_import_with_too_long_line_returns_413(
+        self, client, sample_quiz_data, monkeypatch
+    ):
+        """Test POST /quizzes:bulk rejects an overlong line and keeps earlier quizzes"""
+        monkeypatch.setattr(api, "MAX_NDJSON_LINE_BYTES", 400)
+        long_quiz = {**sample_quiz_data, "title": "x" * 400}
+        body = "\n".join(json.dumps(quiz) for quiz in [sample_quiz_data, long_quiz]).encode()
+        bounds = range(0, len(body) + 64, 64)
+        chunks = [body[start:end] for start, end in zip(bounds, bounds[1:])]
+
+        response = client.post("/quizzes:bulk", content=iter(chunks))
+        assert response.status_code == 413
+        assert response.json()["detail"]["line"] == 2
+        assert response.json()["detail"]["created"] == 1
+        assert len(db) == 1
+
+    def test_export_round_trips_through_import(self, client, sample_quiz_data):
+        """Test GET /quizzes:export output can be imported again"""
+        for i in range(2):
+            client.post("/quizzes", json={**sample_quiz_data, "title": f"Quiz {i}"})
+
+        export = client.get("/quizzes:export")
+        assert export.status_code == 200
+        assert export.headers["content-type"] == "application/x-ndjson"
+        lines = export.text.splitlines()
+        assert [json.loads(line)["title"] for line in lines] == ["Quiz 0", "Quiz 1"]
+
+        db.clear()
+        response = client.post("/quizzes:bulk", content=export.text)
+        assert response.json()["created"] == 2
+        quiz = db.get_quiz(response.json()["quiz_ids"][0])
+        assert quiz.questions[0].correct_answer == "4"
+
+
+class TestMetricsEndpoint:
+    """Tests for GET /metrics"""
+
+    def test_metrics_disabled_returns_not_found(self, client):
+        """Test GET /metrics returns 404 while metrics are disabled"""
+        assert client.get("/metrics").status_code == 404
+
+    def test_metrics_report_requests_and_store(self, client, sample_quiz_data, monkeypatch):
+        """Test GET /metrics reports per-route requests, storage timings and store size"""
+        monkeypatch.setattr(REGISTRY, "enabled", True)
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        client.get(f"/quizzes/{quiz_id}")
+
+        response = client.get("/metrics")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        text = response.text
+        assert (
+            'quiz_http_requests_total{method="GET",route="/quizzes/{quiz_id}",status="200"}' in text
+        )
+        assert 'quiz_storage_operation_seconds_count{backend="' in text
+        assert "quiz_store_quizzes 1" in text
+
+
+class TestProfilingEndpoints:
+    """Tests for opt-in request profiling and GET /profiles"""
+
+    @pytest.fixture
+    def profiling(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(profiler, "output_dir", str(tmp_path))
+        monkeypatch.setattr(profiler, "token", "secret")
+        profiler.clear()
+        yield profiler
+        profiler.clear()
+
+    def test_profiles_disabled_returns_not_found(self, client):
+        """Test GET /profiles returns 404 while profiling is off"""
+        assert client.get("/profiles").status_code == 404
+
+    def test_token_check(self, profiling):
+        """Test only the configured token authorizes profiling"""
+        assert profiling.is_authorized("secret") is True
+        assert profiling.is_authorized("secreT") is False
+        assert profiling.is_authorized("sécret") is False
+        assert profiling.is_authorized(None) is False
+
+    def test_slow_requests_are_profiled(self, client, sample_quiz_data, profiling, monkeypatch):
+        """Test requests over the threshold keep a profile with hot functions and a dump"""
+        monkeypatch.setattr(profiling, "enabled", True)
+        monkeypatch.setattr(profiling, "threshold_ms", 0)
+        quiz_id = client.post("/quizzes", json=sample_quiz_data).json()["quiz_id"]
+        client.get(f"/quizzes/{quiz_id}")
+
+        response = client.get("/profiles", headers={"X-Profile-Token": "secret"})
+        assert response.status_code == 200
+        latest = response.json()["profiles"][0]
+        assert latest["route"] == "/quizzes/{quiz_id}"
+        assert latest["top_functions"]
+        assert latest["dump_path"].endswith(".prof")
+
+    def test_token_header_profiles_one_request(self, client, sample_quiz_data, profiling):
+        """Test a request with the profile token is profiled and names its report"""
+        response = client.post(
+            "/quizzes", json=sample_quiz_data, headers={"X-Profile-Token": "secret"}
+        )
+        profile_id = response.headers["X-Profile-Id"]
+        unprofiled = client.post("/quizzes", json=sample_quiz_data)
+
+        assert "X-Profile-Id" not in unprofiled.headers
+        assert [report.profile_id for report in profiling.reports()] == [profile_id]
+        assert client.get("/profiles").status_code == 403
+
+
+class TestQuestionBankEndpoints:
+    """Tests for the question bank and quizzes referencing it"""
+
+    @pytest.fixture
+    def bank_question(self):
+        return {
+            "text": "What is 3+3?",
+            "options": ["5", "6", "7"],
+            "correct_answer": "6",
+            "difficulty": "easy",
+            "category": "Math",
+        }
+
+    def test_add_and_get_bank_question(self, client, bank_question):
+        """Test POST /questions returns content IDs that GET /questions/{id} resolves"""
+        response = client.post("/questions", json={"questions": [bank_question, bank_question]})
+        assert response.status_code == 201
+        first, second = response.json()["question_ids"]
+        assert first == second
+
+        fetched = client.get(f"/questions/{first}")
+        assert fetched.status_code == 200
+        assert fetched.json()["correct_answer"] == "6"
+        assert client.get("/questions/missing").status_code == 404
+
+    def test_create_quiz_referencing_bank_question(self, client, bank_question):
+        """Test quizzes can mix inline questions and bank references"""
+        (question_id,) = client.post("/questions", json={"questions": [bank_question]}).json()[
+            "question_ids"
+        ]
+        inline = {**bank_question, "text": "What is 1+1?", "options": ["2", "3"]}
+        inline["correct_answer"] = "2"
+        payload = {"title": "Mixed", "questions": [{"question_id": question_id}, inline]}
+
+        response = client.post("/quizzes", json=payload)
+        assert response.status_code == 201
+        quiz = client.get(f"/quizzes/{response.json()['quiz_id']}").json()
+        assert [q["text"] for q in quiz["questions"]] == ["What is 3+3?", "What is 1+1?"]
+
+    def test_unknown_reference_returns_400(self, client):
+        """Test a quiz referencing a question that is not in the bank is rejected"""
+        payload = {"title": "Broken", "questions": [{"question_id": "missing"}]}
+
+        response = client.post("/quizzes", json=payload)
+        assert response.status_code == 400
+        assert "missing" in response.json()["detail"]
+        assert len(db) == 0
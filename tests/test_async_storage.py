@@ -0,0 +1,152 @@
+import asyncio
+import contextvars
+import threading
+import pytest
+from src.async_storage import AsyncQuizStorage
+from src.database import QuizDatabase
+from src.durable_database import DurableQuizDatabase
+from src.question import Question
+from src.quiz import Quiz
+from src.sqlite_database import SQLiteQuizDatabase
+from src.storage import VersionConflictError
+
+request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+class ThreadRecordingDatabase(QuizDatabase):
+    """In-memory database that records the thread each call ran in"""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.threads = {}
+
+    def get_quiz(self, quiz_id):
+        self.threads["get_quiz"] = threading.get_ident()
+        return super().get_quiz(quiz_id)
+
+    def add_quiz(self, quiz):
+        self.threads["add_quiz"] = (threading.get_ident(), request_id.get())
+        return super().add_quiz(quiz)
+
+
+def make_quiz(title="Async Quiz"):
+    quiz = Quiz(title=title)
+    quiz.add_question(Question("2+2?", ["3", "4"], "4"))
+    return quiz
+
+
+class TestAsyncQuizStorage:
+    """Tests for the coroutine interface over a synchronous backend"""
+
+    def test_round_trip_through_memory_backend(self):
+        store = AsyncQuizStorage(QuizDatabase())
+
+        async def scenario():
+            quiz_id = await store.add_quiz(make_quiz())
+            quiz = await store.get_quiz(quiz_id)
+            attempt_id = await store.start_attempt(quiz_id)
+            correct = await store.submit_attempt_answer(attempt_id, 0, "4")
+            summaries, cursor = await store.list_quiz_summaries(limit=10)
+            return quiz, correct, summaries, cursor, await store.count()
+
+        quiz, correct, summaries, cursor, count = asyncio.run(scenario())
+        assert quiz.title == "Async Quiz"
+        assert correct is True
+        assert [s.title for s in summaries] == ["Async Quiz"]
+        assert cursor is None
+        assert count == 1
+
+    def test_inline_operations_run_on_event_loop_thread(self):
+        db = ThreadRecordingDatabase()
+        store = AsyncQuizStorage(db)
+
+        async def scenario():
+            request_id.set("req-1")
+            quiz_id = await store.add_quiz(make_quiz())
+            await store.get_quiz(quiz_id)
+            return threading.get_ident()
+
+        loop_thread = asyncio.run(scenario())
+        assert db.threads["get_quiz"] == loop_thread
+        add_thread, add_request_id = db.threads["add_quiz"]
+        assert add_thread != loop_thread
+        # Offloaded calls see the caller's context variables
+        assert add_request_id == "req-1"
+
+    def test_operations_taking_locks_run_in_worker_threads(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_quiz())
+
+        # Writers hold these locks while interning questions
+        for operation in ("delete_quiz", "start_attempt", "get_attempt"):
+            assert not db.runs_inline(operation, quiz_id)
+        assert not db.runs_inline("submit_attempt_answer", quiz_id, 0, "4")
+        assert db.runs_inline("get_quiz", quiz_id)
+
+    def test_backend_errors_propagate(self):
+        store = AsyncQuizStorage(QuizDatabase())
+
+        async def scenario():
+            quiz_id = await store.add_quiz(make_quiz())
+            await store.update_quiz(quiz_id, make_quiz("Changed"), expected_version=7)
+
+        with pytest.raises(VersionConflictError):
+            asyncio.run(scenario())
+
+        async def unknown_question():
+            await store.get_bank_questions(["missing"])
+
+        with pytest.raises(KeyError):
+            asyncio.run(unknown_question())
+
+    def test_sqlite_backend_runs_everything_in_worker_threads(self, tmp_path):
+        db = SQLiteQuizDatabase(str(tmp_path / "quizzes.db"))
+        store = AsyncQuizStorage(db)
+        assert not db.inline_operations
+
+        async def scenario():
+            quiz_id = await store.add_quiz(make_quiz())
+            return await store.get_quiz(quiz_id), await store.get_stats()
+
+        try:
+            quiz, stats = asyncio.run(scenario())
+        finally:
+            db.close()
+        assert quiz.title == "Async Quiz"
+        assert stats["quizzes"] == 1
+
+    def test_durable_reads_run_inline_once_decoded(self, tmp_path):
+        directory = str(tmp_path / "quizzes.wal")
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+        db.checkpoint()
+        db.close()
+        db = DurableQuizDatabase(directory)
+        try:
+            assert not db.runs_inline("get_quiz", quiz_id)
+            assert not db.runs_inline("get_attempt", attempt_id)
+            assert db.runs_inline("list_quiz_summaries", None, None)
+
+            quiz = asyncio.run(AsyncQuizStorage(db).get_quiz(quiz_id))
+            assert quiz.title == "Async Quiz"
+            assert db.runs_inline("get_quiz", quiz_id)
+            assert db.runs_inline("get_quiz_version", quiz_id)
+            assert not db.runs_inline("add_quiz", make_quiz())
+        finally:
+            db.close()
+
+    def test_slow_offloaded_call_does_not_block_the_loop(self):
+        store = AsyncQuizStorage(QuizDatabase())
+        release = threading.Event()
+
+        async def scenario():
+            slow = asyncio.ensure_future(store.run(release.wait, 5))
+            quiz_id = await store.add_quiz(make_quiz())
+            # The loop kept serving while the slow call was still running
+            served = (await store.get_quiz(quiz_id)) is not None and not slow.done()
+            release.set()
+            await slow
+            return served
+
+        assert asyncio.run(scenario()) is True
@@ -0,0 +1,71 @@
+import pytest
+from src.quiz import Quiz
+from src.question import Question
+
+np = pytest.importorskip("numpy")
+from src.columnar import ColumnarQuiz, UNANSWERED, UNKNOWN_ANSWER  # noqa: E402
+
+
+@pytest.fixture
+def quiz():
+    quiz = Quiz(title="Columnar Quiz", quiz_id="quiz-1")
+    quiz.add_question(Question("Bio1?", ["A", "B"], "A", "easy", category="Biology"))
+    quiz.add_question(Question("Bio2?", ["C", "D"], "D", "hard", category="Biology"))
+    quiz.add_question(Question("Chem?", ["E", "F"], "E", "easy", category="Chemistry"))
+    return quiz
+
+
+class TestColumnarQuiz:
+    """Tests for vectorized batch scoring"""
+
+    def test_encode_answers(self, quiz):
+        columnar = ColumnarQuiz(quiz)
+        matrix = columnar.encode_answers([{0: "B", 2: "nonsense"}, {}])
+        assert matrix.tolist() == [
+            [1, UNANSWERED, UNKNOWN_ANSWER],
+            [UNANSWERED, UNANSWERED, UNANSWERED],
+        ]
+
+    def test_scores_match_quiz_scoring(self, quiz):
+        attempts = [{0: "A", 1: "D", 2: "E"}, {0: "B", 1: "D"}, {2: "F"}, {}]
+        expected = []
+        for answers in attempts:
+            session = quiz.snapshot(include_answers=False)
+            for index, answer in answers.items():
+                session.submit_answer(index, answer)
+            expected.append(session.get_result())
+
+        batch = ColumnarQuiz(quiz).score_attempts(attempts)
+
+        assert batch.scores.tolist() == [result.score for result in expected]
+        assert batch.percentages.tolist() == [result.percentage for result in expected]
+        assert batch.passing.tolist() == [result.is_passing() for result in expected]
+        assert [r.score for r in batch.to_results()] == [r.score for r in expected]
+
+    def test_category_and_difficulty_breakdown(self, quiz):
+        batch = ColumnarQuiz(quiz).score_attempts([{0: "A", 1: "C", 2: "E"}])
+
+        assert batch.categories == ("Biology", "Chemistry")
+        assert batch.category_scores.tolist() == [[1, 1]]
+        assert batch.category_totals.tolist() == [2, 1]
+        assert batch.difficulties == ("easy", "hard")
+        assert batch.difficulty_scores.tolist() == [[2, 0]]
+        assert batch.difficulty_totals.tolist() == [2, 1]
+
+    def test_correct_answer_outside_options_still_scores(self):
+        quiz = Quiz(title="Free Answer Quiz")
+        quiz.add_question(Question("Q?", ["A", "B"], "Z"))
+        batch = ColumnarQuiz(quiz).score_attempts([{0: "Z"}, {0: "A"}])
+        assert batch.scores.tolist() == [1, 0]
+
+    def test_custom_threshold(self, quiz):
+        batch = ColumnarQuiz(quiz).score_attempts([{0: "A", 1: "D"}], threshold=70)
+        assert batch.passing.tolist() == [False]
+
+    def test_empty_quiz_scores_zero_percent(self):
+        batch = ColumnarQuiz(Quiz(title="Empty")).score_attempts([{}, {}])
+        assert batch.percentages.tolist() == [0.0, 0.0]
+
+    def test_score_rejects_mismatched_matrix(self, quiz):
+        with pytest.raises(ValueError):
+            ColumnarQuiz(quiz).score(np.zeros((2, 5), dtype=np.int32))
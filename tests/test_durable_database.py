@@ -0,0 +1,290 @@
+import os
+import time
+import pytest
+from src.durable_database import SNAPSHOT_FILE, DurableQuizDatabase
+from src.question_bank import question_id
+from src.storage import AttemptClosedError, create_database
+from src.quiz import Quiz
+from src.question import Question
+
+
+@pytest.fixture
+def directory(tmp_path):
+    return str(tmp_path / "quizzes.wal")
+
+
+def make_quiz(title="Durable Quiz"):
+    quiz = Quiz(title=title, time_limit_seconds=600)
+    quiz.add_question(Question("Q1?", ["A", "B"], "A", difficulty="easy", category="Letters"))
+    quiz.add_question(Question("Q2?", ["C", "D"], "C"))
+    return quiz
+
+
+def reopen(database, directory, **kwargs):
+    """Close a database and open its directory again, as after a restart"""
+    database.close()
+    return DurableQuizDatabase(directory, **kwargs)
+
+
+class TestDurableQuizDatabase:
+    """Tests for recovering the in-memory store from its write-ahead log"""
+
+    def test_quizzes_survive_reopen(self, directory):
+        db = DurableQuizDatabase(directory)
+        first = db.add_quiz(make_quiz("First"))
+        second, third = db.add_quizzes([make_quiz("Second"), make_quiz("Third")])
+        db.delete_quiz(second)
+
+        db = reopen(db, directory)
+        assert [summary.title for summary in db.list_quiz_summaries()[0]] == ["First", "Third"]
+        assert db.get_quiz(first).questions[0].category == "Letters"
+        assert db.get_quiz(third).time_limit_seconds == 600
+        db.close()
+
+    def test_updates_and_answers_survive_reopen(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        quiz = db.get_quiz(quiz_id)
+        quiz.submit_answer(0, "A")
+        db.update_quiz(quiz_id, quiz)
+        quiz = db.get_quiz(quiz_id)
+        quiz.title = "Renamed"
+        quiz.add_question(Question("Q3?", ["E", "F"], "F"))
+        db.update_quiz(quiz_id, quiz)
+
+        db = reopen(db, directory)
+        stored = db.get_quiz(quiz_id)
+        assert (stored.title, stored.version, len(stored.questions)) == ("Renamed", 3, 3)
+        assert stored.answers == {0: "A"}
+        db.close()
+
+    def test_attempts_survive_reopen(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+        db.submit_attempt_answer(attempt_id, 0, "A")
+        db.submit_attempt_answers(attempt_id, [(1, 1)])
+        start_time = db.get_attempt(attempt_id).start_time
+
+        db = reopen(db, directory)
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.answers == {0: "A", 1: "D"}
+        assert attempt.get_result().score == 1
+        assert attempt.start_time == start_time
+        db.close()
+
+    def test_attempt_deadline_survives_reopen(self, directory, monkeypatch):
+        db = DurableQuizDatabase(directory)
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+        db.submit_attempt_answer(attempt_id, 0, "A")
+        start_time = db.get_attempt(attempt_id).start_time
+
+        # Restart after the 600 second limit has run out on the wall clock
+        monkeypatch.setattr(time, "time", lambda: start_time + 601)
+        db = reopen(db, directory)
+        with pytest.raises(AttemptClosedError):
+            db.submit_attempt_answer(attempt_id, 1, "C")
+        assert db.close_expired_attempts() == 0  # Already closed by the rejected answer
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.closed
+        assert attempt.answers == {0: "A"}
+        db.close()
+
+    def test_shuffled_attempt_order_survives_reopen_and_checkpoint(self, directory):
+        db = DurableQuizDatabase(directory)
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()), shuffle=True)
+        seed = db.get_attempt(attempt_id).seed
+        answer = db.get_attempt(attempt_id).unshuffle_answer(0, 1)
+        db.submit_attempt_answer(attempt_id, 0, 1)
+
+        db = reopen(db, directory)
+        assert db.get_attempt(attempt_id).seed == seed
+        db.checkpoint()
+        db = reopen(db, directory)
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.seed == seed
+        index, option = answer
+        assert attempt.answers == {index: attempt.quiz.questions[index].options[option]}
+        db.close()
+
+    def test_bank_and_clear_survive_reopen(self, directory):
+        db = DurableQuizDatabase(directory)
+        db.add_quiz(make_quiz())
+        db.clear()
+        (question_id,) = db.add_bank_questions([Question("Q9?", ["Y", "N"], "Y")])
+
+        db = reopen(db, directory)
+        assert len(db) == 0
+        assert db.get_bank_questions([question_id])[0].text == "Q9?"
+        db.close()
+
+    def test_torn_tail_is_truncated(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        segment = db._log.path
+        db.close()
+        intact_size = os.path.getsize(segment)
+        with open(segment, "ab") as log_file:
+            log_file.write(b"\x20\x00\x00\x00partial")
+
+        db = DurableQuizDatabase(directory)
+        assert db.get_quiz(quiz_id) is not None
+        assert os.path.getsize(segment) == intact_size
+        db.add_quiz(make_quiz("After"))
+
+        db = reopen(db, directory)
+        assert len(db) == 2
+        db.close()
+
+
+class TestDurableSnapshots:
+    """Tests for compacting the log into snapshots"""
+
+    def test_checkpoint_replaces_log_with_snapshot(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+        db.submit_attempt_answer(attempt_id, 0, "B")
+        db.checkpoint()
+        db.add_quiz(make_quiz("After snapshot"))
+
+        assert os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+        assert len([name for name in os.listdir(directory) if name.startswith("wal-")]) == 1
+
+        db = reopen(db, directory)
+        assert len(db) == 2
+        assert db.get_attempt(attempt_id).answers == {0: "B"}
+        assert db.get_stats()["bank_questions"] == 2
+        db.close()
+
+    def test_attempt_keeps_questions_of_old_quiz_version(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+        db.update_quiz(quiz_id, Quiz(title="Emptied"))
+        db.checkpoint()
+
+        db = reopen(db, directory)
+        assert db.get_stats()["bank_questions"] == 0  # Only the attempt uses them
+        assert len(db.get_attempt(attempt_id).quiz.questions) == 2
+        assert len(db.get_quiz(quiz_id).questions) == 0
+        db.close()
+
+    def test_snapshot_taken_after_enough_records(self, directory):
+        db = DurableQuizDatabase(directory, fsync=False, snapshot_every=3)
+        quiz_ids = db.add_quizzes(make_quiz(f"Quiz {i}") for i in range(3))
+        for quiz_id in quiz_ids:
+            db.start_attempt(quiz_id)
+        db.close()  # Waits for the background snapshot
+
+        assert os.path.exists(os.path.join(directory, SNAPSHOT_FILE))
+        db = DurableQuizDatabase(directory)
+        assert len(db) == 3
+        assert db.get_stats()["attempts"] == 3
+        db.close()
+
+    def test_create_database_durable_backend(self, directory):
+        db = create_database("durable", directory)
+        assert isinstance(db, DurableQuizDatabase)
+        db.close()
+
+
+class TestDurableLazyRestore:
+    """Tests for serving from a mapped snapshot before decoding it"""
+
+    @pytest.fixture
+    def restored(self, directory):
+        db = DurableQuizDatabase(directory)
+        quiz_ids = db.add_quizzes(make_quiz(f"Quiz {i}") for i in range(3))
+        attempt_id = db.start_attempt(quiz_ids[0])
+        db.submit_attempt_answer(attempt_id, 1, "D")
+        (bank_id,) = db.add_bank_questions([Question("Bank only?", ["Y", "N"], "N")])
+        db.checkpoint()
+        db = reopen(db, directory)
+        yield db, quiz_ids, attempt_id, bank_id
+        db.close()
+
+    def test_listing_does_not_decode_quizzes(self, restored):
+        db, quiz_ids, _, _ = restored
+        summaries, _ = db.list_quiz_summaries()
+
+        assert [summary.quiz_id for summary in summaries] == quiz_ids
+        assert summaries[0].question_count == 2
+        assert db._storage.loaded_values() == []
+        assert db.get_stats()["quizzes"] == 3
+        assert db._storage.loaded_values() == []
+
+    def test_quizzes_and_attempts_decode_on_first_read(self, restored):
+        db, quiz_ids, attempt_id, _ = restored
+
+        assert db.get_quiz(quiz_ids[1]).questions[0].category == "Letters"
+        assert len(db._storage.loaded_values()) == 1
+        assert db.get_attempt(attempt_id).answers == {1: "D"}
+        assert db.get_quiz(quiz_ids[0]).questions[0] is db.get_quiz(quiz_ids[2]).questions[0]
+
+    def test_bank_questions_decode_on_first_read(self, restored):
+        db, _, _, bank_id = restored
+
+        assert db.get_bank_questions([bank_id])[0].text == "Bank only?"
+        assert db.get_stats()["bank_questions"] == 3
+
+    def test_quiz_question_ids_resolve_after_reopen(self, restored, directory):
+        db, quiz_ids, _, _ = restored
+        first = question_id(make_quiz().questions[0])
+
+        assert db.get_bank_questions([first])[0].text == "Q1?"
+        db.checkpoint()
+        db = reopen(db, directory)
+        assert db.get_bank_questions([first])[0].text == "Q1?"
+        for quiz_id in quiz_ids:
+            db.delete_quiz(quiz_id)
+        with pytest.raises(KeyError):
+            db.get_bank_questions([first])
+        db.close()
+
+    def test_deferred_quiz_can_be_deleted_and_updated(self, restored, directory):
+        db, quiz_ids, attempt_id, _ = restored
+        db.delete_quiz(quiz_ids[0])
+        quiz = db.get_quiz(quiz_ids[1])
+        quiz.title = "Updated"
+        db.update_quiz(quiz_ids[1], quiz)
+
+        assert db.get_attempt(attempt_id) is None
+        db = reopen(db, directory)
+        assert [summary.title for summary in db.list_quiz_summaries()[0]] == ["Updated", "Quiz 2"]
+        db.close()
+
+    def test_checkpoint_after_lazy_restore_keeps_everything(self, restored, directory):
+        db, quiz_ids, attempt_id, bank_id = restored
+        db.checkpoint()
+
+        db = reopen(db, directory)
+        assert len(db) == 3
+        assert db.get_attempt(attempt_id).get_result().score == 0
+        assert db.get_bank_questions([bank_id])[0].correct_answer == "N"
+        db.close()
+
+    def test_checkpoint_drops_questions_of_deleted_quizzes(self, restored, directory):
+        db, quiz_ids, _, bank_id = restored
+        for quiz_id in quiz_ids:
+            db.delete_quiz(quiz_id)
+        db.checkpoint()
+
+        db = reopen(db, directory)
+        assert db.get_stats()["bank_questions"] == 1
+        assert db.get_bank_questions([bank_id])[0].text == "Bank only?"
+        db.close()
+
+    def test_clear_after_lazy_restore_drops_snapshot(self, restored, directory):
+        db, quiz_ids, attempt_id, bank_id = restored
+        db.clear()
+        db.checkpoint()
+
+        assert db.get_stats()["bank_questions"] == 0
+        db = reopen(db, directory)
+        assert len(db) == 0
+        assert db.get_stats()["bank_questions"] == 0
+        assert db.get_attempt(attempt_id) is None
+        with pytest.raises(KeyError):
+            db.get_bank_questions([bank_id])
+        db.close()
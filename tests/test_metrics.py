@@ -0,0 +1,73 @@
+import pytest
+from src.database import QuizDatabase
+from src.metrics import REGISTRY, STORAGE_SECONDS, MetricsRegistry
+from src.quiz import Quiz
+from src.question import Question
+
+
+@pytest.fixture
+def metrics_enabled(monkeypatch):
+    monkeypatch.setattr(REGISTRY, "enabled", True)
+
+
+class TestMetricsRegistry:
+    """Tests for metric recording and rendering"""
+
+    def test_counter_renders_with_labels(self):
+        registry = MetricsRegistry(enabled=True)
+        counter = registry.counter("requests_total", "Requests", ("route",))
+        counter.inc(("/quizzes",))
+        counter.inc(("/quizzes",))
+
+        assert counter.value(("/quizzes",)) == 2
+        assert 'requests_total{route="/quizzes"} 2' in registry.render()
+
+    def test_histogram_renders_cumulative_buckets(self):
+        registry = MetricsRegistry(enabled=True)
+        histogram = registry.histogram("latency_seconds", "Latency", ("route",))
+        histogram.observe(("/a",), 0.0002)
+        histogram.observe(("/a",), 3.0)
+
+        text = registry.render()
+        assert 'latency_seconds_bucket{route="/a",le="0.0005"} 1' in text
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 2' in text
+        assert 'latency_seconds_count{route="/a"} 2' in text
+
+    def test_label_values_are_escaped(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.counter("events_total", "Events", ("name",)).inc(('say "hi"',))
+        assert 'events_total{name="say \\"hi\\""} 1' in registry.render()
+
+    def test_collectors_are_rendered_as_gauges(self):
+        registry = MetricsRegistry(enabled=True)
+        registry.add_collector(lambda: [("store_quizzes", "Quizzes", 3)])
+        assert "# TYPE store_quizzes gauge\nstore_quizzes 3\n" in registry.render()
+
+
+class TestStorageMetrics:
+    """Tests for storage operation timings and stats"""
+
+    def test_storage_operations_are_timed_when_enabled(self, metrics_enabled):
+        db = QuizDatabase()
+        before = STORAGE_SECONDS.count(("QuizDatabase", "get_quiz"))
+        db.get_quiz(db.add_quiz(Quiz(title="Timed Quiz")))
+        assert STORAGE_SECONDS.count(("QuizDatabase", "get_quiz")) == before + 1
+
+    def test_storage_operations_are_not_timed_when_disabled(self):
+        db = QuizDatabase()
+        before = STORAGE_SECONDS.count(("QuizDatabase", "get_quiz"))
+        db.get_quiz(db.add_quiz(Quiz(title="Untimed Quiz")))
+        assert STORAGE_SECONDS.count(("QuizDatabase", "get_quiz")) == before
+
+    def test_get_stats_counts_objects_and_bytes(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Stats Quiz")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz.add_question(Question("Q2?", ["C", "D"], "C"))
+        db.start_attempt(db.add_quiz(quiz))
+
+        stats = db.get_stats()
+        assert stats["quizzes"] == 1
+        assert stats["questions"] == 2
+        assert stats["attempts"] == 1
+        assert stats["bytes"] > 0
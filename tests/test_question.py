@@ -1,3 +1,4 @@
+import pickle
 import pytest
 from src.question import Question
 
@@ -25,3 +26,46 @@ class TestQuestion:
     def test_question_requires_text(self):
         with pytest.raises(ValueError):
             Question(text="", options=["A", "B"], correct_answer="A")
+
+    def test_question_is_immutable(self):
+        question = Question(text="What is 2 + 2?", options=["3", "4"], correct_answer="4")
+        with pytest.raises(AttributeError):
+            question.text = "Changed"
+
+    def test_question_options_are_stored_as_tuple(self):
+        options = ["3", "4"]
+        question = Question(text="What is 2 + 2?", options=options, correct_answer="4")
+        options.append("5")
+        assert question.options == ("3", "4")
+
+    def test_question_has_no_instance_dict(self):
+        question = Question(text="What is 2 + 2?", options=["3", "4"], correct_answer="4")
+        assert not hasattr(question, "__dict__")
+
+    def test_category_and_difficulty_are_interned(self):
+        first = Question("Q1?", ["A", "B"], "A", "".join(["ha", "rd"]), "".join(["Ma", "th"]))
+        second = Question("Q2?", ["A", "B"], "A", "".join(["ha", "rd"]), "".join(["Ma", "th"]))
+        assert first.category is second.category
+        assert first.difficulty is second.difficulty
+
+    def test_question_pickle_round_trip(self):
+        question = Question("Q?", ["A", "B"], "A", difficulty="hard", category="Math")
+        restored = pickle.loads(pickle.dumps(question))
+        assert restored == question
+        assert restored.category == "Math"
+        assert restored.difficulty == "hard"
+
+    def test_correct_answer_index_is_precomputed(self):
+        question = Question("Q?", ["A", "B", "C"], "B")
+        assert question.correct_index == 1
+        assert Question("Q?", ["A", "B"], "Z").correct_index is None
+
+    def test_check_answer_index(self):
+        question = Question("Q?", ["A", "B", "C"], "B")
+        assert question.check_answer_index(1) is True
+        assert question.check_answer_index(0) is False
+        assert question.option_index("C") == 2
+        with pytest.raises(ValueError):
+            question.check_answer_index(3)
+        with pytest.raises(ValueError):
+            question.option_index("Z")
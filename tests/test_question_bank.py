@@ -0,0 +1,75 @@
+import pytest
+from src.question import Question
+from src.question_bank import QuestionBank, question_id
+from src.quiz import Quiz
+
+
+class TestQuestionBank:
+    """Tests for the content-addressed question bank"""
+
+    def test_same_content_gets_same_id(self):
+        first = Question("Q1?", ["A", "B"], "A", difficulty="easy", category="Letters")
+        second = Question("Q1?", ["A", "B"], "A", difficulty="easy", category="Letters")
+        assert question_id(first) == question_id(second)
+
+    def test_metadata_changes_the_id(self):
+        question = Question("Q1?", ["A", "B"], "A")
+        assert question_id(question) != question_id(Question("Q1?", ["A", "B"], "A", "hard"))
+        assert question_id(question) != question_id(
+            Question("Q1?", ["A", "B"], "A", category="Letters")
+        )
+
+    def test_add_deduplicates_by_content(self):
+        bank = QuestionBank()
+        ids = bank.add_many([Question("Q1?", ["A", "B"], "A"), Question("Q1?", ["A", "B"], "A")])
+        assert ids[0] == ids[1]
+        assert len(bank) == 1
+        assert ids[0] in bank
+
+    def test_intern_returns_the_stored_instance(self):
+        bank = QuestionBank()
+        stored = bank.intern(Question("Q1?", ["A", "B"], "A"))
+        assert bank.intern(Question("Q1?", ["A", "B"], "A")) is stored
+
+    def test_get_many_raises_for_unknown_id(self):
+        bank = QuestionBank()
+        known = bank.add(Question("Q1?", ["A", "B"], "A"))
+        assert bank.get_many([known])[0].text == "Q1?"
+        assert bank.get("missing") is None
+        with pytest.raises(KeyError):
+            bank.get_many([known, "missing"])
+
+    def test_release_removes_questions_no_quiz_uses(self):
+        bank = QuestionBank()
+        shared = bank.intern(Question("Q1?", ["A", "B"], "A"))
+        bank.intern(Question("Q1?", ["A", "B"], "A"))
+        pinned = bank.intern(Question("Q2?", ["C", "D"], "C"))
+        pinned_id = bank.add(pinned)
+
+        bank.release([shared, pinned])
+        assert len(bank) == 2
+        bank.release([shared])
+        assert bank.get(bank.content_id(shared)) is None
+        assert bank.get(pinned_id) is pinned
+        assert bank.is_pinned(pinned_id)
+
+    def test_clear_empties_the_bank(self):
+        bank = QuestionBank()
+        bank.add(Question("Q1?", ["A", "B"], "A"))
+        bank.clear()
+        assert len(bank) == 0
+
+
+class TestQuizShareQuestions:
+    """Tests for replacing quiz questions with shared instances"""
+
+    def test_share_questions_swaps_in_bank_instances(self):
+        bank = QuestionBank()
+        shared = bank.intern(Question("Q1?", ["A", "B"], "A"))
+        quiz = Quiz(title="Shared")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+
+        quiz.share_questions(bank.intern)
+        assert quiz.questions[0] is shared
+        quiz.submit_answer(0, "A")
+        assert quiz.get_result().score == 1
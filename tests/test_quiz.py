@@ -1,3 +1,4 @@
+import pytest
 from src.quiz import Quiz
 from src.question import Question
 
@@ -56,3 +57,54 @@ class TestQuiz:
         assert result.score == 1
         assert result.total == 2
         assert result.percentage == 50.0
+
+    def test_submit_answer_by_option_index(self):
+        quiz = Quiz(title="Test Quiz")
+        question = Question("Q1?", ["A", "B"], "B")
+        quiz.add_question(question)
+
+        quiz.submit_answer_index(0, 1)
+
+        assert quiz.get_result().score == 1
+        assert quiz.answers[0] is question.options[1]
+        with pytest.raises(ValueError):
+            quiz.submit_answer_index(0, 2)
+        with pytest.raises(IndexError):
+            quiz.submit_answer_index(3, 0)
+
+    def test_snapshot_is_isolated_from_original(self):
+        quiz = Quiz(title="Snapshot Quiz")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+
+        snapshot = quiz.snapshot()
+        snapshot.add_question(Question("Q2?", ["C", "D"], "C"))
+        snapshot.submit_answer(0, "A")
+
+        assert len(quiz.questions) == 1
+        assert len(quiz.answers) == 0
+        assert len(snapshot.questions) == 2
+        assert snapshot.answers[0] == "A"
+
+    def test_add_questions_in_bulk_skips_duplicates(self):
+        quiz = Quiz(title="Bulk Quiz")
+        q1 = Question("Q1?", ["A", "B"], "A")
+        q2 = Question("Q2?", ["C", "D"], "C")
+        quiz.add_question(q1)
+
+        quiz.add_questions([q1, q2, Question("Q2?", ["C", "D"], "C")])
+
+        assert quiz.questions == (q1, q2)
+
+    def test_questions_with_same_content_are_duplicates(self):
+        quiz = Quiz(title="Duplicate Quiz")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A", category="First"))
+        quiz.add_question(Question("Q1?", ["A", "B"], "A", category="Second"))
+        assert len(quiz.questions) == 1
+
+    def test_snapshot_keeps_duplicate_detection_isolated(self):
+        quiz = Quiz(title="Snapshot Quiz")
+        snapshot = quiz.snapshot()
+        snapshot.add_question(Question("Q1?", ["A", "B"], "A"))
+
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        assert len(quiz.questions) == 1
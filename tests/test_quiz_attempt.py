@@ -0,0 +1,283 @@
+import time
+import pytest
+from src.attempt import QuizAttempt
+from src.database import QuizDatabase
+from src.storage import AttemptClosedError
+from src.quiz import Quiz
+from src.question import Question
+
+
+def make_quiz():
+    quiz = Quiz(title="Attempt Quiz", quiz_id="quiz-1")
+    quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+    quiz.add_question(Question("Q2?", ["C", "D"], "C"))
+    return quiz
+
+
+class TestQuizAttempt:
+    """Tests for per-attempt answer sessions"""
+
+    def test_attempt_starts_timer_on_creation(self):
+        attempt = QuizAttempt(make_quiz(), attempt_id="attempt-1")
+        assert attempt.start_time is not None
+        assert attempt.quiz_id == "quiz-1"
+        assert len(attempt.answers) == 0
+
+    def test_attempt_answers_do_not_change_quiz(self):
+        quiz = make_quiz()
+        attempt = QuizAttempt(quiz)
+
+        attempt.submit_answer(0, "A")
+
+        assert len(attempt.answers) == 1
+        assert len(quiz.answers) == 0
+
+    def test_attempt_ignores_answers_already_on_quiz(self):
+        quiz = make_quiz()
+        quiz.submit_answer(0, "A")
+
+        attempt = QuizAttempt(quiz)
+        assert len(attempt.answers) == 0
+
+    def test_attempt_scores_its_own_answers(self):
+        attempt = QuizAttempt(make_quiz())
+
+        assert attempt.submit_answer(0, "A") is True
+        assert attempt.submit_answer(1, "D") is False
+
+        result = attempt.get_result()
+        assert result.score == 1
+        assert result.total == 2
+        assert attempt.get_incorrect_answers() == [1]
+
+    def test_attempt_rejects_invalid_question_index(self):
+        attempt = QuizAttempt(make_quiz())
+        with pytest.raises(IndexError):
+            attempt.submit_answer(5, "A")
+
+    def test_attempt_submits_answers_in_batch(self):
+        attempt = QuizAttempt(make_quiz())
+
+        assert attempt.submit_answers([(0, "A"), (1, "D")]) == [True, False]
+        assert attempt.get_result().score == 1
+
+    def test_attempt_batch_with_invalid_index_records_nothing(self):
+        attempt = QuizAttempt(make_quiz())
+
+        with pytest.raises(IndexError):
+            attempt.submit_answers([(0, "A"), (5, "A")])
+        assert len(attempt.answers) == 0
+
+    def test_attempt_accepts_option_indices(self):
+        attempt = QuizAttempt(make_quiz())
+
+        assert attempt.submit_answer(0, 0) is True
+        assert attempt.submit_answers([(1, 1)]) == [False]
+        assert attempt.answers == {0: "A", 1: "D"}
+        with pytest.raises(ValueError):
+            attempt.submit_answers([(0, 1), (1, 2)])
+        assert attempt.answers == {0: "A", 1: "D"}
+
+
+class TestQuizDatabaseAttempts:
+    """Tests for storing attempts separately from quizzes"""
+
+    def test_start_attempt_for_existing_quiz(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_quiz())
+
+        attempt_id = db.start_attempt(quiz_id)
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.id == attempt_id
+        assert attempt.quiz_id == quiz_id
+
+    def test_start_attempt_for_nonexistent_quiz(self):
+        db = QuizDatabase()
+        assert db.start_attempt("nonexistent_id") is None
+
+    def test_concurrent_attempts_are_independent(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_quiz())
+        first = db.start_attempt(quiz_id)
+        second = db.start_attempt(quiz_id)
+
+        db.submit_attempt_answer(first, 0, "A")
+        db.submit_attempt_answer(second, 0, "B")
+
+        assert db.get_attempt(first).get_result().score == 1
+        assert db.get_attempt(second).get_result().score == 0
+        assert len(db.get_quiz(quiz_id).answers) == 0
+
+    def test_modifying_retrieved_attempt_does_not_change_stored_attempt(self):
+        db = QuizDatabase()
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+
+        db.get_attempt(attempt_id).submit_answer(0, "A")
+
+        assert len(db.get_attempt(attempt_id).answers) == 0
+
+    def test_deleting_quiz_removes_its_attempts(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+
+        db.delete_quiz(quiz_id)
+        assert db.get_attempt(attempt_id) is None
+
+    def test_submit_attempt_answers_in_one_write(self):
+        db = QuizDatabase()
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+
+        assert db.submit_attempt_answers(attempt_id, [(0, "A"), (1, "C")]) == [True, True]
+        assert db.get_attempt(attempt_id).get_result().is_perfect()
+        with pytest.raises(KeyError):
+            db.submit_attempt_answers("nonexistent_id", [(0, "A")])
+
+
+def make_timed_quiz(time_limit_seconds):
+    quiz = make_quiz()
+    quiz.time_limit_seconds = time_limit_seconds
+    return quiz
+
+
+def advance_monotonic_clock(monkeypatch, seconds):
+    """Make time.monotonic() run ahead, as if seconds had passed"""
+    real_monotonic = time.monotonic
+    monkeypatch.setattr(time, "monotonic", lambda: real_monotonic() + seconds)
+
+
+class TestAttemptTimeLimits:
+    """Tests for server-enforced attempt deadlines"""
+
+    def test_timed_attempt_has_monotonic_deadline(self, monkeypatch):
+        attempt = QuizAttempt(make_timed_quiz(60))
+
+        assert attempt.expires_at == attempt.start_time + 60
+        assert not attempt.is_expired()
+        assert attempt.is_expired(attempt.deadline)
+        # Moving the wall clock does not move the deadline
+        monkeypatch.setattr(time, "time", lambda: attempt.start_time + 3600)
+        assert not attempt.is_expired()
+        advance_monotonic_clock(monkeypatch, 61)
+        assert attempt.is_expired()
+
+    def test_untimed_attempt_never_expires(self):
+        attempt = QuizAttempt(make_quiz())
+        assert attempt.deadline is None
+        assert attempt.expires_at is None
+        assert not attempt.is_expired()
+
+    def test_attempt_started_earlier_keeps_its_remaining_time(self):
+        attempt = QuizAttempt(make_timed_quiz(60), start_time=time.time() - 50)
+        assert 0 < attempt.deadline - time.monotonic() <= 10
+
+    def test_close_fixes_result(self):
+        attempt = QuizAttempt(make_timed_quiz(60))
+        attempt.submit_answer(0, "A")
+
+        result = attempt.close()
+
+        assert attempt.closed
+        assert attempt.close() is result
+        assert attempt.snapshot().closed
+        assert attempt.get_result().score == 1
+
+    def test_database_rejects_answers_after_deadline(self):
+        db = QuizDatabase()
+        attempt_id = db.start_attempt(db.add_quiz(make_timed_quiz(0)))
+
+        with pytest.raises(AttemptClosedError):
+            db.submit_attempt_answer(attempt_id, 0, "A")
+        with pytest.raises(AttemptClosedError):
+            db.submit_attempt_answers(attempt_id, [(0, "A")])
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.closed
+        assert len(attempt.answers) == 0
+
+    def test_database_closes_expired_attempts_in_bulk(self, monkeypatch):
+        db = QuizDatabase()
+        timed_id = db.add_quiz(make_timed_quiz(60))
+        timed = [db.start_attempt(timed_id) for _ in range(50)]
+        untimed = db.start_attempt(db.add_quiz(make_quiz()))
+        db.submit_attempt_answer(timed[0], 0, "A")
+
+        assert db.close_expired_attempts() == 0
+        advance_monotonic_clock(monkeypatch, 61)
+        assert db.close_expired_attempts() == 50
+        assert db.close_expired_attempts() == 0
+
+        assert all(db.get_attempt(attempt_id).closed for attempt_id in timed)
+        assert db.get_attempt(timed[0]).get_result().score == 1
+        assert not db.get_attempt(untimed).closed
+        db.submit_attempt_answer(untimed, 0, "A")
+
+    def test_deleting_quiz_cancels_attempt_deadlines(self, monkeypatch):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_timed_quiz(60))
+        db.start_attempt(quiz_id)
+
+        db.delete_quiz(quiz_id)
+        advance_monotonic_clock(monkeypatch, 61)
+        assert db.close_expired_attempts() == 0
+
+
+def correct_option_position(attempt, position):
+    """Return the option position, as presented by the attempt, of the correct answer"""
+    order = attempt.order
+    index = order.question_index(position)
+    question = attempt.quiz.questions[index]
+    correct = question.options.index(question.correct_answer)
+    return order.options(index, len(question.options)).index(correct)
+
+
+def make_long_quiz(question_count=12):
+    quiz = Quiz(title="Long Quiz")
+    for i in range(question_count):
+        quiz.add_question(Question(f"Q{i}?", [f"{i}-A", f"{i}-B", f"{i}-C"], f"{i}-A"))
+    return quiz
+
+
+class TestShuffledAttempts:
+    """Tests for attempts that present questions and options in their own order"""
+
+    def test_unshuffled_attempt_maps_answers_unchanged(self):
+        attempt = QuizAttempt(make_quiz())
+        assert attempt.order is None
+        assert attempt.unshuffle_answer(1, 0) == (1, 0)
+
+    def test_unshuffle_answer_maps_positions_to_quiz_indices(self):
+        attempt = QuizAttempt(make_long_quiz(), seed=1234)
+        order = attempt.order
+
+        index, answer = attempt.unshuffle_answer(4, 2)
+
+        assert index == order.question_index(4)
+        assert answer == order.options(index, 3)[2]
+        assert attempt.unshuffle_answer(4, "text") == (index, "text")
+        assert attempt.unshuffle_answer(4, 9) == (index, 9)  # Left for submit_answer to reject
+        with pytest.raises(IndexError):
+            attempt.unshuffle_answer(12, 0)
+
+    def test_database_maps_shuffled_answers_to_quiz_questions(self):
+        db = QuizDatabase()
+        attempt_id = db.start_attempt(db.add_quiz(make_long_quiz()), shuffle=True)
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.seed is not None
+
+        single = db.submit_attempt_answer(attempt_id, 0, correct_option_position(attempt, 0))
+        batch = db.submit_attempt_answers(
+            attempt_id,
+            [(position, correct_option_position(attempt, position)) for position in range(1, 12)],
+        )
+
+        assert single is True
+        assert batch == [True] * 11
+        assert db.get_attempt(attempt_id).get_result().is_perfect()
+
+    def test_shuffled_attempts_share_the_quiz_questions(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(make_long_quiz())
+        first = db.get_attempt(db.start_attempt(quiz_id, shuffle=True))
+        second = db.get_attempt(db.start_attempt(quiz_id, shuffle=True))
+
+        assert first.quiz.questions is second.quiz.questions
@@ -44,3 +44,34 @@ class TestQuizCategories:
         assert bio_score["score"] == 1
         assert bio_score["total"] == 2
         assert bio_score["percentage"] == 50.0
+
+    def test_quiz_get_score_breakdown(self):
+        quiz = Quiz(title="Categorized Quiz")
+        quiz.add_question(Question("Bio1?", ["A", "B"], "A", difficulty="easy", category="Biology"))
+        quiz.add_question(Question("Bio2?", ["C", "D"], "C", difficulty="hard", category="Biology"))
+        quiz.add_question(
+            Question("Chem?", ["E", "F"], "E", difficulty="easy", category="Chemistry")
+        )
+        quiz.add_question(Question("Misc?", ["G", "H"], "G", difficulty="easy"))
+
+        quiz.submit_answer(0, "A")  # Correct
+        quiz.submit_answer(1, "D")  # Incorrect
+        quiz.submit_answer(2, "E")  # Correct
+
+        breakdown = quiz.get_score_breakdown()
+        assert breakdown["categories"]["Biology"] == quiz.get_score_by_category("Biology")
+        assert breakdown["categories"]["Chemistry"]["score"] == 1
+        assert breakdown["categories"][None] == {"score": 0, "total": 1, "percentage": 0.0}
+        assert breakdown["difficulties"]["easy"]["score"] == 2
+        assert breakdown["difficulties"]["easy"]["total"] == 3
+        assert breakdown["difficulties"]["hard"]["score"] == 0
+
+    def test_snapshot_keeps_category_index_isolated(self):
+        quiz = Quiz(title="Snapshot Quiz")
+        quiz.add_question(Question("Bio1?", ["A", "B"], "A", category="Biology"))
+        snapshot = quiz.snapshot()
+
+        snapshot.add_question(Question("Bio2?", ["C", "D"], "C", category="Biology"))
+
+        assert len(quiz.get_questions_by_category("Biology")) == 1
+        assert len(snapshot.get_questions_by_category("Biology")) == 2
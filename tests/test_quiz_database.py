@@ -1,4 +1,7 @@
+import threading
+import pytest
 from src.database import QuizDatabase
+from src.storage import VersionConflictError
 from src.quiz import Quiz
 from src.question import Question
 
@@ -126,3 +129,215 @@ class TestQuizDatabase:
         # Verify ID is still the same
         retrieved = db.get_quiz(quiz_id)
         assert retrieved.id == quiz_id
+
+    def test_modifying_retrieved_quiz_does_not_change_stored_quiz(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Original")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz_id = db.add_quiz(quiz)
+
+        retrieved = db.get_quiz(quiz_id)
+        retrieved.title = "Changed"
+        retrieved.add_question(Question("Q2?", ["C", "D"], "C"))
+        retrieved.submit_answer(0, "A")
+
+        stored = db.get_quiz(quiz_id)
+        assert stored.title == "Original"
+        assert len(stored.questions) == 1
+        assert len(stored.answers) == 0
+
+    def test_modifying_added_quiz_does_not_change_stored_quiz(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Original")
+        quiz_id = db.add_quiz(quiz)
+
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+
+        assert len(db.get_quiz(quiz_id).questions) == 0
+
+    def test_retrieved_quizzes_share_question_objects(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Shared")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz_id = db.add_quiz(quiz)
+
+        first = db.get_quiz(quiz_id)
+        second = db.get_quiz(quiz_id)
+        assert first.questions[0] is second.questions[0]
+
+    def test_list_quiz_summaries(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Summary Quiz", time_limit_seconds=60)
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz_id = db.add_quiz(quiz)
+
+        summaries, next_cursor = db.list_quiz_summaries()
+        assert next_cursor is None
+        assert summaries[0].quiz_id == quiz_id
+        assert summaries[0].title == "Summary Quiz"
+        assert summaries[0].time_limit_seconds == 60
+        assert summaries[0].question_count == 1
+
+    def test_list_quiz_summaries_in_pages(self):
+        db = QuizDatabase()
+        ids = [db.add_quiz(Quiz(title=f"Quiz {i}")) for i in range(5)]
+        db.delete_quiz(ids[1])
+
+        first_page, cursor = db.list_quiz_summaries(limit=2)
+        second_page, cursor = db.list_quiz_summaries(limit=2, cursor=cursor)
+
+        assert [s.quiz_id for s in first_page] == [ids[0], ids[2]]
+        assert [s.quiz_id for s in second_page] == [ids[3], ids[4]]
+        assert cursor is None
+
+    def test_page_ending_on_a_quiz_deleted_meanwhile(self, monkeypatch):
+        db = QuizDatabase()
+        ids = db.add_quizzes(Quiz(title=f"Quiz {i}") for i in range(3))
+        summary = db._summary
+
+        def summary_then_delete(quiz_id):
+            found = summary(quiz_id)
+            if quiz_id == ids[1]:
+                db.delete_quiz(quiz_id)  # As by another thread, after the page has it
+            return found
+
+        monkeypatch.setattr(db, "_summary", summary_then_delete)
+        first_page, cursor = db.list_quiz_summaries(limit=2)
+        second_page, _ = db.list_quiz_summaries(limit=2, cursor=cursor)
+
+        assert [s.quiz_id for s in first_page] == ids[:2]
+        assert [s.quiz_id for s in second_page] == [ids[2]]
+
+    def test_listing_while_cleared(self, monkeypatch):
+        db = QuizDatabase()
+        ids = db.add_quizzes(Quiz(title=f"Quiz {i}") for i in range(3))
+        summary = db._summary
+
+        def summary_then_clear(quiz_id):
+            found = summary(quiz_id)
+            if quiz_id == ids[0]:
+                db.clear()  # As by another thread, while the listing runs
+            return found
+
+        monkeypatch.setattr(db, "_summary", summary_then_clear)
+        summaries, cursor = db.list_quiz_summaries()
+
+        assert [s.quiz_id for s in summaries] == ids[:1]
+        assert cursor is None
+
+    def test_add_quizzes_and_iterate(self):
+        db = QuizDatabase()
+        quiz_ids = db.add_quizzes(Quiz(title=f"Quiz {i}") for i in range(5))
+
+        assert len(db) == 5
+        assert [quiz.id for quiz in db.iter_quizzes(page_size=2)] == quiz_ids
+
+
+class TestQuizDatabaseConcurrency:
+    """Tests for quiz versions and concurrent access"""
+
+    def test_quiz_version_increments_on_update(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(Quiz(title="Versioned"))
+        assert db.get_quiz(quiz_id).version == 1
+
+        db.update_quiz(quiz_id, Quiz(title="Updated"))
+        assert db.get_quiz(quiz_id).version == 2
+
+    def test_update_with_stale_version_raises_conflict(self):
+        db = QuizDatabase()
+        quiz_id = db.add_quiz(Quiz(title="Versioned"))
+        first = db.get_quiz(quiz_id)
+        second = db.get_quiz(quiz_id)
+
+        db.update_quiz(quiz_id, first, expected_version=first.version)
+        with pytest.raises(VersionConflictError):
+            db.update_quiz(quiz_id, second, expected_version=second.version)
+
+    def test_concurrent_conditional_updates_lose_no_answers(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Concurrent")
+        quiz.add_questions(Question(f"Q{i}?", ["A", "B"], "A") for i in range(20))
+        quiz_id = db.add_quiz(quiz)
+
+        def answer(index):
+            while True:
+                current = db.get_quiz(quiz_id)
+                current.submit_answer(index, "A")
+                try:
+                    db.update_quiz(quiz_id, current, expected_version=current.version)
+                    return
+                except VersionConflictError:
+                    continue
+
+        threads = [threading.Thread(target=answer, args=(i,)) for i in range(20)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.get_quiz(quiz_id).get_result().score == 20
+
+    def test_concurrent_attempt_answers_are_all_recorded(self):
+        db = QuizDatabase()
+        quiz = Quiz(title="Concurrent")
+        quiz.add_questions(Question(f"Q{i}?", ["A", "B"], "A") for i in range(50))
+        attempt_id = db.start_attempt(db.add_quiz(quiz))
+
+        threads = [
+            threading.Thread(target=db.submit_attempt_answer, args=(attempt_id, i, "A"))
+            for i in range(50)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert db.get_attempt(attempt_id).get_result().score == 50
+
+
+class TestQuizDatabaseQuestionBank:
+    """Tests for questions shared through the in-memory question bank"""
+
+    def test_quizzes_with_same_question_share_one_instance(self):
+        db = QuizDatabase()
+        first, second = Quiz(title="First"), Quiz(title="Second")
+        first.add_question(Question("Q1?", ["A", "B"], "A"))
+        second.add_question(Question("Q1?", ["A", "B"], "A"))
+        first_id, second_id = db.add_quizzes([first, second])
+
+        assert db.get_quiz(first_id).questions[0] is db.get_quiz(second_id).questions[0]
+        assert db.get_stats()["bank_questions"] == 1
+
+    def test_bank_questions_round_trip(self):
+        db = QuizDatabase()
+        question_ids = db.add_bank_questions([Question("Q1?", ["A", "B"], "A")])
+
+        assert db.get_bank_questions(question_ids)[0].text == "Q1?"
+        with pytest.raises(KeyError):
+            db.get_bank_questions(["missing"])
+
+    def test_clear_empties_the_bank(self):
+        db = QuizDatabase()
+        db.add_bank_questions([Question("Q1?", ["A", "B"], "A")])
+        db.clear()
+        assert db.get_stats()["bank_questions"] == 0
+
+    def test_deleting_or_replacing_quizzes_frees_their_questions(self):
+        db = QuizDatabase()
+        (banked_id,) = db.add_bank_questions([Question("Q1?", ["A", "B"], "A")])
+        first, second = Quiz(title="First"), Quiz(title="Second")
+        first.add_questions([Question("Q1?", ["A", "B"], "A"), Question("Q2?", ["C", "D"], "C")])
+        second.add_question(Question("Q2?", ["C", "D"], "C"))
+        first_id, second_id = db.add_quizzes([first, second])
+        assert db.get_stats()["bank_questions"] == 2
+
+        db.delete_quiz(first_id)
+        assert db.get_stats()["bank_questions"] == 2
+        replacement = Quiz(title="Second")
+        replacement.add_question(Question("Q3?", ["E", "F"], "E"))
+        db.update_quiz(second_id, replacement)
+        assert db.get_bank_questions([banked_id])[0].text == "Q1?"
+        assert [q.text for q in db._bank] == ["Q1?", "Q3?"]
+        db.delete_quiz(second_id)
+        assert db.get_stats()["bank_questions"] == 1
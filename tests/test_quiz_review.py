@@ -35,3 +35,40 @@ class TestQuizReview:
         assert details["submitted_answer"] == "8"
         assert details["correct_answer"] == "10"
         assert details["is_correct"] is False
+
+    def test_overwritten_answers_update_score_and_review(self):
+        quiz = Quiz(title="Overwrite Quiz")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz.add_question(Question("Q2?", ["C", "D"], "C"))
+
+        quiz.submit_answer(0, "B")  # Incorrect
+        quiz.submit_answer(0, "A")  # Corrected
+        quiz.submit_answer(1, "C")  # Correct
+        quiz.submit_answer(1, "D")  # Changed to incorrect
+        quiz.submit_answer(1, "D")  # Same answer again
+
+        assert quiz.get_result().score == 1
+        assert quiz.get_incorrect_answers() == [1]
+
+    def test_answer_submitted_before_question_is_scored_once_added(self):
+        quiz = Quiz(title="Late Question Quiz")
+        quiz.submit_answer(0, "A")
+        assert quiz.get_incorrect_answers() == [0]
+
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+
+        assert quiz.get_result().score == 1
+        assert quiz.get_incorrect_answers() == []
+
+    def test_snapshot_keeps_running_score_isolated(self):
+        quiz = Quiz(title="Snapshot Quiz")
+        quiz.add_question(Question("Q1?", ["A", "B"], "A"))
+        quiz.submit_answer(0, "B")
+
+        snapshot = quiz.snapshot()
+        snapshot.submit_answer(0, "A")
+
+        assert quiz.get_result().score == 0
+        assert quiz.get_incorrect_answers() == [0]
+        assert snapshot.get_result().score == 1
+        assert snapshot.get_incorrect_answers() == []
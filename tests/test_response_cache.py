@@ -0,0 +1,36 @@
+from src.response_cache import ResponseCache
+
+
+class TestResponseCache:
+    """Tests for the per-version response body cache"""
+
+    def test_get_returns_cached_body_for_same_version(self):
+        cache = ResponseCache()
+        cache.put("quiz-1", 1, b"{}")
+        assert cache.get("quiz-1", 1) == b"{}"
+
+    def test_get_misses_for_other_version(self):
+        cache = ResponseCache()
+        cache.put("quiz-1", 1, b"{}")
+        assert cache.get("quiz-1", 2) is None
+
+    def test_invalidate_and_clear_remove_entries(self):
+        cache = ResponseCache()
+        cache.put("quiz-1", 1, b"{}")
+        cache.put("quiz-2", 1, b"{}")
+
+        cache.invalidate("quiz-1")
+        assert cache.get("quiz-1", 1) is None
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_least_recently_used_entry_is_evicted(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("quiz-1", 1, b"1")
+        cache.put("quiz-2", 1, b"2")
+        cache.get("quiz-1", 1)
+
+        cache.put("quiz-3", 1, b"3")
+
+        assert cache.get("quiz-2", 1) is None
+        assert cache.get("quiz-1", 1) == b"1"
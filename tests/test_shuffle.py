@@ -0,0 +1,50 @@
+import pytest
+from src.shuffle import AttemptOrder, Permutation, new_seed
+
+
+class TestPermutation:
+    """Tests for seeded permutations computed one index at a time"""
+
+    @pytest.mark.parametrize("size", [1, 2, 3, 4, 5, 7, 16, 17, 100, 1000])
+    def test_is_a_permutation_with_an_inverse(self, size):
+        for seed in range(10):
+            permutation = Permutation(size, seed)
+            values = list(permutation)
+            assert sorted(values) == list(range(size))
+            assert [permutation.index(value) for value in values] == list(range(size))
+
+    def test_same_seed_gives_same_order(self):
+        assert list(Permutation(50, 42)) == list(Permutation(50, 42))
+        assert list(Permutation(50, 42)) != list(Permutation(50, 43))
+
+    def test_every_order_of_small_sizes_occurs(self):
+        orders = {tuple(Permutation(3, seed)) for seed in range(200)}
+        assert len(orders) == 6
+
+    def test_out_of_range_lookups_raise(self):
+        permutation = Permutation(5, 1)
+        with pytest.raises(IndexError):
+            permutation[5]
+        with pytest.raises(ValueError):
+            permutation.index(-1)
+        assert list(Permutation(0, 1)) == []
+
+    def test_new_seed_is_an_int(self):
+        assert isinstance(new_seed(), int)
+
+
+class TestAttemptOrder:
+    """Tests for the question and option order of a shuffled attempt"""
+
+    def test_question_positions_invert_question_indices(self):
+        order = AttemptOrder(seed=9, question_count=20)
+        indices = [order.question_index(position) for position in (3, 11, 7)]
+
+        assert order.question_positions(indices) == [3, 7, 11]
+
+    def test_each_question_has_its_own_option_order(self):
+        order = AttemptOrder(seed=9, question_count=20)
+        option_orders = {tuple(order.options(index, 4)) for index in range(20)}
+
+        assert len(option_orders) > 1
+        assert list(order.options(5, 4)) == list(order.options(5, 4))
@@ -0,0 +1,110 @@
+import pytest
+from src.attempt import QuizAttempt
+from src.question import Question
+from src.question_bank import question_id
+from src.quiz import Quiz
+from src.snapshot import DeferredDict, Snapshot, encode_question, encode_quiz, write_snapshot
+from src.wal import write_records
+
+
+@pytest.fixture
+def snapshot_path(tmp_path):
+    return str(tmp_path / "snapshot.qlog")
+
+
+def make_state():
+    questions = [Question("Q1?", ["A", "B"], "A"), Question("Q2?", ["C", "D"], "D", "hard")]
+    quiz = Quiz(title="Indexed", time_limit_seconds=60, quiz_id="quiz-1")
+    quiz.add_questions(questions)
+    attempt = QuizAttempt(quiz, "attempt-1")
+    return questions, quiz, attempt
+
+
+class TestSnapshotFile:
+    """Tests for writing snapshots and reading them through their index"""
+
+    def test_index_lists_headers_without_decoding(self, snapshot_path):
+        questions, quiz, attempt = make_state()
+        ids = [question_id(q) for q in questions]
+        write_snapshot(snapshot_path, 7, questions, ids, [quiz], [attempt])
+
+        snapshot = Snapshot(snapshot_path)
+        assert snapshot.next_segment == 7
+        assert snapshot.question_ids == ids
+        assert snapshot.quizzes[0][:4] == ("quiz-1", "Indexed", 60, 2)
+        assert snapshot.attempts[0][:2] == ("attempt-1", "quiz-1")
+        snapshot.close()
+
+    def test_records_decode_on_demand(self, snapshot_path):
+        questions, quiz, attempt = make_state()
+        write_snapshot(snapshot_path, 0, questions, ["a", "b"], [quiz], [attempt])
+
+        snapshot = Snapshot(snapshot_path)
+        assert snapshot.question(1) == questions[1]
+        assert snapshot.record(snapshot.quizzes[0].offset)[:2] == ["quiz", "quiz-1"]
+        snapshot.close()
+
+    def test_snapshot_of_another_format_is_rejected(self, snapshot_path):
+        questions, quiz, _ = make_state()
+        write_records(
+            snapshot_path,
+            [
+                ["snapshot", 1, 3],
+                ["question", encode_question(questions[0])],
+                ["quiz", "quiz-1", encode_quiz(quiz, [0])],
+            ],
+        )
+
+        with pytest.raises(ValueError):
+            Snapshot(snapshot_path)
+
+    def test_truncated_snapshot_is_rejected(self, snapshot_path):
+        questions, quiz, attempt = make_state()
+        write_snapshot(snapshot_path, 0, questions, ["a", "b"], [quiz], [attempt])
+        with open(snapshot_path, "r+b") as snapshot_file:
+            snapshot_file.truncate(snapshot_file.seek(0, 2) - 5)
+
+        with pytest.raises(ValueError):
+            Snapshot(snapshot_path)
+
+
+class TestDeferredDict:
+    """Tests for the dict that loads deferred values on first access"""
+
+    @pytest.fixture
+    def loads(self):
+        return []
+
+    @pytest.fixture
+    def values(self, loads):
+        def load(key, token):
+            loads.append(key)
+            return token * 2
+
+        deferred = DeferredDict(load)
+        deferred.defer("a", 1)
+        deferred.defer("b", 2)
+        deferred["c"] = 3
+        return deferred
+
+    def test_deferred_keys_are_present_but_not_loaded(self, values, loads):
+        assert "a" in values and len(values) == 3
+        assert values.loaded_values() == [3]
+        assert loads == []
+
+    def test_values_load_once_on_access(self, values, loads):
+        assert values.get("a") == 2
+        assert values["a"] == 2
+        assert values.get("missing") is None
+        assert loads == ["a"]
+
+    def test_pop_and_delete_deferred_keys(self, values):
+        assert values.pop("a") == 2
+        del values["b"]
+        assert "a" not in values and "b" not in values
+        assert len(values) == 1
+
+    def test_values_load_everything(self, values, loads):
+        assert sorted(values.values()) == [2, 3, 4]
+        assert sorted(loads) == ["a", "b"]
+        assert values.deferred_tokens() == []
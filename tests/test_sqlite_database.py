@@ -0,0 +1,334 @@
+import multiprocessing
+import pytest
+from src.sqlite_database import SQLiteQuizDatabase
+from src.storage import AttemptClosedError, QuizStorage, VersionConflictError, create_database
+from src.quiz import Quiz
+from src.question import Question
+from src.question_bank import question_id as content_id
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "quizzes.db")
+
+
+@pytest.fixture
+def db(db_path):
+    database = SQLiteQuizDatabase(db_path)
+    yield database
+    database.close()
+
+
+def add_quizzes_in_process(path, count):
+    """Add quizzes from a separate process, like a uvicorn worker would"""
+    database = SQLiteQuizDatabase(path)
+    for _ in range(count):
+        database.add_quiz(make_quiz())
+    database.close()
+
+
+def make_quiz():
+    quiz = Quiz(title="Stored Quiz", time_limit_seconds=600)
+    quiz.add_question(Question("Q1?", ["A", "B"], "A", difficulty="easy", category="Letters"))
+    quiz.add_question(Question("Q2?", ["C", "D"], "C"))
+    return quiz
+
+
+class TestSQLiteQuizDatabase:
+    """Tests for SQLite-backed database CRUD operations"""
+
+    def test_read_quiz_from_database(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+
+        retrieved = db.get_quiz(quiz_id)
+        assert retrieved.id == quiz_id
+        assert retrieved.title == "Stored Quiz"
+        assert retrieved.time_limit_seconds == 600
+        assert retrieved.questions[0] == Question("Q1?", ["A", "B"], "A")
+        assert retrieved.questions[0].category == "Letters"
+        assert retrieved.questions[0].difficulty == "easy"
+
+    def test_quiz_survives_reopening_database(self, db_path):
+        first = SQLiteQuizDatabase(db_path)
+        quiz_id = first.add_quiz(make_quiz())
+        first.close()
+
+        second = SQLiteQuizDatabase(db_path)
+        assert second.get_quiz(quiz_id).title == "Stored Quiz"
+        assert len(second) == 1
+        second.close()
+
+    def test_update_quiz_in_database(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+
+        quiz = db.get_quiz(quiz_id)
+        quiz.title = "Updated Title"
+        quiz.add_question(Question("Q3?", ["E", "F"], "E"))
+        quiz.submit_answer(0, "A")
+
+        assert db.update_quiz(quiz_id, quiz) is True
+        updated = db.get_quiz(quiz_id)
+        assert updated.title == "Updated Title"
+        assert len(updated.questions) == 3
+        assert updated.answers == {0: "A"}
+
+    def test_update_with_stale_version_raises_conflict(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+        stale = db.get_quiz(quiz_id)
+
+        db.update_quiz(quiz_id, stale, expected_version=1)
+        assert db.get_quiz(quiz_id).version == 2
+        with pytest.raises(VersionConflictError):
+            db.update_quiz(quiz_id, stale, expected_version=1)
+
+    def test_update_nonexistent_quiz(self, db):
+        assert db.update_quiz("nonexistent_id", make_quiz()) is False
+
+    def test_delete_quiz_from_database(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+
+        assert db.delete_quiz(quiz_id) is True
+        assert db.get_quiz(quiz_id) is None
+        assert db.delete_quiz(quiz_id) is False
+
+    def test_list_and_clear_quizzes(self, db):
+        db.add_quiz(make_quiz())
+        db.add_quiz(Quiz(title="Empty"))
+
+        assert [quiz.title for quiz in db.list_quizzes()] == ["Stored Quiz", "Empty"]
+        db.clear()
+        assert len(db) == 0
+
+    def test_attempt_answers_are_stored(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+
+        assert db.submit_attempt_answer(attempt_id, 0, "A") is True
+        assert db.submit_attempt_answer(attempt_id, 1, "D") is False
+
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.quiz_id == quiz_id
+        assert attempt.get_result().score == 1
+
+    def test_attempt_errors(self, db):
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+
+        assert db.start_attempt("nonexistent_id") is None
+        assert db.get_attempt("nonexistent_id") is None
+        with pytest.raises(KeyError):
+            db.submit_attempt_answer("nonexistent_id", 0, "A")
+        with pytest.raises(IndexError):
+            db.submit_attempt_answer(attempt_id, 5, "A")
+
+    def test_answers_after_time_limit_are_rejected(self, db):
+        quiz = make_quiz()
+        quiz.time_limit_seconds = 0
+        attempt_id = db.start_attempt(db.add_quiz(quiz))
+
+        with pytest.raises(AttemptClosedError):
+            db.submit_attempt_answer(attempt_id, 0, "A")
+        with pytest.raises(AttemptClosedError):
+            db.submit_attempt_answers(attempt_id, [(0, "A")])
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.is_expired()
+        assert len(attempt.answers) == 0
+
+    def test_attempt_answers_are_stored_in_batch(self, db):
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+
+        assert db.submit_attempt_answers(attempt_id, [(0, "A"), (1, "D")]) == [True, False]
+        with pytest.raises(IndexError):
+            db.submit_attempt_answers(attempt_id, [(0, "B"), (9, "A")])
+        with pytest.raises(KeyError):
+            db.submit_attempt_answers("nonexistent_id", [(0, "A")])
+
+        assert db.get_attempt(attempt_id).answers == {0: "A", 1: "D"}
+
+    def test_attempt_answers_by_option_index(self, db):
+        attempt_id = db.start_attempt(db.add_quiz(make_quiz()))
+
+        assert db.submit_attempt_answer(attempt_id, 0, 0) is True
+        assert db.submit_attempt_answers(attempt_id, [(1, 1)]) == [False]
+        with pytest.raises(ValueError):
+            db.submit_attempt_answer(attempt_id, 0, 2)
+        with pytest.raises(ValueError):
+            db.submit_attempt_answers(attempt_id, [(0, 1), (1, 5)])
+
+        assert db.get_attempt(attempt_id).answers == {0: "A", 1: "D"}
+
+    def test_attempt_keeps_the_quiz_it_started_with(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+        db.submit_attempt_answer(attempt_id, 1, "C")
+        shorter = Quiz(title="Shorter", time_limit_seconds=1)
+        shorter.add_question(Question("Q9?", ["Y", "N"], "Y"))
+        db.update_quiz(quiz_id, shorter)
+
+        assert db.submit_attempt_answer(attempt_id, 0, "A") is True
+        attempt = db.get_attempt(attempt_id)
+        assert (attempt.quiz.title, attempt.quiz.time_limit_seconds) == ("Stored Quiz", 600)
+        assert [q.text for q in attempt.quiz.questions] == ["Q1?", "Q2?"]
+        assert attempt.quiz.version == 1
+        assert attempt.get_result().score == 2
+
+    def test_deleting_quiz_removes_its_attempts(self, db):
+        quiz_id = db.add_quiz(make_quiz())
+        attempt_id = db.start_attempt(quiz_id)
+
+        db.delete_quiz(quiz_id)
+        assert db.get_attempt(attempt_id) is None
+
+    def test_get_stats(self, db):
+        db.start_attempt(db.add_quiz(make_quiz()))
+
+        stats = db.get_stats()
+        assert (stats["quizzes"], stats["questions"], stats["attempts"]) == (1, 2, 1)
+        assert stats["bytes"] > 0
+
+
+class TestCreateDatabase:
+    """Tests for choosing a storage backend by name"""
+
+    def test_create_memory_database(self):
+        assert isinstance(create_database("memory"), QuizStorage)
+
+    def test_create_sqlite_database(self, db_path):
+        database = create_database("sqlite", db_path)
+        assert isinstance(database, SQLiteQuizDatabase)
+        database.close()
+
+    def test_unknown_backend_raises(self):
+        with pytest.raises(ValueError):
+            create_database("unknown")
+
+
+class TestSQLiteQuizSummaries:
+    """Tests for paging through quiz summaries"""
+
+    def test_list_quiz_summaries_in_pages(self, db):
+        ids = [db.add_quiz(make_quiz()) for _ in range(3)]
+
+        first_page, cursor = db.list_quiz_summaries(limit=2)
+        second_page, cursor = db.list_quiz_summaries(limit=2, cursor=cursor)
+
+        assert [s.quiz_id for s in first_page] == ids[:2]
+        assert [s.quiz_id for s in second_page] == ids[2:]
+        assert second_page[0].question_count == 2
+        assert cursor is None
+
+    def test_invalid_cursor_raises(self, db):
+        with pytest.raises(ValueError):
+            db.list_quiz_summaries(cursor="not-a-cursor")
+
+
+class TestSQLiteSharedAccess:
+    """Tests for several connections and processes sharing one database file"""
+
+    def test_writes_are_visible_to_other_connections(self, db, db_path):
+        other = SQLiteQuizDatabase(db_path)
+        quiz_id = other.add_quiz(make_quiz())
+        attempt_id = other.start_attempt(quiz_id)
+
+        assert db.get_quiz(quiz_id).title == "Stored Quiz"
+        assert db.submit_attempt_answer(attempt_id, 0, "A") is True
+        assert other.get_attempt(attempt_id).get_result().score == 1
+        other.close()
+
+    def test_concurrent_processes_share_database(self, db, db_path):
+        context = multiprocessing.get_context("spawn")
+        workers = [
+            context.Process(target=add_quizzes_in_process, args=(db_path, 20)) for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert all(worker.exitcode == 0 for worker in workers)
+        assert len(db) == 60
+
+
+class TestSQLiteBulkOperations:
+    """Tests for batch inserts and streaming all quizzes"""
+
+    def test_add_quizzes_in_one_batch(self, db):
+        quiz_ids = db.add_quizzes([make_quiz(), Quiz(title="Empty")])
+
+        assert len(quiz_ids) == 2
+        assert db.get_quiz(quiz_ids[1]).title == "Empty"
+
+    def test_iter_quizzes_pages_through_everything(self, db):
+        quiz_ids = db.add_quizzes(make_quiz() for _ in range(5))
+        assert [quiz.id for quiz in db.iter_quizzes(page_size=2)] == quiz_ids
+
+
+class TestSQLiteQuestionBank:
+    """Tests for the bank_questions table"""
+
+    def test_bank_questions_round_trip(self, db):
+        question_ids = db.add_bank_questions([Question("Q1?", ["A", "B"], "A", "hard", "Letters")])
+
+        (question,) = db.get_bank_questions(question_ids)
+        assert (question.text, question.difficulty, question.category) == ("Q1?", "hard", "Letters")
+        with pytest.raises(KeyError):
+            db.get_bank_questions(["missing"])
+
+    def test_quizzes_share_bank_rows(self, db):
+        db.add_quizzes([make_quiz(), make_quiz()])
+        assert db.get_stats()["bank_questions"] == 2
+
+    def test_deleting_or_replacing_quizzes_frees_their_questions(self, db):
+        (banked_id,) = db.add_bank_questions([Question("Q1?", ["A", "B"], "A")])
+        first, second = Quiz(title="First"), Quiz(title="Second")
+        first.add_questions([Question("Q1?", ["A", "B"], "A"), Question("Q2?", ["C", "D"], "C")])
+        second.add_question(Question("Q2?", ["C", "D"], "C"))
+        first_id, second_id = db.add_quizzes([first, second])
+        attempt_id = db.start_attempt(second_id)
+        assert db.get_stats()["bank_questions"] == 2
+
+        db.delete_quiz(first_id)
+        assert db.get_stats()["bank_questions"] == 2
+        replacement = Quiz(title="Second")
+        replacement.add_question(Question("Q3?", ["E", "F"], "E"))
+        db.update_quiz(second_id, replacement)
+        assert db.get_bank_questions([banked_id])[0].text == "Q1?"
+        with pytest.raises(KeyError):
+            db.get_bank_questions([content_id(Question("Q2?", ["C", "D"], "C"))])
+        assert db.get_attempt(attempt_id).quiz.questions[0].text == "Q2?"
+        assert db.get_stats()["bank_questions"] == 2
+        db.delete_quiz(second_id)
+        assert db.get_stats()["bank_questions"] == 1
+        rows = db._connection.execute("SELECT COUNT(*) FROM bank_questions").fetchone()
+        assert rows == (1,)
+
+    def test_bank_questions_visible_to_other_connections(self, db, db_path):
+        question_ids = db.add_bank_questions([Question("Q1?", ["A", "B"], "A")])
+        other = SQLiteQuizDatabase(db_path)
+        try:
+            assert other.get_bank_questions(question_ids)[0].correct_answer == "A"
+        finally:
+            other.close()
+
+
+class TestSQLiteShuffledAttempts:
+    """Tests for shuffled attempts stored in SQLite"""
+
+    def test_shuffled_answers_map_to_quiz_questions(self, db):
+        quiz = Quiz(title="Long Quiz")
+        for i in range(10):
+            quiz.add_question(Question(f"Q{i}?", [f"{i}-A", f"{i}-B", f"{i}-C"], f"{i}-B"))
+        attempt_id = db.start_attempt(db.add_quiz(quiz), shuffle=True)
+        order = db.get_attempt(attempt_id).order
+
+        def correct_position(position):
+            index = order.question_index(position)
+            return order.options(index, 3).index(1)
+
+        assert db.submit_attempt_answer(attempt_id, 0, correct_position(0)) is True
+        assert db.submit_attempt_answer(attempt_id, 1, f"{order.question_index(1)}-B") is True
+        batch = [(position, correct_position(position)) for position in range(2, 10)]
+        assert db.submit_attempt_answers(attempt_id, batch) == [True] * 8
+
+        attempt = db.get_attempt(attempt_id)
+        assert attempt.get_result().is_perfect()
+        assert attempt.answers[order.question_index(0)] == f"{order.question_index(0)}-B"
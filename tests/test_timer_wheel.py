@@ -0,0 +1,98 @@
+import math
+import random
+import pytest
+from src.timer_wheel import TimerWheel
+
+
+class TestTimerWheel:
+    """Tests for the hierarchical timer wheel"""
+
+    def test_deadline_expires_once_reached(self):
+        wheel = TimerWheel(resolution=1.0, now=0)
+        wheel.schedule("a", 5)
+
+        assert wheel.advance(4.9) == []
+        assert wheel.advance(5.0) == ["a"]
+        assert "a" not in wheel
+        assert wheel.advance(100) == []
+
+    def test_past_deadline_expires_on_next_advance(self):
+        wheel = TimerWheel(resolution=1.0, now=10)
+        wheel.schedule("late", 3)
+
+        assert wheel.advance(10) == ["late"]
+
+    def test_cancel_and_reschedule(self):
+        wheel = TimerWheel(resolution=1.0, now=0)
+        wheel.schedule("a", 5)
+        wheel.schedule("b", 5)
+
+        assert wheel.cancel("a") is True
+        assert wheel.cancel("a") is False
+        wheel.schedule("b", 50)  # Replaces the earlier deadline
+        assert wheel.advance(10) == []
+        assert len(wheel) == 1
+        assert wheel.advance(50) == ["b"]
+
+    def test_far_deadlines_cascade_through_levels_and_overflow(self):
+        # Levels cover 4, 16 and 64 ticks; later deadlines start in the overflow table
+        wheel = TimerWheel(resolution=1.0, slots=4, levels=3, now=0)
+        deadlines = {key: deadline for key, deadline in enumerate([3, 9, 40, 63, 64, 200, 1000])}
+        for key, deadline in deadlines.items():
+            wheel.schedule(key, deadline)
+
+        expired_at = {}
+        for now in range(1001):
+            for key in wheel.advance(now):
+                expired_at[key] = now
+
+        assert expired_at == deadlines
+
+    def test_long_gap_jumps_to_occupied_slots(self, monkeypatch):
+        wheel = TimerWheel(resolution=1.0, slots=4, levels=2, now=0)
+        for key, deadline in [("a", 3), ("b", 100), ("c", 10**9)]:
+            wheel.schedule(key, deadline)
+        cascades = []
+        cascade = wheel._cascade
+        monkeypatch.setattr(wheel, "_cascade", lambda: cascades.append(cascade()))
+
+        assert wheel.advance(10**9) == ["a", "b", "c"]
+        assert len(cascades) < 50
+
+    def test_single_level_is_rejected(self):
+        with pytest.raises(ValueError):
+            TimerWheel(levels=1)
+
+    def test_matches_naive_model(self):
+        random.seed(7)
+        wheel = TimerWheel(resolution=0.5, slots=8, levels=3, now=0)
+        pending = {}
+        now = 0.0
+        for key in range(2000):
+            deadline = now + random.choice([random.uniform(-1, 5), random.uniform(0, 2000)])
+            wheel.schedule(key, deadline)
+            pending[key] = deadline
+            if key % 7 == 0:
+                cancelled = random.choice(list(pending))
+                wheel.cancel(cancelled)
+                del pending[cancelled]
+            now += random.choice([0.1, 0.5, 3, 40])
+
+            expired = wheel.advance(now)
+
+            due = {k for k, d in pending.items() if math.ceil(d / 0.5) <= math.floor(now / 0.5)}
+            assert set(expired) == due
+            for k in expired:
+                del pending[k]
+        assert len(wheel) == len(pending)
+
+    def test_expires_many_deadlines_in_bulk(self):
+        wheel = TimerWheel(resolution=0.25, now=0)
+        for key in range(100_000):
+            wheel.schedule(key, 60 + key % 600)
+
+        assert wheel.advance(59) == []
+        expired = wheel.advance(120)
+        assert sorted(expired) == [key for key in range(100_000) if key % 600 <= 60]
+        wheel.clear()
+        assert len(wheel) == 0
@@ -0,0 +1,92 @@
+import threading
+import pytest
+from src.wal import FILE_MAGIC, LogReader, WriteAheadLog, encode_record, write_records
+
+
+@pytest.fixture
+def log_path(tmp_path):
+    return str(tmp_path / "test.qlog")
+
+
+class TestLogFormat:
+    """Tests for record framing and reading"""
+
+    def test_records_round_trip(self, log_path):
+        write_records(log_path, [["add", 1], ["delete", "quiz-1", None]])
+
+        reader = LogReader(log_path)
+        assert list(reader) == [["add", 1], ["delete", "quiz-1", None]]
+        assert not reader.torn
+
+    def test_reader_stops_at_torn_tail(self, log_path):
+        write_records(log_path, [["first"], ["second"]])
+        with open(log_path, "ab") as log_file:
+            log_file.write(encode_record(["third"])[:-2])
+
+        reader = LogReader(log_path)
+        assert list(reader) == [["first"], ["second"]]
+        assert reader.torn
+        assert reader.valid_bytes == reader.size - len(encode_record(["third"])) + 2
+
+    def test_reader_stops_at_bad_checksum(self, log_path):
+        write_records(log_path, [["first"], ["second"]])
+        with open(log_path, "r+b") as log_file:
+            log_file.seek(-1, 2)
+            log_file.write(b"X")
+
+        assert list(LogReader(log_path)) == [["first"]]
+
+    def test_reader_rejects_other_files(self, log_path):
+        with open(log_path, "wb") as log_file:
+            log_file.write(b"NOT A LOG FILE")
+
+        with pytest.raises(ValueError):
+            list(LogReader(log_path))
+
+
+class TestWriteAheadLog:
+    """Tests for appending, group commit and rotation"""
+
+    def test_synced_records_are_readable(self, log_path):
+        log = WriteAheadLog(log_path)
+        position = log.append(["add", "quiz-1"])
+        log.sync(position)
+
+        assert list(LogReader(log_path)) == [["add", "quiz-1"]]
+        log.close()
+
+    def test_appended_records_are_buffered_until_sync(self, log_path):
+        log = WriteAheadLog(log_path, fsync=False)
+        log.append(["add", "quiz-1"])
+        assert list(LogReader(log_path)) == []
+
+        log.close()
+        assert list(LogReader(log_path)) == [["add", "quiz-1"]]
+
+    def test_concurrent_writers_all_become_durable(self, log_path):
+        log = WriteAheadLog(log_path)
+
+        def write(number):
+            log.sync(log.append(["answer", number]))
+
+        threads = [threading.Thread(target=write, args=(i,)) for i in range(40)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(record[1] for record in LogReader(log_path)) == list(range(40))
+        log.close()
+
+    def test_rotate_continues_in_new_file(self, tmp_path):
+        first, second = str(tmp_path / "first.qlog"), str(tmp_path / "second.qlog")
+        log = WriteAheadLog(first)
+        log.append(["before"])
+        log.rotate(second)
+        log.sync(log.append(["after"]))
+
+        assert list(LogReader(first)) == [["before"]]
+        assert list(LogReader(second)) == [["after"]]
+        with open(second, "rb") as log_file:
+            assert log_file.read(len(FILE_MAGIC)) == FILE_MAGIC
+        log.close()